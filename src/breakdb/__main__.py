@@ -7,7 +7,8 @@ import sys
 from argparse import ArgumentParser
 
 from breakdb.action import print_tags, create_database, convert_database, \
-    export_database
+    export_database, pack_database, parse_device_limit, parse_export_target, \
+    parse_positive_float, parse_positive_int, parse_stages, parse_windows
 from breakdb.util import initialize_logging, supports_color_output
 
 
@@ -61,6 +62,42 @@ def parse_args():
                         help="ignore malformed DICOM files", default=False)
     create.add_argument("-r", "--relative", action="store_true",
                         help="encode relative paths", default=False)
+    create.add_argument("--executor", type=str,
+                        choices=["hybrid", "process", "thread"],
+                        default="process",
+                        help="run parallel workers as processes, threads, "
+                             "or threads within processes (hybrid)")
+    create.add_argument("--threads", type=int, default=4,
+                        help="number of threads per process of a hybrid "
+                             "executor (default: 4)")
+    create.add_argument("--prefetch", type=int, nargs="?", const=256,
+                        default=0, metavar="MB",
+                        help="read the files about to be parsed ahead into "
+                             "the page cache, up to MB (default: 256) at a "
+                             "time")
+    create.add_argument("--prefetch-threads", type=int, default=2,
+                        help="number of threads reading files ahead "
+                             "(default: 2)")
+    create.add_argument("--prefetch-mode", type=str,
+                        choices=["advise", "read"], default="advise",
+                        help="advise the kernel to read files ahead, or read "
+                             "them in prefetch threads (for file systems "
+                             "that ignore such advice)")
+    create.add_argument("--locality", type=str,
+                        choices=["directory", "inode"], default=None,
+                        help="group files by storage device and read each "
+                             "device in inode or directory order")
+    create.add_argument("--largest-first", action="store_true",
+                        default=False,
+                        help="hand out the largest files first, in tasks "
+                             "that shrink as work runs out, to whichever "
+                             "worker is free")
+    create.add_argument("--device-limit", type=parse_device_limit,
+                        action="append", dest="device_limits",
+                        metavar="PATH=LIMIT",
+                        help="run at most LIMIT tasks at once against the "
+                             "device storing PATH (repeatable, default: one "
+                             "per parallel worker)")
 
     create.add_argument("PATHS", nargs="+", type=str,
                         help="directories containing one or more DICOM files")
@@ -73,26 +110,156 @@ def parse_args():
     export.set_defaults(func=export_database)
 
     export.add_argument("-d", "--directory", required=True)
-    export.add_argument("-f", "--force", action="store_true", default=False,
-                        help="overwrite existing files and directories")
+
+    overwrite = export.add_mutually_exclusive_group()
+
+    overwrite.add_argument("-f", "--force", action="store_true",
+                           default=False,
+                           help="overwrite existing files and directories")
+    overwrite.add_argument("-i", "--incremental", action="store_true",
+                           default=False,
+                           help="keep existing files and only export new or "
+                                "changed entries, named by ID (resumes an "
+                                "interrupted incremental export)")
+    overwrite.add_argument("--labels-only", action="store_true",
+                           default=False,
+                           help="keep existing files and only rewrite "
+                                "annotations and master lists, without "
+                                "reading or writing any images (named by "
+                                "ID if updating an incremental export)")
+
     export.add_argument("-n", "--no-master-list", action="store_true",
                         default=False, help="do not produce a master list")
     export.add_argument("-p", "--parallel", type=int,
                         help="number of parallel processes", default=2)
     export.add_argument("-s", "--skip-broken", action="store_true",
                         help="ignore malformed DICOM files", default=False)
-    export.add_argument("-t", "--type", type=str, choices=["voc", "yolov3"],
-                        required=True, help="the export format type")
-
+    export.add_argument("--executor", type=str,
+                        choices=["hybrid", "process", "thread"],
+                        default="process",
+                        help="run parallel workers as processes, threads, "
+                             "or threads within processes (hybrid)")
+    export.add_argument("--threads", type=int, default=4,
+                        help="number of threads per process of a hybrid "
+                             "executor (default: 4)")
+    export.add_argument("--prefetch", type=int, nargs="?", const=256,
+                        default=0, metavar="MB",
+                        help="read the files about to be exported ahead into "
+                             "the page cache, up to MB (default: 256) at a "
+                             "time")
+    export.add_argument("--prefetch-threads", type=int, default=2,
+                        help="number of threads reading files ahead "
+                             "(default: 2)")
+    export.add_argument("--prefetch-mode", type=str,
+                        choices=["advise", "read"], default="advise",
+                        help="advise the kernel to read files ahead, or read "
+                             "them in prefetch threads (for file systems "
+                             "that ignore such advice)")
+    export.add_argument("--locality", type=str,
+                        choices=["directory", "inode"], default=None,
+                        help="group entries by storage device and read each "
+                             "device in inode or directory order")
+    export.add_argument("--largest-first", action="store_true",
+                        default=False,
+                        help="hand out the largest images first, in tasks "
+                             "that shrink as work runs out, to whichever "
+                             "worker is free")
+    export.add_argument("--device-limit", type=parse_device_limit,
+                        action="append", dest="device_limits",
+                        metavar="PATH=LIMIT",
+                        help="run at most LIMIT tasks at once against the "
+                             "device storing PATH (repeatable, default: one "
+                             "per parallel worker)")
+
+    targets = export.add_mutually_exclusive_group(required=True)
+
+    targets.add_argument("-t", "--type", type=str,
+                         choices=["coco", "npy", "voc", "wds", "yolov3"],
+                         help="the export format type")
+    targets.add_argument("--target", type=parse_export_target,
+                         action="append", dest="targets",
+                         metavar="TYPE:WxH[:FORMAT]",
+                         help="export to the specified format type, size, "
+                              "and image format in a subdirectory "
+                              "(repeatable, each image is decoded once)")
+
+    export.add_argument("--fan-out", type=int, nargs="?", const=2, default=0,
+                        choices=range(0, 5), metavar="LEVELS",
+                        help="spread images and annotations over LEVELS "
+                             "(default: 2) levels of hashed subdirectories "
+                             "of 256 each")
+    export.add_argument("--shard-size", type=parse_positive_int, default=256,
+                        metavar="MB", help="the size at which each "
+                                           "WebDataset (wds) tar shard is "
+                                           "closed (default: 256)")
+    export.add_argument("--shard-writers", type=parse_positive_int,
+                        default=1,
+                        help="number of processes writing the shards of "
+                             "each WebDataset (wds) target (default: 1)")
+    export.add_argument("--writer-threads", type=int, default=0,
+                        metavar="THREADS",
+                        help="number of threads per process that encode and "
+                             "write images and annotations while the next "
+                             "image is decoded (default: 0, in sequence)")
+    export.add_argument("--stages", type=parse_stages, default=None,
+                        metavar="READ:DECODE:TRANSFORM:ENCODE",
+                        help="export entries through a pipeline of stages "
+                             "connected by bounded queues, with the given "
+                             "number of threads per stage in each process, "
+                             "and report the utilization of every stage")
     export.add_argument("--keep-aspect-ratio", action="store_true",
                         default=False, help="force resizing to obey aspect "
                                             "ratio")
+    export.add_argument("--full-decode", action="store_true", default=False,
+                        help="decode compressed images at full resolution")
     export.add_argument("--ignore-scaling", action="store_true",
                         default=False, help="ignore scaling parameters")
     export.add_argument("--ignore-windowing", action="store_true",
                         default=False, help="ignore windowing parameters")
     export.add_argument("--no-upscale", action="store_true", default=False,
                         help="disallow image upscaling")
+    export.add_argument("--resize-first", type=parse_positive_float,
+                        nargs="?", const=2.0, default=None, metavar="SCALE",
+                        help="downsample images to at least SCALE times the "
+                             "target size (default: 2) before windowing")
+    export.add_argument("--pre-shrink", type=parse_positive_int, nargs="?",
+                        const=2, default=None, metavar="GAP",
+                        help="box-shrink images to at least GAP times the "
+                             "target size (default: 2) before resampling")
+    export.add_argument("--resample", type=str,
+                        choices=["bicubic", "bilinear", "box", "hamming",
+                                 "lanczos", "nearest"],
+                        default="bicubic", help="the filter to resize "
+                                                "images with")
+    export.add_argument("--image-format", type=str,
+                        choices=["jpeg", "png", "png16", "webp"],
+                        default="jpeg", help="the format to save images as "
+                                             "(png16 is 16-bit grayscale, "
+                                             "webp is lossless)")
+    export.add_argument("--jpeg-quality", type=int, default=None,
+                        choices=range(1, 96), metavar="[1-95]",
+                        help="JPEG quality (default: 75)")
+    export.add_argument("--jpeg-subsampling", type=str, default=None,
+                        choices=["4:4:4", "4:2:2", "4:2:0"],
+                        help="JPEG chroma subsampling (default: 4:2:0)")
+    export.add_argument("--png-compress-level", type=int, default=None,
+                        choices=range(0, 10), metavar="[0-9]",
+                        help="PNG compression level (default: 6)")
+    export.add_argument("--webp-method", type=int, default=None,
+                        choices=range(0, 7), metavar="[0-6]",
+                        help="WebP compression effort (default: 4)")
+    export.add_argument("--windows", type=parse_windows, default=None,
+                        metavar="CENTER:WIDTH|full[,...]",
+                        help="render one or three comma-separated windows "
+                             "(e.g. bone, soft tissue, and full range) from "
+                             "each image as the channels of an RGB image, "
+                             "regardless of --ignore-windowing (JPEG images "
+                             "should use --jpeg-subsampling 4:4:4)")
+    export.add_argument("--pixel-pipeline", type=str, choices=["float", "lut"],
+                        default="lut", help="render integer images with "
+                                            "cached lookup tables (lut) or "
+                                            "floating-point arithmetic "
+                                            "(float)")
     export.add_argument("--target-height", type=int, default=None,
                         help="target image height")
     export.add_argument("--target-width", type=int, default=None,
@@ -100,6 +267,30 @@ def parse_args():
 
     export.add_argument("FILE", type=str, help="database file to export")
 
+    pack = subparsers.add_parser(name="pack",
+                                 description="decode every image of a "
+                                             "database once into a pixel "
+                                             "pack that later exports read "
+                                             "instead")
+
+    pack.set_defaults(func=pack_database)
+
+    pack.add_argument("-k", "--pack", type=str, default=None,
+                      help="file to write pixels to (default: the output "
+                           "file with a .pixels extension)")
+    pack.add_argument("-o", "--output", type=str, required=True,
+                      help="file to output the packed database to")
+    pack.add_argument("-p", "--parallel", type=int,
+                      help="number of parallel processes", default=2)
+    pack.add_argument("-s", "--skip-broken", action="store_true",
+                      help="ignore malformed DICOM files", default=False)
+    pack.add_argument("-z", "--compress", type=int, nargs="?", const=1,
+                      default=None, choices=range(0, 10), metavar="LEVEL",
+                      help="compress each image with zlib at LEVEL "
+                           "(default: 1)")
+
+    pack.add_argument("FILE", type=str, help="database file to pack")
+
     tags = subparsers.add_parser(name="print-tags",
                                  description="show all DICOM metadata tags "
                                              "in a file")
@@ -4,6 +4,7 @@ via the command line.
 """
 import logging
 import os
+from contextlib import ExitStack
 from enum import IntEnum
 from functools import partial
 from multiprocessing.pool import Pool
@@ -11,12 +12,27 @@ from traceback import print_exc
 
 import pandas as pd
 from pydicom import dcmread
+from pydicom.uid import UID
 
+from breakdb.executor import create_executor
 from breakdb.io import filter_files, COLUMN_NAMES, write_database, \
     read_database, get_entry_exporter
-from breakdb.io.export import get_database_entries
+from breakdb.io.export import ExportTarget, export_targets, \
+    export_worker_rows, get_database_entries, get_entry_names, \
+    finalize_worker, get_fan_out_name, initialize_worker, IMAGE_ENCODERS, \
+    STAGE_NAMES
+from breakdb.io.export.coco import COCODatabaseEntryExporter
+from breakdb.io.export.manifest import ExportManifest, hash_entry, \
+    hash_value, MANIFEST_FILE
+from breakdb.io.export.wds import ShardWriterGroup, WebDatasetEntryExporter
+from breakdb.io.image import get_read_ranges
+from breakdb.io.pack import PACK_COLUMNS, pack_entry, write_pack
+from breakdb.io.prefetch import FilePrefetcher
 from breakdb.merge import organize_parsed, merge_dicom
-from breakdb.parse import parse_dicom
+from breakdb.parse import HEADER_PREFETCH_SIZE, parse_dicom
+from breakdb.schedule import DeviceScheduler, apply_each, create_tasks, \
+    get_file_size, get_locality, group_by_locality, imap_indexed, \
+    split_by_cost
 from breakdb.util import format_dataset
 
 
@@ -41,6 +57,13 @@ def create_database(args):
     Creates a Pandas dataframe from DICOM files found by searching one or
     more user-specified directories.
 
+    Files are parsed and merged by a pool of processes, threads, or threads
+    within processes (see :function: 'create_executor'); threads avoid
+    pickling every parsed file, which dominates when only headers are read.
+    The headers of the files about to be parsed may be read ahead into the
+    page cache, and files may be parsed by the storage device they are
+    read from (see :function: 'parse_files').
+
     :param args: The user-chosen options to use.
     :return: An exit code (0 if success, otherwise 1).
     """
@@ -51,14 +74,30 @@ def create_database(args):
                      ignore_duplicates=args.ignore_duplicates)
 
     try:
-        with Pool(processes=args.parallel) as pool:
+        with ExitStack() as stack:
+            pool = stack.enter_context(create_executor(args.executor,
+                                                       args.parallel,
+                                                       args.threads))
+
             logger.info("Searching directories for DICOM files: {}.",
                         args.PATHS)
+
+            files = list(filter_files(args.PATHS, extensions=".dcm",
+                                      relative=args.relative))
+
             logger.info("Parsing DICOM files...")
 
-            parsed = pool.map(parser, filter_files(args.PATHS,
-                                                   extensions=".dcm",
-                                                   relative=args.relative))
+            prefetcher = stack.enter_context(FilePrefetcher(
+                args.prefetch * 2 ** 20, args.prefetch_threads,
+                args.prefetch_mode
+            )) if args.prefetch else None
+            workers = args.parallel * (args.threads
+                                       if args.executor == "hybrid" else 1)
+
+            parsed = parse_files(pool, parser, files, workers, prefetcher,
+                                 get_scheduler(args, workers),
+                                 args.largest_first)
+
             logger.debug("Parsed {} files.", len(parsed))
             logger.debug("Parsing complete.")
 
@@ -119,10 +158,86 @@ def convert_database(args):
         return ExitCode.FAILURE
 
 
+def get_encoder_options(args, image_format):
+    """
+    Collects the image encoder options chosen by the user, if any, that
+    apply to the specified image format.
+
+    :param args: The user-chosen options to use.
+    :param image_format: The name of the image format to use.
+    :return: A dictionary of image encoder options.
+    """
+    options = {
+        "jpeg": {
+            "quality": args.jpeg_quality,
+            "subsampling": args.jpeg_subsampling
+        },
+        "png": {"compress_level": args.png_compress_level},
+        "png16": {"compress_level": args.png_compress_level},
+        "webp": {"method": args.webp_method}
+    }.get(image_format, {})
+
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def collect_records(results, names, targets):
+    """
+    Hands the record of every entry exported to a COCO export target back
+    to its exporter, removing it from the master list results of the entry.
+
+    :param results: The master list results of every entry, in database
+    order.
+    :param names: The names of every entry, in database order.
+    :param targets: The collection of export targets exported to.
+    """
+    for index, target in enumerate(targets):
+        if not isinstance(target.exporter, COCODatabaseEntryExporter):
+            continue
+
+        for name, result in zip(names, results):
+            if result[index]:
+                file_path, classification, record = result[index]
+                result[index] = file_path, classification
+
+                target.exporter.add_record(
+                    target.base_dir, get_fan_out_name(name, target.fan_out),
+                    record
+                )
+
+
 def export_database(args):
     """
-    Exports a user-specified database in a specific format to the local
-    filesystem.
+    Exports a user-specified database in one or more specific formats to the
+    local filesystem.
+
+    If several export targets are chosen then each is exported to its own
+    subdirectory, named after its format type, size, and image format, and
+    every database entry is decoded only once for all of them.
+
+    Incremental exports keep any existing files and a manifest of every
+    exported entry (see :function: 'export_incremental'), so that only
+    entries that are new or have changed since the last export are
+    exported again.  Label-only exports keep any existing files and only
+    (re)write annotations and master lists, without reading any images;
+    entries are named by their identifiers if the directory holds an
+    incremental export (i.e. its manifest), as its images are.
+    WebDataset targets are packed into tar shards as entries are exported
+    (see :function: 'export_sharded'), tensor pack targets into arrays
+    allocated beforehand, and COCO targets into a single document written
+    once every entry is exported (see :function: 'collect_records'), and so
+    support neither.
+
+    Every exporter is prepared and finished once per export, in this
+    process, and once per worker process (see
+    :function: 'initialize_worker'), such that work that does not depend
+    on a single entry is never repeated for each entry.  Worker processes
+    share the database with this process and are only sent the row
+    positions of the entries to export (see :function: 'split_rows'), which
+    they may export through a pipeline of stages, each with its own number
+    of threads (see :function: 'export_staged').  Workers may be processes,
+    threads, or threads within processes (see
+    :function: 'create_executor'), and rows may be scheduled by the storage
+    device they are read from (see :function: 'dispatch_rows').
 
     :param args: The user-chosen options to use.
     :return: An exit code (0 if success, otherwise 1).
@@ -130,53 +245,179 @@ def export_database(args):
     logger = logging.getLogger(__name__)
 
     try:
-        exporter = get_entry_exporter(args.type)
+        if args.windows and len(args.windows) not in [1, 3]:
+            raise ValueError(f"Cannot export: {len(args.windows)} windows - "
+                             f"only one or three are supported.")
+
+        if args.stages and args.writer_threads:
+            raise ValueError("Cannot export with both writer threads and "
+                             "stages - the encode stage writes entries.")
+
+        workers = args.parallel * (args.threads
+                                   if args.executor == "hybrid" else 1)
+        scheduler = get_scheduler(args, workers)
+
+        targets = get_export_targets(args)
+        sharded = any(isinstance(target.exporter, WebDatasetEntryExporter)
+                      for target in targets)
 
-        logger.info("Exporting database: {} to format: {}.", args.FILE,
-                    args.type)
+        if (args.incremental or args.labels_only or args.fan_out) and \
+                not all(target.exporter.supports_updates
+                        for target in targets):
+            raise ValueError("Cannot export WebDataset shards, tensor "
+                             "packs, or COCO datasets incrementally, labels "
+                             "only, or fanned out.")
+
+        logger.info("Exporting database: {} to: {} target(s).", args.FILE,
+                    len(targets))
         logger.debug("Loading database: {}.", args.FILE)
 
         db = read_database(args.FILE)
+        master_dirs = []
+        use_ids = args.incremental or args.labels_only and os.path.exists(
+            os.path.join(args.directory, MANIFEST_FILE)
+        )
 
-        logger.debug("Creating directory structure in: {}.", args.directory)
+        if args.targets:
+            os.makedirs(args.directory, exist_ok=True)
 
-        annot_dir, image_dir, master_dir = exporter.create_directory_structure(
-            args.directory, args.force
-        )
+        for target in targets:
+            logger.debug("Creating directory structure in: {}.",
+                         target.base_dir)
 
-        logger.debug("Annotation directory: {}.", annot_dir)
-        logger.debug("Image directory: {}.", image_dir)
-        logger.debug("Master List directory: {}.", master_dir)
+            annot_dir, image_dir, master_dir = \
+                target.exporter.create_directory_structure(
+                    target.base_dir, args.force,
+                    args.incremental or args.labels_only
+                )
 
-        with Pool(processes=args.parallel) as pool:
-            fs_exporter = partial(exporter.export,
-                                  base_dir=args.directory,
-                                  target_width=args.target_width,
-                                  target_height=args.target_height,
-                                  ignore_scaling=args.ignore_scaling,
-                                  ignore_windowing=args.ignore_windowing,
-                                  keep_aspect_ratio=args.keep_aspect_ratio,
-                                  no_upscale=args.no_upscale,
-                                  skip_broken=args.skip_broken)
+            logger.debug("Annotation directory: {}.", annot_dir)
+            logger.debug("Image directory: {}.", image_dir)
+            logger.debug("Master List directory: {}.", master_dir)
+
+            master_dirs.append(master_dir)
+
+            target.exporter.begin_run(target, db, args.windows)
+
+        options = {
+            "ignore_scaling": args.ignore_scaling,
+            "ignore_windowing": args.ignore_windowing,
+            "keep_aspect_ratio": args.keep_aspect_ratio,
+            "no_upscale": args.no_upscale,
+            "pipeline": args.pixel_pipeline,
+            "intermediate_scale": args.resize_first,
+            "full_decode": args.full_decode,
+            "resample": args.resample,
+            "reducing_gap": args.pre_shrink,
+            "windows": args.windows
+        }
+
+        logger.debug("Beginning exportation of: {} entries.", len(db))
+
+        if args.labels_only:
+            for target in targets:
+                target.exporter.init_worker(target)
+
+            results = [
+                export_targets(entry, targets, skip_broken=args.skip_broken,
+                               labels_only=True, **options)
+                for entry in get_database_entries(db, use_ids)
+            ]
+
+            for target in targets:
+                target.exporter.finish_worker(target)
+        else:
+            # Every worker process reads ahead within its share of the
+            # window; threads of a process share its prefetcher.
+            prefetch = (args.prefetch * 2 ** 20 //
+                        (1 if args.executor == "thread" else args.parallel),
+                        args.prefetch_threads, args.prefetch_mode) \
+                if args.prefetch else None
+
+            with create_executor(args.executor, args.parallel, args.threads,
+                                 initialize_worker,
+                                 (targets, db, use_ids,
+                                  args.writer_threads, args.stages,
+                                  prefetch, args.executor != "thread"),
+                                 finalize_worker) as pool:
+                fs_exporter = partial(export_worker_rows,
+                                      skip_broken=args.skip_broken, **options)
+
+                if args.incremental:
+                    params_hash = hash_value([
+                        [(target.exporter.format_name, target.base_dir,
+                          target.target_width, target.target_height,
+                          target.image_format, target.encoder_options,
+                          target.fan_out)
+                         for target in targets],
+                        options
+                    ])
+
+                    results, stats_list = export_incremental(
+                        pool, fs_exporter, db, targets, params_hash,
+                        args.directory, workers, scheduler,
+                        args.largest_first
+                    )
+                elif sharded:
+                    results, stats_list = export_sharded(
+                        pool, fs_exporter, db, targets, workers,
+                        args.shard_writers, args.shard_size * 2 ** 20,
+                        scheduler, args.largest_first
+                    )
+                else:
+                    results = [None] * len(db)
+                    stats_list = []
+
+                    for rows, (chunk, stats) in dispatch_rows(
+                            pool, fs_exporter, db, range(len(db)), workers,
+                            scheduler, args.largest_first):
+                        for row, result in zip(rows, chunk):
+                            results[row] = result
+
+                        stats_list.append(stats)
+
+                # Workers must exit, rather than be terminated, for their
+                # exporters to be finished (see finalize_worker); pools of
+                # threads finish them once joined.
+                pool.close()
+                pool.join()
+
+            report_decode_statistics([stats["decode"]
+                                      for stats in stats_list])
+            report_stage_statistics([stats["stages"]
+                                     for stats in stats_list])
 
-            logger.debug("Beginning exportation of: {} entries.", len(db))
+        names = get_entry_names(db, use_ids)
 
-            file_list = pool.map(fs_exporter, get_database_entries(db))
-            file_list = list(filter(None, file_list))
+        collect_records(results, names, targets)
 
-            logger.debug("Exported: {} of: {} origin entries.",
-                         len(file_list), len(db))
+        for index, master_dir in enumerate(master_dirs):
+            target = targets[index]
+            file_list = list(filter(None, (
+                result[index] for result in results
+            )))
+
+            logger.debug("Exported: {} of: {} origin entries to: {}.",
+                         len(file_list), len(db), target.base_dir)
+
+            target.exporter.write_index(target.base_dir, [
+                get_fan_out_name(name, target.fan_out)
+                for name, result in zip(names, results) if result[index]
+            ], target.image_format)
 
             if not args.no_master_list:
                 logger.debug("Writing master list.")
 
-                master_list = pd.DataFrame(file_list,
-                                           columns=["File", "Classification"])
+                master_list = pd.DataFrame(
+                    file_list, columns=["File", "Classification"]
+                )
                 master_path = os.path.join(master_dir, "master_list.csv")
 
                 master_list.to_csv(master_path, sep=",")
 
                 logger.debug("Wrote master list to: {}.", master_path)
+
+            target.exporter.end_run(target)
     except Exception as ex:
         logger.error("Could not export database: {}.", ex)
 
@@ -188,6 +429,604 @@ def export_database(args):
         return ExitCode.FAILURE
 
 
+def dispatch_rows(pool, exporter, db, rows, processes, scheduler=None,
+                  largest_first=False):
+    """
+    Exports the entries at the specified row positions of the specified
+    database on the specified pool, in tasks (see :function: 'split_rows').
+
+    By default, tasks are exported in row order.  With a scheduler, rows
+    are grouped by the storage device of the files they are read from,
+    ordered by where those files are stored (see
+    :function: 'group_by_locality'), and every device is read with its own
+    number of concurrent tasks (see :class: 'DeviceScheduler').  Otherwise,
+    rows may be exported from the largest image to the smallest, in tasks
+    that shrink as work runs out (see :function: 'split_by_cost'), each
+    handed to the next free worker.
+
+    :param pool: The pool of workers to export with.
+    :param exporter: The export function to use (see
+    :function: 'export_worker_rows').
+    :param db: The DICOM database to export.
+    :param rows: The collection of row positions to export.
+    :param processes: The number of workers in the pool.
+    :param scheduler: The scheduler to dispatch rows with (optional).
+    :param largest_first: Whether or not to export the largest images
+    first, if there is no scheduler.
+    :return: An iterator of pairs of the row positions of each task and its
+    result, in the order tasks finish.
+    """
+    if scheduler is None and not largest_first:
+        chunks = split_rows(rows, processes)
+
+        yield from zip(chunks, pool.imap(exporter, chunks))
+        return
+
+    if scheduler is None:
+        costs = (db["Width"] * db["Height"]).iloc[list(rows)].tolist()
+        tasks = [(None, chunk) for chunk in split_by_cost(costs, processes)]
+    else:
+        groups = group_by_locality((read_range[:2] for read_range
+                                    in get_read_ranges(db, rows)),
+                                   scheduler.order)
+        tasks = create_tasks(groups,
+                             partial(split_rows, processes=processes))
+
+    tasks = [(device, [rows[position] for position in positions])
+             for device, positions in tasks]
+    exported = scheduler.imap_unordered(pool, exporter, tasks) \
+        if scheduler is not None else \
+        imap_indexed(pool, exporter, (chunk for _, chunk in tasks))
+
+    for index, result in exported:
+        yield tasks[index][1], result
+
+
+def export_incremental(pool, exporter, db, targets, params_hash, dir_path,
+                       processes, scheduler=None, largest_first=False):
+    """
+    Exports every entry of the specified database that has not already been
+    exported, with the same export parameters, according to the export
+    manifest in the specified directory.
+
+    Entries are named by their identifiers.  Files of entries that are out
+    of date, or no longer in the database, are deleted before anything is
+    exported, and each entry is recorded in the manifest as soon as it has
+    been exported, so an interrupted export may simply be resumed.  Entries
+    that could not be exported to every target are not recorded and are
+    therefore retried by the next export.
+
+    :param pool: The process pool to export with.
+    :param exporter: The export function to use (see
+    :function: 'export_worker_rows').
+    :param db: The DICOM database to export.
+    :param targets: The collection of export targets to export to.
+    :param params_hash: The hash of the export parameters.
+    :param dir_path: The directory in which to keep the export manifest.
+    :param processes: The number of processes in the pool.
+    :param scheduler: The scheduler to dispatch rows with (optional, see
+    :function: 'dispatch_rows').
+    :param largest_first: Whether or not to export the largest images
+    first, if there is no scheduler.
+    :return: A pair containing, in database order, the master list results
+    of every entry and the statistics of every entry exported.
+    :raises ValueError: If the entry identifiers are not unique.
+    """
+    logger = logging.getLogger(__name__)
+
+    manifest = ExportManifest(os.path.join(dir_path, MANIFEST_FILE))
+    entries = list(get_database_entries(db, use_ids=True))
+    names = set(name for _, name in entries)
+
+    if len(names) != len(entries):
+        raise ValueError("Cannot export incrementally - entry identifiers "
+                         "are not unique.")
+
+    logger.debug("Loaded: {} manifest records.", manifest.load())
+
+    for entry_id in [key for key in manifest.records if key not in names]:
+        logger.debug("Removing orphaned entry: {}.", entry_id)
+        manifest.remove(entry_id)
+
+    pending = []
+
+    for row, (ds, name) in enumerate(entries):
+        entry_hash = hash_entry(ds)
+
+        if manifest.is_current(name, entry_hash, params_hash):
+            continue
+
+        if name in manifest.records:
+            logger.debug("Removing stale entry: {}.", name)
+            manifest.remove(name)
+
+        pending.append((row, name, entry_hash))
+
+    logger.info("Skipping: {} up-to-date entries, exporting: {}.",
+                len(entries) - len(pending), len(pending))
+
+    rows = [row for row, _, _ in pending]
+    hashes = {row: (name, entry_hash) for row, name, entry_hash in pending}
+    stats_list = []
+
+    with manifest:
+        exported = dispatch_rows(pool, exporter, db, rows, processes,
+                                 scheduler, largest_first)
+
+        for chunk_rows, (chunk, stats) in exported:
+            stats_list.append(stats)
+
+            for row, results in zip(chunk_rows, chunk):
+                name, entry_hash = hashes[row]
+
+                if not all(results):
+                    continue
+
+                files = [
+                    target.exporter.get_image_path(
+                        target.base_dir,
+                        get_fan_out_name(name, target.fan_out),
+                        target.image_format
+                    )
+                    for target in targets
+                ] + [result[0] for result in results]
+
+                manifest.record(name, entry_hash, params_hash,
+                                filter(os.path.exists, files), results)
+
+    manifest.compact()
+
+    return [
+        manifest.get_results(name) if name in manifest.records else
+        [() for _ in targets]
+        for _, name in entries
+    ], stats_list
+
+
+def export_sharded(pool, exporter, db, targets, processes, writer_processes,
+                   max_size, scheduler=None, largest_first=False):
+    """
+    Exports every entry of the specified database, writing the samples of
+    every WebDataset export target to tar shards as they arrive.
+
+    Each WebDataset target is given its own group of dedicated writer
+    processes (see :class: 'ShardWriterGroup'), and entries are exported in
+    chunks of bounded size so that encoded samples never accumulate in
+    memory.
+
+    :param pool: The process pool to export with.
+    :param exporter: The export function to use (see
+    :function: 'export_worker_rows').
+    :param db: The DICOM database to export.
+    :param targets: The collection of export targets to export to.
+    :param processes: The number of processes in the pool.
+    :param writer_processes: The number of writer processes per WebDataset
+    target.
+    :param max_size: The size, in bytes, at which each shard is closed.
+    :param scheduler: The scheduler to dispatch rows with (optional, see
+    :function: 'dispatch_rows').
+    :param largest_first: Whether or not to export the largest images
+    first, if there is no scheduler.
+    :return: A pair containing, in database order, the master list results
+    of every entry and the statistics of every entry exported.
+    """
+    results = [None] * len(db)
+    stats_list = []
+
+    with ExitStack() as stack:
+        writers = {
+            index: stack.enter_context(
+                ShardWriterGroup(target.base_dir, writer_processes, max_size)
+            )
+            for index, target in enumerate(targets)
+            if isinstance(target.exporter, WebDatasetEntryExporter)
+        }
+
+        for rows, (chunk, stats) in dispatch_rows(pool, exporter, db,
+                                                  range(len(db)), processes,
+                                                  scheduler, largest_first):
+            for row, result in zip(rows, chunk):
+                for index, writer in writers.items():
+                    if result[index]:
+                        key, classification, members = result[index]
+                        result[index] = key, classification
+
+                        writer.write(key, members)
+
+                results[row] = result
+
+            stats_list.append(stats)
+
+    return results, stats_list
+
+
+def get_export_targets(args):
+    """
+    Creates the collection of export targets chosen by the user.
+
+    Without any explicitly chosen targets, a single target is created from
+    the chosen format type, directory, size, and image format.
+
+    :param args: The user-chosen options to use.
+    :return: A list of export targets.
+    """
+    if not args.targets:
+        return [
+            ExportTarget(get_entry_exporter(args.type), args.directory,
+                         args.target_width, args.target_height,
+                         args.image_format,
+                         get_encoder_options(args, args.image_format),
+                         args.fan_out)
+        ]
+
+    return [
+        ExportTarget(get_entry_exporter(export_type),
+                     os.path.join(args.directory,
+                                  f"{export_type}-{width}x{height}-"
+                                  f"{image_format}"),
+                     width, height, image_format,
+                     get_encoder_options(args, image_format), args.fan_out)
+        for export_type, width, height, image_format in args.targets
+    ]
+
+
+def get_scheduler(args, processes):
+    """
+    Creates a scheduler of work by storage device from the user-chosen
+    options, if any apply.
+
+    Devices without a chosen limit may run as many tasks at once as there
+    are workers.
+
+    :param args: The user-chosen options to use.
+    :param processes: The number of workers in the pool.
+    :return: A scheduler, or None to dispatch work in order.
+    :raises ValueError: If work is also to be ordered by size.
+    """
+    if not args.locality and not args.device_limits:
+        return None
+
+    if args.largest_first:
+        raise ValueError("Cannot order work both by size and by storage "
+                         "device.")
+
+    return DeviceScheduler(dict(args.device_limits or []), processes,
+                           args.locality)
+
+
+def pack_database(args):
+    """
+    Decodes the image of every entry of a user-specified database once into
+    a pixel pack, and writes a copy of the database that refers to it.
+
+    Exports of the packed database read every image from the pack, for as
+    long as it exists, rather than parsing and decoding its DICOM file.
+
+    :param args: The user-chosen options to use.
+    :return: An exit code (0 if success, otherwise 1).
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        pack_path = os.path.abspath(
+            args.pack or os.path.splitext(args.output)[0] + ".pixels"
+        )
+
+        logger.info("Packing database: {} to: {}.", args.FILE, pack_path)
+        logger.debug("Loading database: {}.", args.FILE)
+
+        db = read_database(args.FILE)
+
+        with Pool(processes=args.parallel) as pool:
+            packer = partial(pack_entry, compress_level=args.compress,
+                             skip_broken=args.skip_broken)
+            packed = pool.imap(packer, (db.iloc[index, :]
+                                        for index in range(len(db))))
+
+            rows = write_pack(packed, pack_path)
+
+        db[PACK_COLUMNS] = pd.DataFrame(rows, columns=PACK_COLUMNS,
+                                        index=db.index)
+
+        logger.debug("Packed: {} of: {} entries.",
+                     sum(row[1] >= 0 for row in rows), len(db))
+
+        write_database(db, args.output)
+
+        logger.debug("Wrote packed database to: {}.", args.output)
+
+        return ExitCode.SUCCESS
+    except Exception as ex:
+        logger.error("Could not pack database: {}.", ex)
+
+        if not args.quiet and args.verbose:
+            print()
+            print("Stack trace:")
+            print_exc()
+
+        return ExitCode.FAILURE
+
+
+def parse_device_limit(value):
+    """
+    Parses the maximum number of concurrent tasks of a storage device, of
+    the form "PATH=LIMIT", where the device is the one that stores the path.
+
+    :param value: The device limit to parse.
+    :return: A tuple containing the device number and limit.
+    :raises ValueError: If the device limit is malformed, its path does not
+    exist, or its limit is less than one.
+    """
+    path, _, limit = value.rpartition("=")
+    device = get_locality(path)[0] if path else -1
+
+    if device == -1:
+        raise ValueError(f"Cannot find device of: {path}.")
+
+    if int(limit) < 1:
+        raise ValueError(f"Invalid device limit: {limit}.")
+
+    return device, int(limit)
+
+
+def parse_export_target(value):
+    """
+    Parses an export target of the form "TYPE:WIDTHxHEIGHT[:FORMAT]", where
+    the image format defaults to JPEG.
+
+    :param value: The export target to parse.
+    :return: A tuple containing the format type, width, height, and image
+    format.
+    :raises ValueError: If the export target is malformed.
+    """
+    parts = value.split(":")
+
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Malformed export target: {value}.")
+
+    export_type, size = parts[:2]
+    image_format = parts[2] if len(parts) == 3 else "jpeg"
+
+    width, height = (int(dim) for dim in size.lower().split("x"))
+
+    if export_type not in ("coco", "npy", "voc", "wds", "yolov3"):
+        raise ValueError(f"Unknown export type: {export_type}.")
+
+    if image_format not in IMAGE_ENCODERS:
+        raise ValueError(f"Unknown image format: {image_format}.")
+
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid export target size: {size}.")
+
+    return export_type, width, height, image_format
+
+
+def parse_files(pool, parser, files, processes, prefetcher=None,
+                scheduler=None, largest_first=False):
+    """
+    Parses every one of the specified DICOM files on the specified pool.
+
+    Files may be read ahead in the order they are parsed (see
+    :class: 'FilePrefetcher'), in which case they are parsed in small
+    chunks, such that headers are read shortly after being prefetched.
+    Files may also be grouped by the storage device they are read from,
+    ordered by where they are stored, and every device read with its own
+    number of concurrent tasks (see :class: 'DeviceScheduler'), or parsed
+    from the largest to the smallest, in tasks that shrink as work runs out
+    (see :function: 'split_by_cost'), each handed to the next free worker.
+
+    :param pool: The pool of workers to parse with.
+    :param parser: The parse function to use (see
+    :function: 'parse_dicom').
+    :param files: The list of files to parse.
+    :param processes: The number of workers in the pool.
+    :param prefetcher: The prefetcher to read headers ahead with
+    (optional).
+    :param scheduler: The scheduler to dispatch files with (optional).
+    :param largest_first: Whether or not to parse the largest files first,
+    if there is no scheduler.
+    :return: A list of the parsed files, in order.
+    """
+    if scheduler is None and not largest_first and prefetcher is None:
+        return pool.map(parser, files)
+
+    if scheduler is None and not largest_first:
+        handles = prefetcher.prefetch((file_path, 0, HEADER_PREFETCH_SIZE)
+                                      for file_path in files)
+
+        return list(prefetcher.iterate(
+            pool.imap(parser, files,
+                      max(1, min(len(files) // (4 * processes), 16))),
+            handles
+        ))
+
+    if scheduler is None:
+        tasks = [(None, chunk) for chunk in split_by_cost(
+            [get_file_size(file_path) for file_path in files], processes
+        )]
+    else:
+        groups = group_by_locality(((file_path, 0) for file_path in files),
+                                   scheduler.order)
+        tasks = create_tasks(groups,
+                             partial(split_rows, processes=processes))
+
+    handles = [
+        prefetcher.prefetch((files[position], 0, HEADER_PREFETCH_SIZE)
+                            for position in positions)
+        for _, positions in tasks
+    ] if prefetcher is not None else []
+    parsed = [None] * len(files)
+    chunks = [[files[position] for position in positions]
+              for _, positions in tasks]
+    parsed_chunks = scheduler.imap_unordered(
+        pool, partial(apply_each, parser),
+        [(device, chunk) for (device, _), chunk in zip(tasks, chunks)]
+    ) if scheduler is not None else \
+        imap_indexed(pool, partial(apply_each, parser), chunks)
+
+    for index, results in parsed_chunks:
+        if handles:
+            prefetcher.release(handles[index])
+
+        for position, result in zip(tasks[index][1], results):
+            parsed[position] = result
+
+    return parsed
+
+
+def parse_positive_float(value):
+    """
+    Parses a number that must be greater than zero.
+
+    :param value: The number to parse.
+    :return: The number.
+    :raises ValueError: If the number is malformed, not finite, or not
+    greater than zero.
+    """
+    number = float(value)
+
+    if not 0 < number < float("inf"):
+        raise ValueError(f"Invalid positive number: {value}.")
+
+    return number
+
+
+def parse_positive_int(value):
+    """
+    Parses an integer that must be at least one.
+
+    :param value: The integer to parse.
+    :return: The integer.
+    :raises ValueError: If the integer is malformed or less than one.
+    """
+    number = int(value)
+
+    if number < 1:
+        raise ValueError(f"Invalid positive integer: {value}.")
+
+    return number
+
+
+def parse_stages(value):
+    """
+    Parses the number of threads of each export stage, of the form
+    "READ:DECODE:TRANSFORM:ENCODE" (see
+    :function: 'create_export_pipeline').
+
+    :param value: The numbers of threads to parse.
+    :return: A list of the number of threads of each stage, in order.
+    :raises ValueError: If there are not exactly four numbers or any is
+    less than one.
+    """
+    threads = [int(part) for part in value.split(":")]
+
+    if len(threads) != len(STAGE_NAMES) or min(threads) < 1:
+        raise ValueError(f"Invalid stage threads: {value}.")
+
+    return threads
+
+
+def parse_windows(value):
+    """
+    Parses a comma-separated collection of windows, each of the form
+    "CENTER:WIDTH", or "full" for the full range of an image.
+
+    :param value: The collection of windows to parse.
+    :return: A list containing, for each window, a pair of the window center
+    and width, or None for the full range.
+    :raises ValueError: If any window is malformed.
+    """
+    windows = []
+
+    for window in value.split(","):
+        if window.strip().lower() == "full":
+            windows.append(None)
+            continue
+
+        center, width = (float(part) for part in window.split(":"))
+
+        if width <= 0:
+            raise ValueError(f"Invalid window width: {width}.")
+
+        windows.append((center, width))
+
+    return windows
+
+
+def report_decode_statistics(stats_list):
+    """
+    Logs the decoding throughput of each combination of transfer syntax
+    and decoder found in the specified collection of decoding statistics.
+
+    :param stats_list: The collection of decoding statistics to report.
+    """
+    logger = logging.getLogger(__name__)
+    totals = {}
+
+    for stats in stats_list:
+        for key, counts in stats.items():
+            total = totals.setdefault(key, [0, 0, 0.0])
+
+            for index, count in enumerate(counts):
+                total[index] += count
+
+    for (syntax, handler), (images, pixels, seconds) in sorted(totals.items()):
+        logger.info("Decoded: {} images with transfer syntax: {} using: {} "
+                    "at: {:.1f} Mpixel/s ({:.1f} ms/image).", images,
+                    UID(syntax).name, handler,
+                    pixels / max(seconds, 1e-9) / 1e6,
+                    seconds / images * 1e3)
+
+
+def report_stage_statistics(stats_list):
+    """
+    Logs the throughput and utilization of each export stage found in the
+    specified collection of stage statistics (see
+    :function: 'ExportPipeline.get_statistics').
+
+    The stage with the highest utilization limits the throughput of every
+    other; stages that spend much of their time waiting to hand entries on
+    have more threads than they need.
+
+    :param stats_list: The collection of stage statistics to report.
+    """
+    logger = logging.getLogger(__name__)
+    totals = {}
+
+    for stats in stats_list:
+        for name, counts in stats.items():
+            total = totals.setdefault(name, [0, 0.0, 0.0, 0.0])
+
+            for index, count in enumerate(counts):
+                total[index] += count
+
+    for name, (entries, busy, blocked, available) in totals.items():
+        logger.info("Stage: {} processed: {} entries at: {:.1f} ms/entry, "
+                    "working: {:.0f}% and blocked: {:.0f}% of the time.",
+                    name, entries, busy / max(entries, 1) * 1e3,
+                    busy / max(available, 1e-9) * 100,
+                    blocked / max(available, 1e-9) * 100)
+
+
+def split_rows(rows, processes, max_size=64):
+    """
+    Splits the specified collection of row positions into tasks for a
+    process pool of the specified size.
+
+    Tasks hold about a quarter of each process's share of rows, but no more
+    than the specified number, such that work stays balanced between
+    processes and results are returned steadily.
+
+    :param rows: The collection of row positions to split (e.g. a range).
+    :param processes: The number of processes in the pool.
+    :param max_size: The maximum number of rows per task.
+    :return: A list of collections of row positions, in order.
+    """
+    size = max(1, min(len(rows) // (4 * processes), max_size))
+
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+
 def print_tags(args):
     """
     Pretty-prints all tags in a specified file with options.
@@ -0,0 +1,258 @@
+"""
+Contains classes and functions pertaining to the pools of workers over
+which actions distribute their work.
+
+Every pool provides the interface of :class: 'multiprocessing.pool.Pool'
+used by actions (apply, map, imap, imap_unordered, close, join, and use
+as a context manager), such that actions may run on processes, threads,
+or both alike (see :function: 'create_executor').
+"""
+from functools import partial
+from itertools import islice
+from multiprocessing.pool import Pool, ThreadPool
+
+
+_HYBRID_STATE = {"pool": None}
+"""
+Represents the pool of threads this (hybrid pool worker) process runs each
+of its tasks on, if it was initialized as a worker (see
+:function: 'initialize_hybrid').
+"""
+
+
+class HybridPool:
+    """
+    Represents a pool of worker processes, each of which runs its tasks on
+    its own pool of threads.
+
+    Processes allow work bound by the CPU to run in parallel, while threads
+    keep every process busy while some of its tasks wait on I/O (e.g. files
+    on network storage).  Tasks are handed to processes in batches of (at
+    least) one task per thread, and every thread of a process shares the
+    state set up by the pool initializer, which runs once per process.
+    """
+
+    def __init__(self, processes, threads, initializer=None, initargs=()):
+        """
+        :param processes: The number of worker processes.
+        :param threads: The number of threads of each worker process.
+        :param initializer: The function to initialize each worker process
+        with (optional).
+        :param initargs: Any arguments to the initializer.
+        """
+        self.processes = processes
+        self.threads = threads
+        self.pool = Pool(processes, initialize_hybrid,
+                         (threads, initializer, initargs))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.terminate()
+
+    def apply(self, fn, args=()):
+        """
+        Applies the specified function to the specified arguments on a
+        worker process, which runs nothing else meanwhile.
+
+        :param fn: The function to apply.
+        :param args: Any arguments to the function.
+        :return: The result.
+        """
+        return self.pool.apply(fn, args)
+
+    def close(self):
+        """
+        Prevents any more tasks from being submitted to this pool.
+        """
+        self.pool.close()
+
+    def imap(self, fn, iterable, chunksize=1):
+        """
+        Applies the specified function to every item of the specified
+        collection, lazily, in batches of the specified number of items per
+        thread.
+
+        :param fn: The function to apply.
+        :param iterable: The collection of items to apply the function to.
+        :param chunksize: The number of items per thread of each batch.
+        :return: An iterator of the results, in order.
+        """
+        batches = split_batches(iterable, self.threads * chunksize)
+
+        for results in self.pool.imap(partial(map_threaded, fn), batches):
+            yield from results
+
+    def imap_unordered(self, fn, iterable, chunksize=1):
+        """
+        Applies the specified function to every item of the specified
+        collection, lazily, in batches of the specified number of items per
+        thread, returning results as batches finish.
+
+        :param fn: The function to apply.
+        :param iterable: The collection of items to apply the function to.
+        :param chunksize: The number of items per thread of each batch.
+        :return: An iterator of the results, in the order batches finish.
+        """
+        batches = split_batches(iterable, self.threads * chunksize)
+
+        for results in self.pool.imap_unordered(partial(map_threaded, fn),
+                                                batches):
+            yield from results
+
+    def join(self):
+        """
+        Waits for every worker process of this pool to exit.
+        """
+        self.pool.join()
+
+    def map(self, fn, iterable, chunksize=None):
+        """
+        Applies the specified function to every item of the specified
+        collection.
+
+        Unless a number of items per thread is given, every worker process
+        is handed about four batches, as with :class: 'Pool'.
+
+        :param fn: The function to apply.
+        :param iterable: The collection of items to apply the function to.
+        :param chunksize: The number of items per thread of each batch
+        (optional).
+        :return: A list of the results, in order.
+        """
+        items = list(iterable)
+
+        if chunksize is None:
+            chunksize = max(1, -(-len(items) //
+                                 (4 * self.processes * self.threads)))
+
+        return list(self.imap(fn, items, chunksize))
+
+    def terminate(self):
+        """
+        Stops every worker process of this pool immediately.
+        """
+        self.pool.terminate()
+
+
+class SharedThreadPool(ThreadPool):
+    """
+    Represents a pool of threads that all share the state of this process.
+
+    Unlike :class: 'ThreadPool', the pool initializer runs once, in this
+    process, rather than once per thread, and a finalizer, if any, runs once
+    every thread has exited (see :function: 'join'), which is when a process
+    pool worker would have been finalized.
+    """
+
+    def __init__(self, processes=None, initializer=None, initargs=(),
+                 finalizer=None):
+        """
+        :param processes: The number of threads.
+        :param initializer: The function to initialize this process with
+        (optional).
+        :param initargs: Any arguments to the initializer.
+        :param finalizer: The function to finalize this process with once
+        every thread has exited (optional).
+        """
+        if initializer is not None:
+            initializer(*initargs)
+
+        self.finalizer = finalizer
+
+        super().__init__(processes)
+
+    def join(self):
+        super().join()
+
+        if self.finalizer is not None:
+            self.finalizer, finalizer = None, self.finalizer
+
+            finalizer()
+
+
+def create_executor(executor, processes, threads=4, initializer=None,
+                    initargs=(), finalizer=None):
+    """
+    Creates a pool of workers of the specified type.
+
+    Pools of processes ("process") suit work bound by the CPU, but every
+    item and result is pickled.  Pools of threads ("thread") share this
+    process, so nothing is pickled, but only work that releases the GIL
+    (e.g. I/O) runs in parallel.  Hybrid pools ("hybrid") run threads
+    within each of their processes (see :class: 'HybridPool').
+
+    :param executor: The type of pool to create.
+    :param processes: The number of worker processes, or threads for pools
+    of threads.
+    :param threads: The number of threads of each worker process of a
+    hybrid pool.
+    :param initializer: The function to initialize each worker process
+    with (optional).
+    :param initargs: Any arguments to the initializer.
+    :param finalizer: The function to finalize this process with once a
+    pool of threads has been joined (optional); worker processes must
+    finalize themselves.
+    :return: A pool of workers.
+    :raises ValueError: If the type of pool is unknown.
+    """
+    if executor == "process":
+        return Pool(processes, initializer, initargs)
+
+    if executor == "thread":
+        return SharedThreadPool(processes, initializer, initargs, finalizer)
+
+    if executor == "hybrid":
+        return HybridPool(processes, threads, initializer, initargs)
+
+    raise ValueError(f"Unknown executor: {executor}.")
+
+
+def initialize_hybrid(threads, initializer=None, initargs=()):
+    """
+    Initializes this (hybrid pool worker) process with the specified
+    initializer and a pool of threads to run its tasks on.
+
+    :param threads: The number of threads to run tasks on.
+    :param initializer: The function to initialize this process with
+    (optional).
+    :param initargs: Any arguments to the initializer.
+    """
+    if initializer is not None:
+        initializer(*initargs)
+
+    _HYBRID_STATE["pool"] = ThreadPool(threads)
+
+
+def map_threaded(fn, batch):
+    """
+    Applies the specified function to every item of the specified batch on
+    the threads of this (hybrid pool worker) process.
+
+    :param fn: The function to apply.
+    :param batch: The collection of items to apply the function to.
+    :return: A list of the results, in order.
+    """
+    return _HYBRID_STATE["pool"].map(fn, batch, 1)
+
+
+def split_batches(iterable, size):
+    """
+    Splits the specified collection of items, lazily, into lists of the
+    specified size.
+
+    :param iterable: The collection of items to split.
+    :param size: The number of items per list.
+    :return: A generator of lists of items, in order; the last may be
+    shorter.
+    """
+    iterator = iter(iterable)
+
+    while True:
+        batch = list(islice(iterator, size))
+
+        if not batch:
+            return
+
+        yield batch
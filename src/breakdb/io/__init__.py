@@ -3,7 +3,10 @@ Contains classes and functions pertaining to database serialization.
 """
 import os
 
+from breakdb.io.export.coco import COCODatabaseEntryExporter
+from breakdb.io.export.tensor import TensorPackEntryExporter
 from breakdb.io.export.voc import VOCDatabaseEntryExporter
+from breakdb.io.export.wds import WebDatasetEntryExporter
 from breakdb.io.export.yolo import YOLODatabaseEntryExporter
 from breakdb.io.reading import CsvDatabaseReader, ExcelDatabaseReader, \
     JsonDatabaseReader
@@ -12,7 +15,10 @@ from breakdb.io.writing import CsvDatabaseWriter, ExcelDatabaseWriter, \
 
 
 _EXPORTERS = {
+    "coco": COCODatabaseEntryExporter(),
+    "npy": TensorPackEntryExporter(),
     "voc": VOCDatabaseEntryExporter(),
+    "wds": WebDatasetEntryExporter(),
     "yolov3": YOLODatabaseEntryExporter()
 }
 
@@ -42,7 +48,12 @@ COLUMN_NAMES = [
     "File Path",        # Location of image file on disk.
     "Scaling",          # Whether there is any scaling information.
     "Windowing",        # Whether or not there is any windowing information.
-    "Annotation"        # All discovered annotations.
+    "Annotation",       # All discovered annotations.
+    "Transfer Syntax",  # The encoding of the image file.
+    "Pixel Offset",     # Location of raw pixel data in image file (or -1).
+    "Pixel Length",     # The size of raw pixel data (in bytes).
+    "Pixel Type",       # The data type of raw pixel data.
+    "Pixel Shape"       # The dimensions of raw pixel data (e.g. "48x64").
 ]
 
 
@@ -2,11 +2,35 @@
 Contains classes and functions related to exporting collated DICOM databases to
 different file structures.
 """
+import hashlib
+import logging
 import os
 import shutil
+import threading
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from multiprocessing.util import Finalize
 
-from breakdb.io.image import read_from_dataset, format_as
+import numpy as np
+
+from breakdb.io.export.pipeline import ExportPipeline
+from breakdb.io.image import render_from_dataset, format_as, \
+    compute_image_layout, compute_resize_dimensions, \
+    compute_reduction_factor, decode_image, get_read_range, load_image, \
+    pop_decode_statistics, render_decoded
+from breakdb.io.prefetch import FilePrefetcher
+
+
+_WORKER_STATE = {"targets": [], "db": None, "names": [], "writer": None,
+                 "stages": None, "prefetcher": None}
+"""
+Represents the export targets this (worker) process exports every entry to,
+the database and entry names it exports entries from, the writer it saves
+entries with or the pipeline of stages it exports entries through, and the
+prefetcher it reads entries ahead with (if any), if it was initialized as
+a worker (see :function: 'initialize_worker').
+"""
 
 
 class ExportEntryFormatError(Exception):
@@ -19,15 +43,57 @@ class ExportEntryFormatError(Exception):
     def __init__(self, name, export_type):
         super().__init__(f"Could not format entry: {name} as: {export_type}.")
 
+        self.name = name
+        self.export_type = export_type
+
+    def __reduce__(self):
+        # Raised in worker processes, so must be rebuilt from its own
+        # arguments rather than its message when unpickled.
+        return self.__class__, (self.name, self.export_type)
+
 
 class DatabaseEntryExporter(metaclass=ABCMeta):
     """
     Represents a mechanism for exporting a single entry from a collated DICOM
     database to a file-based annotation.
+
+    Exporting is split into two halves so that the image of an entry may be
+    rendered once and shared between several exporters (see
+    :function: 'export_targets'): each exporter decides only where its
+    images belong and how its annotations are written.
+    """
+
+    format_name = None
+    """
+    Represents the human-readable name of the export format.
     """
 
+    supports_updates = True
+    """
+    Represents whether or not every entry is exported to files of its own,
+    such that entries may be exported incrementally, relabelled, or fanned
+    out.
+    """
+
+    def begin_run(self, target, db, windows=None):
+        """
+        Prepares the specified export target before any entry of the
+        specified database is exported to it, such that any work that does
+        not depend on a single entry is done exactly once per export.
+
+        This is called by the main process, after the directory structure
+        of the target has been created.
+
+        :param target: The export target to prepare.
+        :param db: The DICOM database to export.
+        :param windows: The collection of windows rendered as image
+        channels (optional).
+        """
+        pass
+
     @abstractmethod
-    def create_directory_structure(self, base_dir, force=False):
+    def create_directory_structure(self, base_dir, force=False,
+                                   exist_ok=False):
         """
         Creates the directory structure expected for a custom formatted
         dataset.
@@ -36,15 +102,31 @@ class DatabaseEntryExporter(metaclass=ABCMeta):
         structure.
         :param force: Whether or not to overwrite a directory if it already
         exists.
+        :param exist_ok: Whether or not to keep a directory, and its
+        contents, if it already exists.
         :return: A tuple containing the annotation, image, and master list
         directory paths.
         """
         pass
 
-    @abstractmethod
+    def end_run(self, target):
+        """
+        Releases anything kept for the specified export target once every
+        entry has been exported to it and its index written.
+
+        This is called by the main process.
+
+        :param target: The export target to finish.
+        """
+        pass
+
     def export(self, entry, base_dir, target_width=None, target_height=None,
                ignore_scaling=False, ignore_windowing=True,
-               keep_aspect_ratio=True, no_upscale=False, skip_broken=False):
+               keep_aspect_ratio=True, no_upscale=False, skip_broken=False,
+               pipeline="lut", intermediate_scale=None,
+               full_decode=False, resample="bicubic", reducing_gap=None,
+               image_format="jpeg", encoder_options=None, windows=None,
+               fan_out=0):
         """
         Exports the specified database entry
 
@@ -61,18 +143,336 @@ class DatabaseEntryExporter(metaclass=ABCMeta):
         stays the same during (any) resize operations.
         :param no_upscale: Whether or not to forbid upscaling.
         :param skip_broken: Whether or not to ignore I/O errors.
+        :param pipeline: The pixel pipeline to render images with.
+        :param intermediate_scale: The minimum multiple of the resized
+        dimensions to downsample (raw) images to before windowing (optional).
+        :param full_decode: Whether or not to always decode compressed images
+        at their full resolution.
+        :param resample: The name of the resampling filter to resize images
+        with.
+        :param reducing_gap: The minimum multiple of the resized dimensions
+        to shrink images to with a box filter before resampling (optional).
+        :param image_format: The name of the image format to save images as.
+        :param encoder_options: Any options to pass to the image encoder that
+        override its defaults (optional).
+        :param windows: The collection of windows to render as image
+        channels (optional).
+        :param fan_out: The number of levels of hashed subdirectories to
+        spread images and annotations over.
         :return: A tuple containing the master list identifier and
         classification.
         """
+        target = ExportTarget(self, base_dir, target_width, target_height,
+                              image_format, encoder_options, fan_out)
+
+        return export_targets(entry, [target], ignore_scaling,
+                              ignore_windowing, keep_aspect_ratio, no_upscale,
+                              skip_broken, pipeline, intermediate_scale,
+                              full_decode, resample, reducing_gap,
+                              windows)[0]
+
+    def finish_worker(self, target):
+        """
+        Releases anything the current worker process opened or allocated
+        for the specified export target (see :function: 'init_worker').
+
+        This is called by each worker process as it exits.
+
+        :param target: The export target to finish.
+        """
         pass
 
+    @abstractmethod
+    def get_annotation_path(self, base_dir, name):
+        """
+        Returns the path the annotations of an entry with the specified name
+        should be written to.
+
+        Names may include subdirectories (see :function: 'get_fan_out_name'),
+        which must be preserved.
+
+        :param base_dir: The directory the entry is exported to.
+        :param name: The name of the entry.
+        :return: A file path.
+        """
+        pass
+
+    @abstractmethod
+    def get_image_path(self, base_dir, name, image_format):
+        """
+        Returns the path an exported image with the specified name and
+        format should be saved to.
+
+        Names may include subdirectories (see :function: 'get_fan_out_name'),
+        which must be preserved.
+
+        :param base_dir: The directory the entry is exported to.
+        :param name: The name of the entry.
+        :param image_format: The name of the image format to save as.
+        :return: A file path.
+        """
+        pass
+
+    def init_worker(self, target):
+        """
+        Prepares the current worker process to export entries to the
+        specified export target, e.g. by opening files or allocating buffers
+        that are reused for every entry it exports.
+
+        This is called by each worker process before it exports any entry;
+        the exporter is the same object for every entry it then exports.
+
+        :param target: The export target to prepare.
+        """
+        pass
+
+    def open_image(self, base_dir, name, image_format):
+        """
+        Returns the file, file object, or array to save the exported image
+        of the entry with the specified name to.
+
+        By default, images are saved directly to their paths (see
+        :function: 'get_image_path').
+
+        :param base_dir: The directory the entry is exported to.
+        :param name: The name of the entry.
+        :param image_format: The name of the image format to save as.
+        :return: A file path, file object, or array.
+        """
+        return self.get_image_path(base_dir, name, image_format)
+
+    @abstractmethod
+    def write_annotation(self, ds, name, base_dir, image_path, dims,
+                         transform):
+        """
+        Writes the annotations of the specified database entry, transformed
+        to match its exported image, to its annotation path (see
+        :function: 'get_annotation_path').
+
+        The database entry itself is never modified, as it may be shared by
+        several exporters.
+
+        :param ds: The DICOM database entry to use.
+        :param name: The name of the entry.
+        :param base_dir: The directory the entry is exported to.
+        :param image_path: The path, file object, or array the exported
+        image was saved to (see :function: 'open_image').
+        :param dims: The exported image dimensions and mode.
+        :param transform: The transformation for coordinate conversion.
+        :return: A tuple containing the master list identifier and
+        classification.
+        """
+        pass
+
+    @abstractmethod
+    def write_index(self, base_dir, names, image_format):
+        """
+        Writes the index file(s) that list every exported entry, such that
+        consumers of the dataset need not search its directories.
+
+        :param base_dir: The directory the entries were exported to.
+        :param names: The collection of names of every exported entry.
+        :param image_format: The name of the image format images were saved
+        as.
+        """
+        pass
+
+
+class ExportTarget:
+    """
+    Represents a single destination for exported database entries: the
+    exporter to use, the directory to export to, the dimensions and format
+    of the exported images, and the number of levels of hashed
+    subdirectories to spread them over.
+    """
+
+    def __init__(self, exporter, base_dir, target_width=None,
+                 target_height=None, image_format="jpeg",
+                 encoder_options=None, fan_out=0):
+        self.exporter = exporter
+        self.base_dir = base_dir
+        self.target_width = target_width
+        self.target_height = target_height
+        self.image_format = image_format
+        self.encoder_options = encoder_options
+        self.fan_out = fan_out
+
+
+class ExportWriter:
+    """
+    Represents a small pool of threads that save rendered entries (see
+    :function: 'write_targets') in the background, such that the process
+    that rendered them may decode the next entry in the meantime.
+
+    Image encoders and file I/O release the GIL, so saving overlaps with
+    decoding even within a single process.  Only a bounded number of
+    entries may be pending at once; submitting another blocks until one
+    has been saved, which keeps memory bounded by a few rendered images.
+    """
+
+    def __init__(self, threads=2, max_pending=None):
+        self.executor = ThreadPoolExecutor(threads)
+        self.slots = threading.BoundedSemaphore(max_pending or 2 * threads)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def shutdown(self):
+        """
+        Waits for every pending entry to be saved and stops all threads.
+        """
+        self.executor.shutdown(wait=True)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules the specified function to be called with the specified
+        arguments by one of the threads, once fewer than the maximum number
+        of calls are pending.
+
+        :param fn: The function to call.
+        :param args: Any arguments to the function.
+        :param kwargs: Any keyword arguments to the function.
+        :return: A future of the result of the function.
+        """
+        self.slots.acquire()
+
+        try:
+            future = self.executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self.slots.release())
+
+        return future
+
+
+def compute_bounding_box(coords):
+    """
+    Converts the specified collection of coordinates into an axis-aligned
+    bounding box.
+
+    :param coords: The DICOM annotation as a list of single coordinates.
+    :return: A tuple of the minimum x, minimum y, maximum x, and maximum y
+    coordinates.
+    """
+    return min(coords[0::2]), min(coords[1::2]), \
+        max(coords[0::2]), max(coords[1::2])
+
+
+def compute_render_factor(ds, sizes, keep_aspect_ratio=True,
+                          no_upscale=False, intermediate_scale=None,
+                          full_decode=False):
+    """
+    Computes the largest integer factor the image of the specified dataset
+    may be reduced by, while decoding and before rendering, for export at
+    each of the specified sizes (see :function: 'render_image').
+
+    :param ds: The DICOM dataset to use.
+    :param sizes: A collection of pairs of the maximum width and height
+    the image will be resized to.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :param intermediate_scale: The minimum multiple of the resized dimensions
+    to downsample the (raw) image to before windowing (optional).
+    :param full_decode: Whether or not to always decode compressed images at
+    their full resolution.
+    :return: The integer factor to reduce the image by.
+    """
+    if not intermediate_scale and full_decode:
+        return 1
+
+    return min(
+        compute_reduction_factor(
+            ds.Width, ds.Height,
+            *compute_resize_dimensions(ds.Width, ds.Height, width, height,
+                                       keep_aspect_ratio, no_upscale),
+            intermediate_scale or 1.0
+        ) for width, height in sizes
+    )
+
+
+def create_export_pipeline(stage_threads):
+    """
+    Creates a pipeline of the four stages every database entry is exported
+    through, each with the specified number of threads (see
+    :class: 'ExportPipeline'):
+
+        1. read: the DICOM file of each entry is read (see
+           :function: 'read_staged'),
+        2. decode: its (raw) pixel data is decoded (see
+           :function: 'decode_staged'),
+        3. transform: its image is scaled, windowed, and normalized (see
+           :function: 'transform_staged'), and
+        4. encode: its image is resized, encoded, and saved, and its
+           annotations transformed and written, for every target (see
+           :function: 'encode_staged').
+
+    :param stage_threads: The number of threads of each stage, in order.
+    :return: A pipeline of export stages (see :function: 'export_staged').
+    """
+    return ExportPipeline(list(zip(STAGE_NAMES, [
+        read_staged, decode_staged, transform_staged, encode_staged
+    ], stage_threads)))
+
+
+def decode_staged(item):
+    """
+    Decodes the (raw) pixel data of the database entry of the specified
+    item of an export pipeline (see :function: 'create_export_pipeline').
+
+    :param item: A tuple of the options, the database entry and its name,
+    and the metadata of its DICOM file.
+    :return: A tuple of the options, the database entry and its name, the
+    metadata of its DICOM file, the reduction factor it was decoded at, and
+    its decoded pixel data and scale.
+    """
+    options, entry, meta = item
+    factor = compute_render_factor(entry[0], options["sizes"],
+                                   options["keep_aspect_ratio"],
+                                   options["no_upscale"],
+                                   options["intermediate_scale"],
+                                   options["full_decode"])
+
+    return (options, entry, meta, factor) + decode_image(entry[0], meta,
+                                                         factor)
+
+
+def encode_staged(item):
+    """
+    Resizes, encodes, and saves the rendered image of the database entry of
+    the specified item of an export pipeline, and writes its annotations,
+    for every export target (see :function: 'create_export_pipeline').
+
+    :param item: A tuple of the options, the database entry and its name,
+    and its rendered image.
+    :return: A list of the master list results of the entry, one per
+    target (see :function: 'write_targets').
+    """
+    options, entry, rendered = item
+
+    return write_targets(entry, options["targets"], rendered,
+                         options["keep_aspect_ratio"], options["no_upscale"],
+                         options["skip_broken"], options["resample"],
+                         options["reducing_gap"], options["windows"])
+
 
 def export_image(ds, file_path, target_width=None, target_height=None,
                  ignore_scaling=False, ignore_windowing=False,
-                 keep_aspect_ratio=True, no_upscale=False):
+                 keep_aspect_ratio=True, no_upscale=False, pipeline="lut",
+                 intermediate_scale=None, full_decode=False,
+                 resample="bicubic", reducing_gap=None, image_format="jpeg",
+                 encoder_options=None, windows=None):
     """
     Exports an image from the specified dataset with the specified parameters.
 
+    This is equivalent to :function: 'render_image' followed by
+    :function: 'save_image'.
+
     :param ds: The DICOM dataset to use.
     :param file_path: The file to save the image data to.
     :param target_width: The maximum width to resize the image to.
@@ -84,51 +484,725 @@ def export_image(ds, file_path, target_width=None, target_height=None,
     :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
     stays the same during (any) resize operations.
     :param no_upscale: Whether or not to forbid upscaling.
+    :param pipeline: The pixel pipeline to render the image with.
+    :param intermediate_scale: The minimum multiple of the resized dimensions
+    to downsample the (raw) image to before windowing (optional).
+    :param full_decode: Whether or not to always decode compressed images at
+    their full resolution.
+    :param resample: The name of the resampling filter to resize with.
+    :param reducing_gap: The minimum multiple of the resized dimensions to
+    shrink the image to with a box filter before resampling (optional).
+    :param image_format: The name of the image format to save the image as
+    (see :attr: 'IMAGE_ENCODERS').
+    :param encoder_options: Any options to pass to the image encoder that
+    override its defaults (optional).
+    :param windows: The collection of windows to render as image channels
+    (optional).
     :return: A tuple containing the exported image dimensions and
     transformation for coordinate conversion.
+    :raises KeyError: If the image format is not supported.
     """
-    attrs, arr = read_from_dataset(ds, ignore_scaling=ignore_scaling,
-                                   ignore_windowing=ignore_windowing)
-    image, transform = format_as(attrs, arr, target_width,
-                                 target_height, keep_aspect_ratio,
-                                 no_upscale)
+    rendered = render_image(ds, [(target_width, target_height)],
+                            ignore_scaling, ignore_windowing,
+                            keep_aspect_ratio, no_upscale, pipeline,
+                            intermediate_scale, full_decode,
+                            get_image_type(image_format), windows)
+
+    return save_image(rendered, file_path, target_width, target_height,
+                      keep_aspect_ratio, no_upscale, resample, reducing_gap,
+                      image_format, encoder_options)
+
+
+def export_staged(entries, targets, staged, ignore_scaling=False,
+                  ignore_windowing=True, keep_aspect_ratio=True,
+                  no_upscale=False, skip_broken=False, pipeline="lut",
+                  intermediate_scale=None, full_decode=False,
+                  resample="bicubic", reducing_gap=None, windows=None):
+    """
+    Exports the specified database entries to every one of the specified
+    export targets through the specified pipeline of export stages (see
+    :function: 'create_export_pipeline').
+
+    Every entry is exported exactly as :function: 'export_targets' would.
+    The pipeline may be shared by any number of calls, including
+    concurrent ones, as every entry carries the options it is exported
+    with.
+
+    :param entries: The collection of tuples of the DICOM database entry to
+    export and the name to use, in order.
+    :param targets: The collection of export targets to export to.
+    :param staged: The pipeline of export stages to use.
+    :param ignore_scaling: Whether or not to ignore, or not apply,
+    any applicable scaling operations.
+    :param ignore_windowing: Whether or not to ignore, or not apply,
+    any applicable windowing operations.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :param skip_broken: Whether or not to ignore I/O errors.
+    :param pipeline: The pixel pipeline to render images with.
+    :param intermediate_scale: The minimum multiple of the resized
+    dimensions to downsample (raw) images to before windowing (optional).
+    :param full_decode: Whether or not to always decode compressed images
+    at their full resolution.
+    :param resample: The name of the resampling filter to resize images
+    with.
+    :param reducing_gap: The minimum multiple of the resized dimensions
+    to shrink images to with a box filter before resampling (optional).
+    :param windows: The collection of windows to render as image channels
+    (optional).
+    :return: A pair containing, in order, a list of the master list results
+    of every entry (see :function: 'export_targets') and a dictionary of
+    the statistics of every stage since they were last taken (see
+    :function: 'ExportPipeline.pop_statistics').
+    :raises ExportEntryFormatError: If an entry could not be exported and
+    broken entries are not skipped.
+    """
+    logger = logging.getLogger(__name__)
+
+    options = {
+        "targets": targets,
+        "dtype": np.result_type(*(get_image_type(target.image_format)
+                                  for target in targets)),
+        "sizes": [(target.target_width, target.target_height)
+                  for target in targets],
+        "ignore_scaling": ignore_scaling,
+        "ignore_windowing": ignore_windowing,
+        "keep_aspect_ratio": keep_aspect_ratio,
+        "no_upscale": no_upscale,
+        "skip_broken": skip_broken,
+        "pipeline": pipeline,
+        "intermediate_scale": intermediate_scale,
+        "full_decode": full_decode,
+        "resample": resample,
+        "reducing_gap": reducing_gap,
+        "windows": windows
+    }
+    results = []
+
+    futures = [(name, staged.submit((options, (ds, name))))
+               for ds, name in entries]
+
+    for name, future in futures:
+        try:
+            results.append(future.result())
+        except ExportEntryFormatError:
+            raise
+        except Exception as ex:
+            if not skip_broken:
+                raise ExportEntryFormatError(
+                    name, targets[0].exporter.format_name
+                ) from ex
+
+            logger.warning("Could not export database entry: {}.", name)
+            logger.warning("  Reason: {}.", ex)
+
+            results.append([() for _ in targets])
+
+    return results, staged.pop_statistics()
+
+
+def export_targets(entry, targets, ignore_scaling=False,
+                   ignore_windowing=True, keep_aspect_ratio=True,
+                   no_upscale=False, skip_broken=False, pipeline="lut",
+                   intermediate_scale=None, full_decode=False,
+                   resample="bicubic", reducing_gap=None, windows=None,
+                   labels_only=False, writer=None):
+    """
+    Exports the specified database entry to every one of the specified
+    export targets.
+
+    The image of the entry is decoded and rendered only once, at the
+    resolution needed by the largest target, and then resized, encoded,
+    and annotated separately for each target (see
+    :function: 'write_targets'), optionally in the background by the
+    specified writer.
+
+    Alternatively, only the annotations may be exported, in which case the
+    image is neither read nor written; the geometry of each exported image
+    is computed from the database entry alone (see
+    :function: 'layout_image').
+
+    :param entry: A tuple of the DICOM database entry to export and the
+    name to use.
+    :param targets: The collection of export targets to export to.
+    :param ignore_scaling: Whether or not to ignore, or not apply,
+    any applicable scaling operations.
+    :param ignore_windowing: Whether or not to ignore, or not apply,
+    any applicable windowing operations.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :param skip_broken: Whether or not to ignore I/O errors.
+    :param pipeline: The pixel pipeline to render images with.
+    :param intermediate_scale: The minimum multiple of the resized
+    dimensions to downsample (raw) images to before windowing (optional).
+    :param full_decode: Whether or not to always decode compressed images
+    at their full resolution.
+    :param resample: The name of the resampling filter to resize images
+    with.
+    :param reducing_gap: The minimum multiple of the resized dimensions
+    to shrink images to with a box filter before resampling (optional).
+    :param windows: The collection of windows to render as image channels
+    (optional).
+    :param labels_only: Whether or not to only export annotations.
+    :param writer: The writer to save the entry with (optional).
+    :return: A list containing, for each target, a tuple of the master list
+    identifier and classification (or an empty tuple if the entry could not
+    be exported and broken entries are skipped), or a future of it if a
+    writer is given.
+    :raises ExportEntryFormatError: If the entry could not be exported and
+    broken entries are not skipped.
+    """
+    logger = logging.getLogger(__name__)
+
+    ds, name = entry
+    rendered = None
+
+    logger.info("Exporting database entry: {}.", name)
+
+    try:
+        if not labels_only:
+            dtype = np.result_type(*(get_image_type(target.image_format)
+                                     for target in targets))
+            sizes = [(target.target_width, target.target_height)
+                     for target in targets]
 
-    image.save(file_path)
+            rendered = render_image(ds, sizes, ignore_scaling,
+                                    ignore_windowing, keep_aspect_ratio,
+                                    no_upscale, pipeline, intermediate_scale,
+                                    full_decode, dtype, windows)
+    except Exception as ex:
+        if not skip_broken:
+            raise ExportEntryFormatError(
+                name, targets[0].exporter.format_name
+            ) from ex
+
+        logger.warning("Could not export database entry: {}.", name)
+        logger.warning("  Reason: {}.", ex)
+
+        if writer is None:
+            return [() for _ in targets]
+
+        future = Future()
+        future.set_result([() for _ in targets])
+
+        return future
+
+    write = partial(write_targets, entry, targets, rendered,
+                    keep_aspect_ratio, no_upscale, skip_broken, resample,
+                    reducing_gap, windows, labels_only)
+
+    if writer is None:
+        return write()
+
+    return writer.submit(write)
+
+
+def export_worker_rows(rows, **kwargs):
+    """
+    Exports the entries at the specified row positions of the database of
+    this worker process (see :function: 'initialize_worker') to its export
+    targets and collects the decoding statistics recorded while doing so.
 
-    return (image.width, image.height, attrs[2]), transform
+    Only the row positions are sent to the worker, so no entry is ever
+    indexed or pickled by the main process.  If the worker has a writer,
+    each entry is saved in the background while the next is rendered, and
+    if it has stages, entries are exported through them (see
+    :function: 'export_staged'); either way, every entry has been saved
+    once this returns.  If it has a prefetcher, the files of the entries
+    are read ahead of their export (see :class: 'FilePrefetcher').
+
+    :param rows: The collection of row positions to export (e.g. a range).
+    :param kwargs: Any additional arguments to :function: 'export_targets'.
+    :return: A pair containing a list of the master list results of every
+    entry, in row order, and a dictionary of the decoding ("decode") and
+    stage ("stages") statistics.
+    """
+    db = _WORKER_STATE["db"]
+    names = _WORKER_STATE["names"]
+    prefetcher = _WORKER_STATE["prefetcher"]
+    writer = _WORKER_STATE["writer"]
+    entries = [(db.iloc[row, :], names[row]) for row in rows]
+    stages = {}
+
+    if prefetcher is not None:
+        handles = prefetcher.prefetch(get_read_range(ds)
+                                      for ds, _ in entries)
+        entries = prefetcher.iterate(entries, handles)
+
+    if _WORKER_STATE["stages"] is not None:
+        results, stages = export_staged(entries, _WORKER_STATE["targets"],
+                                        _WORKER_STATE["stages"], **kwargs)
+    else:
+        results = [
+            export_targets(entry, _WORKER_STATE["targets"], writer=writer,
+                           **kwargs)
+            for entry in entries
+        ]
+
+    if writer is not None:
+        results = [result.result() for result in results]
+
+    return results, {"decode": pop_decode_statistics(), "stages": stages}
+
+
+def finalize_worker():
+    """
+    Finishes every export target of this worker process (see
+    :function: 'DatabaseEntryExporter.finish_worker').
+    """
+    if _WORKER_STATE["writer"] is not None:
+        _WORKER_STATE["writer"].shutdown()
+
+    if _WORKER_STATE["stages"] is not None:
+        _WORKER_STATE["stages"].shutdown()
+
+    if _WORKER_STATE["prefetcher"] is not None:
+        _WORKER_STATE["prefetcher"].close()
+
+    for target in _WORKER_STATE["targets"]:
+        target.exporter.finish_worker(target)
+
+    _WORKER_STATE.update(targets=[], db=None, names=[], writer=None,
+                         stages=None, prefetcher=None)
+
+
+def get_image_extension(image_format):
+    """
+    Returns the file extension to use for images saved in the specified
+    format.
+
+    :param image_format: The name of the image format to use.
+    :return: A file extension.
+    :raises KeyError: If the image format is not supported.
+    """
+    return IMAGE_ENCODERS[image_format][1]
 
 
-def get_database_entries(db):
+def get_image_type(image_format):
+    """
+    Returns the unsigned integer type images saved in the specified format
+    must be rendered to.
+
+    :param image_format: The name of the image format to use.
+    :return: An unsigned integer type.
+    """
+    return np.uint16 if image_format == "png16" else np.uint8
+
+
+def get_entry_names(db, use_ids=False):
+    """
+    Returns the unique name of every entry of the specified collated DICOM
+    database for file operations.
+
+    Entries are named by their position in the database unless their
+    identifiers are to be used instead, which keeps names stable as entries
+    are added to or removed from the database.
+
+    :param db: The DICOM database to use.
+    :param use_ids: Whether or not to name entries by their identifiers.
+    :return: A list of entry names, in database order.
+    """
+    if use_ids:
+        return [str(entry_id) for entry_id in db["ID"]]
+
+    return [f"{index:0{len(str(len(db)))}}" for index in range(len(db))]
+
+
+def get_fan_out_name(name, levels=0):
+    """
+    Prefixes the specified entry name with the specified number of levels
+    of subdirectories, each named by two hexadecimal digits of a hash of
+    the name.
+
+    Spreading entries over 256 subdirectories per level keeps directories
+    small enough for file systems to handle efficiently even with millions
+    of entries, and the subdirectory of any entry can be recomputed from its
+    name alone.
+
+    :param name: The name of the entry.
+    :param levels: The number of levels of subdirectories to use.
+    :return: The entry name as a relative path.
+    """
+    if not levels:
+        return name
+
+    digest = hashlib.md5(name.encode("utf-8")).hexdigest()
+
+    return os.path.join(*(digest[2 * level:2 * level + 2]
+                          for level in range(levels)), name)
+
+
+def get_database_entries(db, use_ids=False):
     """
     Provides a generator to iterate over the specified collated DICOM database
     and returns each entry as well as an associated name for file operations.
 
+    Entries are named by their position in the database unless their
+    identifiers are to be used instead, which keeps names stable as entries
+    are added to or removed from the database.
+
     :param db: The DICOM database to use.
+    :param use_ids: Whether or not to name entries by their identifiers.
     :return: A tuple containing a single database entry and a unique name
     for file operations.
     """
-    for index in range(len(db)):
-        yield db.iloc[index, :], f"{index:0{len(str(len(db)))}}"
+    for index, name in enumerate(get_entry_names(db, use_ids)):
+        yield db.iloc[index, :], name
+
+
+def initialize_worker(targets, db=None, use_ids=False, writer_threads=0,
+                      stage_threads=None, prefetch=None,
+                      register_finalizer=True):
+    """
+    Initializes this (pool worker) process to export entries to the
+    specified export targets, optionally from the specified database.
+
+    The targets are kept for the lifetime of the process, such that every
+    entry it exports uses the same exporters, each of which is initialized
+    now (see :function: 'DatabaseEntryExporter.init_worker') and finished
+    when the process exits (see :function: 'finalize_worker').  So is the
+    database, which forked workers share with the main process
+    (copy-on-write), such that entries may be exported by row position
+    alone (see :function: 'export_worker_rows'), and so is a writer, if
+    any, to save them with in the background (see :class: 'ExportWriter'),
+    or a pipeline of stages to export them through (see
+    :function: 'create_export_pipeline'), and a prefetcher, if any, to read
+    their files ahead with (see :class: 'FilePrefetcher').
+
+    :param targets: The collection of export targets to export to.
+    :param db: The DICOM database to export entries from (optional).
+    :param use_ids: Whether or not to name entries by their identifiers.
+    :param writer_threads: The number of threads to save entries with, or
+    zero to save every entry before rendering the next.
+    :param stage_threads: The number of threads of each stage, in order,
+    to export entries through (optional).
+    :param prefetch: The arguments to create a prefetcher with (optional,
+    see :class: 'FilePrefetcher').
+    :param register_finalizer: Whether or not to finish the targets when
+    this process exits, rather than leave it to the pool (e.g. pools of
+    threads, see :function: 'create_executor').
+    """
+    _WORKER_STATE.update(targets=targets, db=db, names=[],
+                         writer=ExportWriter(writer_threads)
+                         if writer_threads else None,
+                         stages=create_export_pipeline(stage_threads)
+                         if stage_threads else None,
+                         prefetcher=FilePrefetcher(*prefetch)
+                         if prefetch else None)
+
+    if db is not None:
+        _WORKER_STATE["names"] = get_entry_names(db, use_ids)
+
+    for target in targets:
+        target.exporter.init_worker(target)
 
+    if register_finalizer:
+        Finalize(None, finalize_worker, exitpriority=10)
 
-def make_directory(dir_path, force=False):
+
+def layout_image(ds, target_width=None, target_height=None,
+                 keep_aspect_ratio=True, no_upscale=False, windows=None):
+    """
+    Computes the dimensions and transformation for coordinate conversion of
+    the image of the specified dataset, as it would be exported with the
+    specified parameters, from the database entry alone.
+
+    The mode of the image is not recorded in the database, so images are
+    assumed to be grayscale unless they are rendered from three windows.
+
+    :param ds: The DICOM database entry to use.
+    :param target_width: The maximum width to resize the image to.
+    :param target_height: The maximum height to resize the image to.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :param windows: The collection of windows to render as image channels
+    (optional).
+    :return: A tuple containing the exported image dimensions and
+    transformation for coordinate conversion.
+    """
+    _, (width, height), transform = compute_image_layout(
+        int(ds.Width), int(ds.Height), target_width, target_height,
+        keep_aspect_ratio, no_upscale
+    )
+    mode = "RGB" if windows and len(windows) == 3 else "L"
+
+    return (width, height, mode), transform
+
+
+def make_parent_directory(file_path):
+    """
+    Creates the directory, and any missing ancestors, of the specified file
+    if it does not already exist.
+
+    :param file_path: The path to the file to use.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+
+def make_directory(dir_path, force=False, exist_ok=False):
     """
     Creates the specified directory if it does not exist, otherwise
     overwrites it if the specified flag is set.
 
-    If the directory exists and the flag is not set then an exception will
+    If the directory exists and neither flag is set then an exception will
     be raised.
 
     :param dir_path: The path to the directory to create.
     :param force: Whether or not to overwrite a directory if it already exists.
-    :raises FileExistsError: If a directory alreadt exists and the force
-    flag is not set.
+    :param exist_ok: Whether or not to keep a directory, and its contents,
+    if it already exists.
+    :raises FileExistsError: If a directory alreadt exists and neither flag
+    is set.
     """
     try:
         os.mkdir(dir_path)
     except FileExistsError:
-        if force:
+        if exist_ok:
+            return
+        elif force:
             shutil.rmtree(dir_path)
             os.mkdir(dir_path)
         else:
             raise
+
+
+def read_staged(item):
+    """
+    Reads the DICOM file of the database entry of the specified item of an
+    export pipeline (see :function: 'create_export_pipeline').
+
+    :param item: A tuple of the options and the database entry and its
+    name.
+    :return: A tuple of the options, the database entry and its name, and
+    the metadata of its DICOM file.
+    """
+    logger = logging.getLogger(__name__)
+    options, entry = item
+
+    logger.info("Exporting database entry: {}.", entry[1])
+
+    return options, entry, load_image(entry[0])
+
+
+def render_image(ds, sizes, ignore_scaling=False, ignore_windowing=False,
+                 keep_aspect_ratio=True, no_upscale=False, pipeline="lut",
+                 intermediate_scale=None, full_decode=False, dtype=np.uint8,
+                 windows=None):
+    """
+    Renders the image of the specified dataset once for export at each of
+    the specified sizes.
+
+    Compressed images are decoded at the lowest resolution their codec
+    supports that still covers the largest resized dimensions, unless a full
+    decode is requested.  If an intermediate scale is given then the (raw)
+    image is also downsampled, by the largest integer factor that keeps it
+    at least that multiple of the largest resized dimensions, before it is
+    scaled, windowed, and normalized.
+
+    :param ds: The DICOM dataset to use.
+    :param sizes: A collection of pairs of the maximum width and height
+    the image will be resized to.
+    :param ignore_scaling: Whether or not to ignore, or not apply,
+    any applicable scaling operations.
+    :param ignore_windowing: Whether or not to ignore, or not apply,
+    any applicable windowing operations.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :param pipeline: The pixel pipeline to render the image with.
+    :param intermediate_scale: The minimum multiple of the resized dimensions
+    to downsample the (raw) image to before windowing (optional).
+    :param full_decode: Whether or not to always decode compressed images at
+    their full resolution.
+    :param dtype: The unsigned integer type to render to.
+    :param windows: The collection of windows to render as image channels
+    (optional, see :function: 'render_from_dataset').
+    :return: A tuple containing basic image attributes as a tuple, an array
+    of normalized image pixel data, and the factor that data was reduced by.
+    """
+    factor = compute_render_factor(ds, sizes, keep_aspect_ratio, no_upscale,
+                                   intermediate_scale, full_decode)
+
+    return render_from_dataset(ds, ignore_scaling=ignore_scaling,
+                               ignore_windowing=ignore_windowing,
+                               pipeline=pipeline, factor=factor,
+                               resample=bool(intermediate_scale), dtype=dtype,
+                               windows=windows)
+
+
+def save_image(rendered, file_path, target_width=None, target_height=None,
+               keep_aspect_ratio=True, no_upscale=False, resample="bicubic",
+               reducing_gap=None, image_format="jpeg", encoder_options=None):
+    """
+    Resizes the specified rendered image and saves it to the specified file
+    in the specified format.
+
+    Images rendered to 16 bits are reduced to 8 bits unless they are
+    grayscale and saved in a 16-bit format.
+
+    :param rendered: The rendered image (see :function: 'render_image').
+    :param file_path: The file, or file object, to save the image data to,
+    or an array of (at least) the target dimensions to copy it into.
+    :param target_width: The maximum width to resize the image to.
+    :param target_height: The maximum height to resize the image to.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :param resample: The name of the resampling filter to resize with.
+    :param reducing_gap: The minimum multiple of the resized dimensions to
+    shrink the image to with a box filter before resampling (optional).
+    :param image_format: The name of the image format to save the image as
+    (see :attr: 'IMAGE_ENCODERS').
+    :param encoder_options: Any options to pass to the image encoder that
+    override its defaults (optional).
+    :return: A tuple containing the exported image dimensions and
+    transformation for coordinate conversion.
+    :raises KeyError: If the image format is not supported.
+    """
+    encoder, _, options = IMAGE_ENCODERS[image_format]
+    attrs, arr, factor = rendered
+    mode = attrs[2]
+
+    if arr.dtype == np.uint16:
+        if mode == "L" and get_image_type(image_format) == np.uint16:
+            attrs = attrs[:2] + ("I;16",)
+        else:
+            arr = (arr >> 8).astype(np.uint8)
+
+    image, transform = format_as(attrs, arr, target_width,
+                                 target_height, keep_aspect_ratio,
+                                 no_upscale, factor, resample, reducing_gap)
+
+    if isinstance(file_path, np.ndarray):
+        file_path[:image.height, :image.width] = np.asarray(image)
+    else:
+        image.save(file_path, encoder,
+                   **dict(options, **(encoder_options or {})))
+
+    return (image.width, image.height, mode), transform
+
+
+def transform_staged(item):
+    """
+    Scales, windows, and normalizes the decoded image of the database entry
+    of the specified item of an export pipeline (see
+    :function: 'create_export_pipeline').
+
+    :param item: A tuple of the options, the database entry and its name,
+    the metadata of its DICOM file, the reduction factor it was decoded at,
+    and its decoded pixel data and scale.
+    :return: A tuple of the options, the database entry and its name, and
+    its rendered image.
+    """
+    options, entry, meta, factor, arr, scale = item
+
+    return options, entry, render_decoded(
+        entry[0], meta, arr, scale, options["ignore_scaling"],
+        options["ignore_windowing"], pipeline=options["pipeline"],
+        factor=factor, resample=bool(options["intermediate_scale"]),
+        dtype=options["dtype"], windows=options["windows"]
+    )
+
+
+def write_targets(entry, targets, rendered=None, keep_aspect_ratio=True,
+                  no_upscale=False, skip_broken=False, resample="bicubic",
+                  reducing_gap=None, windows=None, labels_only=False):
+    """
+    Saves the specified rendered image of the specified database entry, and
+    its annotations, to every one of the specified export targets.
+
+    :param entry: A tuple of the DICOM database entry to export and the
+    name to use.
+    :param targets: The collection of export targets to export to.
+    :param rendered: The rendered image of the entry (see
+    :function: 'render_image'), unless only annotations are exported.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :param skip_broken: Whether or not to ignore I/O errors.
+    :param resample: The name of the resampling filter to resize images
+    with.
+    :param reducing_gap: The minimum multiple of the resized dimensions
+    to shrink images to with a box filter before resampling (optional).
+    :param windows: The collection of windows the image was rendered from
+    (optional).
+    :param labels_only: Whether or not to only export annotations.
+    :return: A list containing, for each target, a tuple of the master list
+    identifier and classification (or an empty tuple if the entry could not
+    be exported and broken entries are skipped).
+    :raises ExportEntryFormatError: If the entry could not be exported and
+    broken entries are not skipped.
+    """
+    logger = logging.getLogger(__name__)
+
+    ds, name = entry
+    results = []
+
+    for target in targets:
+        try:
+            entry_name = get_fan_out_name(name, target.fan_out)
+            image_path = target.exporter.get_image_path(target.base_dir,
+                                                        entry_name,
+                                                        target.image_format)
+
+            if target.fan_out:
+                make_parent_directory(image_path)
+                make_parent_directory(
+                    target.exporter.get_annotation_path(target.base_dir,
+                                                        entry_name)
+                )
+
+            if labels_only:
+                dims, transform = layout_image(ds, target.target_width,
+                                               target.target_height,
+                                               keep_aspect_ratio, no_upscale,
+                                               windows)
+            else:
+                logger.debug("Exporting image for: {} to: {}.", name,
+                             image_path)
+
+                image_path = target.exporter.open_image(target.base_dir,
+                                                        entry_name,
+                                                        target.image_format)
+                dims, transform = save_image(rendered, image_path,
+                                             target.target_width,
+                                             target.target_height,
+                                             keep_aspect_ratio, no_upscale,
+                                             resample, reducing_gap,
+                                             target.image_format,
+                                             target.encoder_options)
+
+            results.append(target.exporter.write_annotation(
+                ds, entry_name, target.base_dir, image_path, dims, transform
+            ))
+        except Exception as ex:
+            if skip_broken:
+                logger.warning("Could not export database entry: {}.", name)
+                logger.warning("  Reason: {}.", ex)
+
+                results.append(())
+            else:
+                raise ExportEntryFormatError(
+                    name, target.exporter.format_name
+                ) from ex
+
+    return results
+
+
+CLASS_NAMES = ["negative", "positive"]
+
+
+IMAGE_ENCODERS = {
+    "jpeg": ("JPEG", ".jpg", {"quality": 75, "subsampling": "4:2:0"}),
+    "png": ("PNG", ".png", {"compress_level": 6}),
+    "png16": ("PNG", ".png", {"compress_level": 6}),
+    # For lossless WebP the quality is the compression effort; beyond zero
+    # it costs considerable time for very little gain.
+    "webp": ("WEBP", ".webp", {"lossless": True, "method": 4, "quality": 0})
+}
+
+
+STAGE_NAMES = ["read", "decode", "transform", "encode"]
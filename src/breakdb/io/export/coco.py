@@ -0,0 +1,227 @@
+"""
+Contains classes and functions pertaining to the creation of COCO (object
+detection) datasets from a collated DICOM database.
+
+A COCO dataset stores every image in a single directory ("images") and the
+annotations of every image in a single JSON document
+("annotations/instances.json").  Bounding boxes are [x, y, width, height], in
+exported pixel coordinates, and the category of every box is the
+classification of its entry.  See:
+    https://cocodataset.org/#format-data
+"""
+import json
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+
+from breakdb.io.export import CLASS_NAMES, DatabaseEntryExporter, \
+    compute_bounding_box, make_directory, get_image_extension
+from breakdb.io.image import transform_coordinate_collection
+
+
+class COCODatabaseEntryExporter(DatabaseEntryExporter):
+    """
+    Represents a mechanism to export a single entry of a collated DICOM
+    database to the COCO format.
+
+    Every entry is summarized by a compact record (its exported image size,
+    classification, and bounding boxes), returned with its master list
+    results as the third element of the tuple, since the annotations of
+    every entry belong to the same document.  Records must be handed back to
+    the exporter (see :function: 'add_record') before the document is
+    written by :function: 'write_index'.  Records are kept per target
+    directory, as the same exporter may export to several targets.
+    """
+
+    format_name = "COCO"
+    supports_updates = False
+
+    def __init__(self):
+        super().__init__()
+
+        self.records = {}
+
+    def add_record(self, base_dir, name, record):
+        """
+        Keeps the record of the entry with the specified name, exported to
+        the specified directory, until the document is written.
+
+        :param base_dir: The directory the entry was exported to.
+        :param name: The name of the entry.
+        :param record: The record of the entry (see
+        :function: 'write_annotation').
+        """
+        self.records.setdefault(base_dir, {})[name] = record
+
+    def begin_run(self, target, db, windows=None):
+        self.records.pop(target.base_dir, None)
+
+    def create_directory_structure(self, base_dir, force=False,
+                                   exist_ok=False):
+        annotation_dir = os.path.join(base_dir, "annotations")
+        image_dir = os.path.join(base_dir, "images")
+
+        make_directory(base_dir, force, exist_ok)
+        make_directory(annotation_dir, force, exist_ok)
+        make_directory(image_dir, force, exist_ok)
+
+        return annotation_dir, image_dir, base_dir
+
+    def get_annotation_path(self, base_dir, name):
+        return os.path.join(base_dir, "annotations", "instances.json")
+
+    def get_image_path(self, base_dir, name, image_format):
+        return os.path.join(base_dir, "images", name) + \
+            get_image_extension(image_format)
+
+    def write_annotation(self, ds, name, base_dir, image_path, dims,
+                         transform):
+        logger = logging.getLogger(__name__)
+
+        logger.debug("Summarizing annotations for: {}.", name)
+
+        annotations = transform_coordinate_collection(ds.Annotation,
+                                                      transform[0],
+                                                      transform[1])
+        record = dims[0], dims[1], int(ds.Classification), \
+            create_bounding_boxes(annotations)
+
+        return image_path, int(ds.Classification), record
+
+    def write_index(self, base_dir, names, image_format):
+        logger = logging.getLogger(__name__)
+
+        records = self.records.pop(base_dir, {})
+        records = [records[name] for name in names]
+
+        annotation_path = self.get_annotation_path(base_dir, None)
+        extension = get_image_extension(image_format)
+
+        images = (
+            {
+                "id": image_id,
+                "file_name": name.replace(os.sep, "/") + extension,
+                "width": width,
+                "height": height
+            }
+            for image_id, (name, (width, height, _, _))
+            in enumerate(zip(names, records), 1)
+        )
+        categories = [
+            {"id": index, "name": name}
+            for index, name in enumerate(CLASS_NAMES)
+        ]
+
+        logger.debug("Writing: {} images to: {}.", len(records),
+                     annotation_path)
+
+        write_document(annotation_path, {
+            "info": {
+                "description": "Exported by breakdb",
+                "date_created": datetime.now().isoformat(timespec="seconds")
+            },
+            "images": images,
+            "annotations": create_annotations(records),
+            "categories": categories
+        })
+
+
+def create_annotations(records, chunk_size=65536):
+    """
+    Creates the COCO annotation of every bounding box of the specified
+    collection of entry records, in order.
+
+    Boxes are converted to COCO's origin and size, and their areas computed,
+    a chunk of boxes at a time, such that only one chunk is ever held in
+    memory as Python objects.
+
+    :param records: The collection of entry records to use (see
+    :function: 'COCODatabaseEntryExporter.write_annotation'), in image
+    order.
+    :param chunk_size: The number of boxes to convert at a time.
+    :return: A generator of COCO annotations.
+    """
+    counts = np.array([len(record[3]) for record in records], dtype=np.int64)
+    image_ids = np.repeat(np.arange(1, len(records) + 1), counts)
+    classes = np.repeat(np.array([record[2] for record in records],
+                                 dtype=np.int64), counts)
+    boxes = np.concatenate([record[3] for record in records] or
+                           [np.zeros((0, 4))])
+
+    for start in range(0, len(boxes), chunk_size):
+        chunk = boxes[start:start + chunk_size]
+        origins = chunk[:, :2]
+        sizes = chunk[:, 2:] - origins
+        areas = sizes[:, 0] * sizes[:, 1]
+
+        for annotation_id, image_id, category_id, (x, y), (w, h), area in zip(
+                range(start + 1, start + len(chunk) + 1),
+                image_ids[start:start + chunk_size].tolist(),
+                classes[start:start + chunk_size].tolist(),
+                origins.tolist(), sizes.tolist(), areas.tolist()):
+            yield {
+                "id": annotation_id,
+                "image_id": image_id,
+                "category_id": category_id,
+                "bbox": [x, y, w, h],
+                "area": area,
+                "iscrowd": 0
+            }
+
+
+def create_bounding_boxes(annotations):
+    """
+    Converts the specified collection of annotations into an array of
+    axis-aligned bounding boxes.
+
+    :param annotations: The collection of annotations, each as a list of
+    single coordinates.
+    :return: An array of bounding boxes, one per row, each of the minimum x,
+    minimum y, maximum x, and maximum y coordinates.
+    """
+    boxes = np.zeros((len(annotations), 4))
+
+    for index, coords in enumerate(annotations):
+        boxes[index] = compute_bounding_box(coords)
+
+    return boxes
+
+
+def write_document(file_path, sections):
+    """
+    Writes a JSON document with the specified sections, streaming each
+    section that is a collection one item at a time, such that the document
+    is never held in memory in full.
+
+    The document is written to a temporary file that only replaces the
+    specified file once complete.
+
+    :param file_path: The file to write the document to.
+    :param sections: A dictionary of section names to either a dictionary,
+    which is written as is, or a collection of items, which is written as
+    an array.
+    """
+    temp_path = file_path + ".tmp"
+
+    with open(temp_path, "w") as f:
+        f.write("{")
+
+        for index, (key, value) in enumerate(sections.items()):
+            f.write(f"{', ' if index else ''}{json.dumps(key)}: ")
+
+            if isinstance(value, dict):
+                f.write(json.dumps(value))
+                continue
+
+            f.write("[")
+
+            for item_index, item in enumerate(value):
+                f.write(f"{', ' if item_index else ''}{json.dumps(item)}")
+
+            f.write("]")
+
+        f.write("}\n")
+
+    os.replace(temp_path, file_path)
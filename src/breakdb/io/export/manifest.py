@@ -0,0 +1,172 @@
+"""
+Contains classes and functions pertaining to export manifests, which record
+what has already been exported from a collated DICOM database so that an
+export may be resumed or updated instead of repeated.
+"""
+import hashlib
+import json
+import logging
+import os
+
+
+class ExportManifest:
+    """
+    Represents a record of every database entry exported to a directory:
+    the identifier of each entry, hashes of its database fields and of the
+    export parameters used, the files it was exported to, and the master
+    list results of each export target.
+
+    Records are appended (and flushed) to a JSON Lines file as soon as each
+    entry is exported, so an interrupted export loses (at most) the entries
+    that were in progress.  Later records replace earlier records of the same
+    entry, and a truncated final record is ignored.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.records = {}
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = open(self.file_path, "a")
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stream.close()
+        self.stream = None
+
+    def compact(self):
+        """
+        Rewrites the manifest file such that it contains exactly one record
+        for each entry.
+        """
+        temp_path = self.file_path + ".tmp"
+
+        with open(temp_path, "w") as f:
+            for record in self.records.values():
+                print(json.dumps(record), file=f)
+
+        os.replace(temp_path, self.file_path)
+
+    def get_results(self, entry_id):
+        """
+        Returns the master list results recorded for the entry with the
+        specified identifier.
+
+        :param entry_id: The identifier of the entry to use.
+        :return: A list containing, for each export target, a tuple of the
+        master list identifier and classification.
+        """
+        return [tuple(result) for result in self.records[entry_id]["Results"]]
+
+    def is_current(self, entry_id, entry_hash, params_hash):
+        """
+        Returns whether or not the entry with the specified identifier has
+        already been exported from the same database fields with the same
+        export parameters and all of its files still exist.
+
+        :param entry_id: The identifier of the entry to check.
+        :param entry_hash: The hash of the database fields of the entry.
+        :param params_hash: The hash of the export parameters.
+        :return: Whether or not the entry is up to date.
+        """
+        record = self.records.get(entry_id)
+
+        return record is not None and \
+            record["Hash"] == entry_hash and \
+            record["Parameters"] == params_hash and \
+            all(os.path.exists(file_path) for file_path in record["Files"])
+
+    def load(self):
+        """
+        Reads every record from the manifest file, if it exists.
+
+        :return: The number of entries recorded.
+        """
+        logger = logging.getLogger(__name__)
+
+        self.records = {}
+
+        if not os.path.exists(self.file_path):
+            return 0
+
+        with open(self.file_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Ignoring malformed manifest record in: "
+                                   "{}.", self.file_path)
+                    continue
+
+                self.records[record["ID"]] = record
+
+        return len(self.records)
+
+    def record(self, entry_id, entry_hash, params_hash, files, results):
+        """
+        Records that the entry with the specified identifier has been
+        exported, appending the record to the manifest file.
+
+        :param entry_id: The identifier of the exported entry.
+        :param entry_hash: The hash of the database fields of the entry.
+        :param params_hash: The hash of the export parameters.
+        :param files: The collection of files the entry was exported to.
+        :param results: The master list results of each export target.
+        """
+        record = {
+            "ID": entry_id,
+            "Hash": entry_hash,
+            "Parameters": params_hash,
+            "Files": list(files),
+            "Results": [list(result) for result in results]
+        }
+
+        self.records[entry_id] = record
+
+        print(json.dumps(record), file=self.stream, flush=True)
+
+    def remove(self, entry_id):
+        """
+        Deletes every file recorded for the entry with the specified
+        identifier, as well as the record itself.
+
+        The removal is only written to the manifest file when it is
+        compacted (see :function: 'compact'); until then, an entry whose
+        files are missing is simply out of date.
+
+        :param entry_id: The identifier of the entry to remove.
+        """
+        for file_path in self.records.pop(entry_id)["Files"]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+
+def hash_entry(ds):
+    """
+    Computes a hash of every field of the specified database entry.
+
+    :param ds: The DICOM database entry to use.
+    :return: A hexadecimal digest.
+    """
+    return hash_value(ds.to_dict())
+
+
+def hash_value(value):
+    """
+    Computes a hash of the canonical JSON representation of the specified
+    value.
+
+    Values that are not natively JSON serializable are represented by their
+    string representations.
+
+    :param value: The value to use.
+    :return: A hexadecimal digest.
+    """
+    text = json.dumps(value, sort_keys=True, default=str)
+
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+MANIFEST_FILE = "manifest.jsonl"
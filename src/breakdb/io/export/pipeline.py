@@ -0,0 +1,194 @@
+"""
+Contains classes and functions pertaining to the staged export of database
+entries, in which every step of exporting an entry is performed by its own
+group of threads and entries are handed from one step to the next through
+bounded queues.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class ExportPipeline:
+    """
+    Represents a pipeline of stages, each of which applies its function, with
+    its own number of threads, to every item handed on by the stage before
+    it.
+
+    Stages are connected by bounded queues, so a slow stage holds back those
+    before it instead of letting items pile up in memory, and stages bound
+    by I/O (e.g. reading files from network storage) may be given many more
+    threads than those bound by the CPU.  The time every stage spends
+    working and waiting to hand items on is recorded (see
+    :function: 'get_statistics').
+
+    A pipeline may be kept for many collections of items (e.g. every task
+    of a worker process), in which case the statistics of each may be taken
+    in turn (see :function: 'pop_statistics').
+    """
+
+    def __init__(self, stages, queue_size=2):
+        """
+        :param stages: The collection of stages, in order, each as a tuple
+        of its name, the function it applies to every item, and its number
+        of threads.
+        :param queue_size: The number of items that may wait for each thread
+        of a stage.
+        :raises ValueError: If a stage has fewer than one thread.
+        """
+        self.lock = threading.Lock()
+        self.pop_lock = threading.Lock()
+        self.popped = {}
+        self.queues = []
+        self.stages = []
+        self.statistics = {}
+
+        for name, fn, threads in stages:
+            if threads < 1:
+                raise ValueError(f"Cannot create stage: {name} with: "
+                                 f"{threads} threads.")
+
+            self.queues.append(queue.Queue(queue_size * threads))
+            self.statistics[name] = [0, 0.0, 0.0]
+
+        self.start_time = time.perf_counter()
+        self.stop_time = None
+
+        for index, (name, fn, threads) in enumerate(stages):
+            workers = [
+                threading.Thread(target=self.run_stage,
+                                 args=(index, name, fn), daemon=True)
+                for _ in range(threads)
+            ]
+
+            for worker in workers:
+                worker.start()
+
+            self.stages.append(workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def get_statistics(self):
+        """
+        Returns the number of items, and the seconds spent working, waiting
+        to hand items on, and available (threads times elapsed time), of
+        every stage of this pipeline.
+
+        The time a stage was neither working nor waiting to hand items on
+        was spent waiting for items; a stage that is always working is the
+        bottleneck of the pipeline.
+
+        :return: A dictionary of the statistics of every stage, by name, in
+        stage order.
+        """
+        elapsed = (self.stop_time or time.perf_counter()) - self.start_time
+
+        with self.lock:
+            return {
+                name: counts + [len(workers) * elapsed]
+                for (name, counts), workers
+                in zip(self.statistics.items(), self.stages)
+            }
+
+    def pop_statistics(self):
+        """
+        Returns the statistics of every stage of this pipeline recorded
+        since they were last returned by this function, or since the
+        pipeline was created (see :function: 'get_statistics').
+
+        :return: A dictionary of the statistics of every stage, by name, in
+        stage order.
+        """
+        with self.pop_lock:
+            statistics = self.get_statistics()
+            popped, self.popped = self.popped, statistics
+
+        return {
+            name: [count - popped_count for count, popped_count
+                   in zip(counts, popped.get(name, [0] * len(counts)))]
+            for name, counts in statistics.items()
+        }
+
+    def run_stage(self, index, name, fn):
+        """
+        Applies the specified function to every item of the stage at the
+        specified position of this pipeline until it is shut down.
+
+        Items the function fails on are not handed on; their future is
+        given the exception instead.
+
+        :param index: The position of the stage.
+        :param name: The name of the stage.
+        :param fn: The function to apply to every item.
+        """
+        source = self.queues[index]
+        sink = self.queues[index + 1] if index + 1 < len(self.queues) \
+            else None
+        counts = self.statistics[name]
+
+        while True:
+            job = source.get()
+
+            if job is None:
+                break
+
+            future, item = job
+            start = time.perf_counter()
+
+            try:
+                item = fn(item)
+            except Exception as ex:
+                future.set_exception(ex)
+
+            end = time.perf_counter()
+
+            with self.lock:
+                counts[0] += 1
+                counts[1] += end - start
+
+            if future.done():
+                continue
+
+            if sink is None:
+                future.set_result(item)
+            else:
+                sink.put((future, item))
+
+                with self.lock:
+                    counts[2] += time.perf_counter() - end
+
+    def shutdown(self):
+        """
+        Waits for every item submitted to this pipeline to pass through it
+        and stops every stage.
+        """
+        if self.stop_time is not None:
+            return
+
+        for source, workers in zip(self.queues, self.stages):
+            for _ in workers:
+                source.put(None)
+
+            for worker in workers:
+                worker.join()
+
+        self.stop_time = time.perf_counter()
+
+    def submit(self, item):
+        """
+        Hands the specified item to the first stage of this pipeline,
+        waiting for room if it already has as many items as it may hold.
+
+        :param item: The item to process.
+        :return: A future of the result of the last stage.
+        """
+        future = Future()
+
+        self.queues[0].put((future, item))
+
+        return future
@@ -0,0 +1,200 @@
+"""
+Contains classes and functions pertaining to the creation of tensor packs
+from a collated DICOM database.
+
+A tensor pack stores every exported image, resized to the same dimensions,
+in a single NumPy array file ("images.npy", of shape N x H x W, or
+N x H x W x C for multi-channel images), alongside the classification of
+every entry ("classes.npy", -1 for entries that could not be exported) and
+the bounding boxes of every entry as a ragged array: "boxes.npy" holds every
+box (x_min, y_min, x_max, y_max), in exported pixel coordinates, and the
+boxes of entry i are rows box_offsets[i] to box_offsets[i + 1] of it.  Each
+may be loaded with `np.load(file, mmap_mode="r")` without any decoding.
+"""
+import logging
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from breakdb.io.export import DatabaseEntryExporter, \
+    compute_bounding_box, make_directory, get_image_type
+from breakdb.io.image import transform_coordinate_collection
+
+
+class TensorPackEntryExporter(DatabaseEntryExporter):
+    """
+    Represents a mechanism to export a single entry of a collated DICOM
+    database to its slot of a tensor pack.
+
+    Packs are allocated before any entry is exported (see
+    :function: 'allocate'), after which every entry is written directly to
+    the memory-mapped pack by the worker process that exported it, each of
+    which maps the pack once.  Entries are named by their position in the
+    database, which is their slot.
+    """
+
+    format_name = "Tensor Pack"
+    supports_updates = False
+
+    def __init__(self):
+        super().__init__()
+
+        self.arrays = {}
+
+    def __getstate__(self):
+        # Memory maps are not shared through pickling: every process maps
+        # each pack itself (once, see get_array).
+        return dict(self.__dict__, arrays={})
+
+    def allocate(self, base_dir, db, target_width, target_height,
+                 image_format="jpeg", windows=None):
+        """
+        Creates the (zeroed) memory-mapped arrays of a tensor pack large
+        enough for every entry of the specified database.
+
+        :param base_dir: The directory to create the pack in.
+        :param db: The DICOM database to export.
+        :param target_width: The width of every exported image.
+        :param target_height: The height of every exported image.
+        :param image_format: The name of the image format whose type every
+        image is rendered to (see :function: 'get_image_type').
+        :param windows: The collection of windows rendered as image
+        channels (optional).
+        :raises ValueError: If either target dimension is missing.
+        """
+        if not target_width or not target_height:
+            raise ValueError("Cannot allocate tensor pack - a target width "
+                             "and height are required.")
+
+        shape = (len(db), target_height, target_width)
+        max_boxes = max((len(annotations)
+                         for annotations in db["Annotation"]), default=0)
+
+        if windows and len(windows) > 1:
+            shape += (len(windows),)
+
+        self.release_arrays(base_dir)
+
+        open_memmap(os.path.join(base_dir, IMAGES_FILE), "w+",
+                    get_image_type(image_format), shape)
+        open_memmap(os.path.join(base_dir, LABELS_PART_FILE), "w+",
+                    get_labels_type(max_boxes), (len(db),))
+
+    def begin_run(self, target, db, windows=None):
+        self.allocate(target.base_dir, db, target.target_width,
+                      target.target_height, target.image_format, windows)
+
+    def create_directory_structure(self, base_dir, force=False,
+                                   exist_ok=False):
+        make_directory(base_dir, force, exist_ok)
+
+        return base_dir, base_dir, base_dir
+
+    def end_run(self, target):
+        self.release_arrays(target.base_dir)
+
+    def finish_worker(self, target):
+        for file_name in [IMAGES_FILE, LABELS_PART_FILE]:
+            array = self.arrays.get(os.path.join(target.base_dir, file_name))
+
+            if array is not None:
+                array.flush()
+
+        self.release_arrays(target.base_dir)
+
+    def get_array(self, file_path):
+        """
+        Returns the memory-mapped array of the specified pack file, mapping
+        it only once per process.
+
+        :param file_path: The pack file to use.
+        :return: A writable memory-mapped array.
+        """
+        if file_path not in self.arrays:
+            self.arrays[file_path] = np.load(file_path, mmap_mode="r+")
+
+        return self.arrays[file_path]
+
+    def get_annotation_path(self, base_dir, name):
+        return os.path.join(base_dir, LABELS_PART_FILE)
+
+    def get_image_path(self, base_dir, name, image_format):
+        return os.path.join(base_dir, IMAGES_FILE)
+
+    def init_worker(self, target):
+        for file_name in [IMAGES_FILE, LABELS_PART_FILE]:
+            self.get_array(os.path.join(target.base_dir, file_name))
+
+    def open_image(self, base_dir, name, image_format):
+        images = self.get_array(self.get_image_path(base_dir, name,
+                                                    image_format))
+
+        return images[int(name)]
+
+    def release_arrays(self, base_dir):
+        """
+        Forgets the memory-mapped arrays of the pack in the specified
+        directory, if mapped by this process, such that they are unmapped.
+
+        :param base_dir: The directory of the pack to use.
+        """
+        for file_name in [IMAGES_FILE, LABELS_PART_FILE]:
+            self.arrays.pop(os.path.join(base_dir, file_name), None)
+
+    def write_annotation(self, ds, name, base_dir, image_path, dims,
+                         transform):
+        logger = logging.getLogger(__name__)
+
+        logger.debug("Packing annotations for: {}.", name)
+
+        labels = self.get_array(self.get_annotation_path(base_dir, name))
+        annotations = transform_coordinate_collection(ds.Annotation,
+                                                      transform[0],
+                                                      transform[1])
+
+        index = int(name)
+        labels["Classification"][index] = int(ds.Classification)
+        labels["Count"][index] = len(annotations)
+
+        for box, coords in enumerate(annotations):
+            labels["Boxes"][index, box] = compute_bounding_box(coords)
+
+        return name, int(ds.Classification)
+
+    def write_index(self, base_dir, names, image_format):
+        labels_path = os.path.join(base_dir, LABELS_PART_FILE)
+        labels = np.load(labels_path, mmap_mode="r")
+        exported = np.array([int(name) for name in names], dtype=np.int64)
+
+        classes = np.full(len(labels), -1, dtype=np.int8)
+        counts = np.zeros(len(labels), dtype=np.int64)
+
+        classes[exported] = labels["Classification"][exported]
+        counts[exported] = labels["Count"][exported]
+
+        mask = np.arange(labels["Boxes"].shape[1]) < counts[:, np.newaxis]
+
+        np.save(os.path.join(base_dir, "classes.npy"), classes)
+        np.save(os.path.join(base_dir, "boxes.npy"), labels["Boxes"][mask])
+        np.save(os.path.join(base_dir, "box_offsets.npy"),
+                np.concatenate([[0], np.cumsum(counts)]))
+
+        del labels
+        os.remove(labels_path)
+
+
+def get_labels_type(max_boxes):
+    """
+    Returns the structured type of the labels of a single entry, as written
+    by export processes, with room for the specified number of boxes.
+
+    :param max_boxes: The maximum number of boxes of any entry.
+    :return: A structured NumPy type.
+    """
+    return np.dtype([("Classification", np.int8), ("Count", np.int32),
+                     ("Boxes", np.float32, (max(max_boxes, 1), 4))])
+
+
+IMAGES_FILE = "images.npy"
+LABELS_PART_FILE = "labels.part.npy"
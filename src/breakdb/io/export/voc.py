@@ -7,7 +7,7 @@ import os
 from xml.etree.ElementTree import Element, ElementTree
 
 from breakdb.io.export import DatabaseEntryExporter, make_directory, \
-    ExportEntryFormatError, export_image
+    get_image_extension
 from breakdb.io.image import transform_coordinate_collection
 
 
@@ -17,59 +17,55 @@ class VOCDatabaseEntryExporter(DatabaseEntryExporter):
     database to the Pascal VOC format.
     """
 
-    def create_directory_structure(self, base_dir, force=False):
+    format_name = "Pascal VOC"
+
+    def create_directory_structure(self, base_dir, force=False,
+                                   exist_ok=False):
         annotation_dir = os.path.join(base_dir, "Annotations")
         image_dir = os.path.join(base_dir, "JPEGImages")
         master_dir = os.path.join(base_dir, "ImageSets")
 
-        make_directory(annotation_dir, force)
-        make_directory(image_dir, force)
-        make_directory(master_dir, force)
-        make_directory(os.path.join(master_dir, "Main"), force)
+        make_directory(base_dir, force, exist_ok)
+        make_directory(annotation_dir, force, exist_ok)
+        make_directory(image_dir, force, exist_ok)
+        make_directory(master_dir, force, exist_ok)
+        make_directory(os.path.join(master_dir, "Main"), force, exist_ok)
 
-        return base_dir, annotation_dir, image_dir, master_dir
+        return annotation_dir, image_dir, master_dir
 
-    def export(self, entry, base_dir, target_width=None, target_height=None,
-               ignore_scaling=False, ignore_windowing=True,
-               keep_aspect_ratio=True, no_upscale=False, skip_broken=False):
-        logger = logging.getLogger(__name__)
+    def get_annotation_path(self, base_dir, name):
+        return os.path.join(base_dir, "Annotations", name) + ".xml"
 
-        ds, name = entry
+    def get_image_path(self, base_dir, name, image_format):
+        return os.path.join(base_dir, "JPEGImages", name) + \
+            get_image_extension(image_format)
 
-        try:
-            annotation_path = os.path.join(base_dir, "Annotations", name) + \
-                ".xml"
-            image_path = os.path.join(ds.FilePath, "JPEGImages", name) + \
-                ".jpg"
+    def write_annotation(self, ds, name, base_dir, image_path, dims,
+                         transform):
+        logger = logging.getLogger(__name__)
 
-            logger.info("Exporting database entry: {}.", name)
-            logger.debug("Exporting image for: {} to: {}.", name, image_path)
+        annotation_path = self.get_annotation_path(base_dir, name)
 
-            dims, transform = export_image(ds, image_path, target_width,
-                                           target_height, ignore_scaling,
-                                           ignore_windowing, keep_aspect_ratio,
-                                           no_upscale)
+        logger.debug("Exporting annotations for: {} to: {}.", name,
+                     annotation_path)
 
-            logger.debug("Exporting annotations for: {} to: {}.", name,
-                         annotation_path)
+        annotations = transform_coordinate_collection(ds.Annotation,
+                                                      transform[0],
+                                                      transform[1])
+        xml = create_annotation(annotation_path, dims[0], dims[1], dims[2],
+                                annotations)
 
-            ds.Annotation = transform_coordinate_collection(ds.Annotation,
-                                                            transform[0],
-                                                            transform[1])
-            xml = create_annotation(annotation_path, dims[0], dims[1],
-                                    dims[2], ds.Annotation)
+        ElementTree(xml).write(annotation_path)
 
-            ElementTree(xml).write(annotation_path)
+        return annotation_path, int(ds.Classification)
 
-            return annotation_path, int(ds.Classification)
-        except Exception as ex:
-            if skip_broken:
-                logger.warning("Could not export database entry: {}.", name)
-                logger.warning("  Reason: {}.", ex)
+    def write_index(self, base_dir, names, image_format):
+        index_path = os.path.join(base_dir, "ImageSets", "Main",
+                                  "trainval.txt")
 
-                return ()
-            else:
-                raise ExportEntryFormatError(name, "Pascal VOC") from ex
+        with open(index_path, "w") as f:
+            for name in names:
+                print(name.replace(os.sep, "/"), file=f)
 
 
 def create_annotation(file_path, width, height, depth, annotations):
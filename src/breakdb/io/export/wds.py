@@ -0,0 +1,280 @@
+"""
+Contains classes and functions pertaining to the creation of WebDataset
+datasets from a collated DICOM database.
+
+WebDataset datasets are collections of tar shards, each of which contains
+many samples stored as consecutive files that share the same key (here, the
+entry name) but differ in extension: the image, its classification
+(".cls"), and its metadata and annotations (".json").  Data loaders read
+each shard sequentially, rather than opening a file per image.  See:
+    https://github.com/webdataset/webdataset
+"""
+import io
+import json
+import logging
+import os
+import queue
+import tarfile
+import time
+from glob import glob
+from multiprocessing import Process, Queue
+
+import pandas as pd
+
+from breakdb.io.export import DatabaseEntryExporter, make_directory, \
+    get_image_extension
+from breakdb.io.image import transform_coordinate_collection
+
+
+class WebDatasetEntryExporter(DatabaseEntryExporter):
+    """
+    Represents a mechanism to export a single entry of a collated DICOM
+    database to a WebDataset sample.
+
+    Samples are encoded in memory and returned with the master list results
+    of each entry, as the third element of the tuple, so that they may be
+    written to tar shards by a :class: 'ShardWriterGroup'.
+    """
+
+    format_name = "WebDataset"
+    supports_updates = False
+
+    def create_directory_structure(self, base_dir, force=False,
+                                   exist_ok=False):
+        make_directory(base_dir, force, exist_ok)
+
+        return base_dir, base_dir, base_dir
+
+    def get_annotation_path(self, base_dir, name):
+        return os.path.join(base_dir, name) + ".json"
+
+    def get_image_path(self, base_dir, name, image_format):
+        return os.path.join(base_dir, name) + \
+            get_image_extension(image_format)
+
+    def open_image(self, base_dir, name, image_format):
+        image_file = io.BytesIO()
+        image_file.name = self.get_image_path(base_dir, name, image_format)
+
+        return image_file
+
+    def write_annotation(self, ds, name, base_dir, image_path, dims,
+                         transform):
+        logger = logging.getLogger(__name__)
+
+        logger.debug("Packing sample for: {}.", name)
+
+        annotations = transform_coordinate_collection(ds.Annotation,
+                                                      transform[0],
+                                                      transform[1])
+        metadata = {
+            "ID": ds.get("ID"),
+            "Width": dims[0],
+            "Height": dims[1],
+            "Mode": dims[2],
+            "Classification": int(ds.Classification),
+            "Annotation": [[float(value) for value in coords]
+                           for coords in annotations]
+        }
+
+        _, extension = os.path.splitext(image_path.name)
+        members = {
+            extension[1:]: image_path.getvalue(),
+            "cls": str(int(ds.Classification)).encode("utf-8"),
+            "json": json.dumps(metadata).encode("utf-8")
+        }
+
+        return name, int(ds.Classification), members
+
+    def write_index(self, base_dir, names, image_format):
+        order = {name: index for index, name in enumerate(names)}
+        part_paths = sorted(glob(os.path.join(base_dir,
+                                              f"*{INDEX_PART_SUFFIX}")))
+
+        index = pd.concat([
+            pd.read_csv(part_path, dtype={"Key": str})
+            for part_path in part_paths
+        ] or [pd.DataFrame(columns=INDEX_COLUMNS)])
+
+        index = index[index["Key"].isin(order)]
+        index = index.sort_values("Key", key=lambda keys: keys.map(order))
+
+        index.to_csv(os.path.join(base_dir, "index.csv"), index=False)
+
+        for part_path in part_paths:
+            os.remove(part_path)
+
+
+class ShardWriter:
+    """
+    Represents a sequence of tar shards in a directory that samples are
+    appended to, each of which is closed, and the next one started, once
+    it reaches a maximum size.
+
+    The shard and (header) offset of every sample written is recorded, such
+    that any sample may be read without scanning its shard.
+    """
+
+    def __init__(self, base_dir, prefix="shard", max_size=256 * 2 ** 20):
+        self.base_dir = base_dir
+        self.prefix = prefix
+        self.max_size = max_size
+        self.index = []
+        self.shards = 0
+        self.shard_name = None
+        self.tar = None
+        self.mtime = int(time.time())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the current shard, if any.
+        """
+        if self.tar is not None:
+            self.tar.close()
+            self.tar = None
+
+    def write(self, key, members):
+        """
+        Appends a sample with the specified key and members to the current
+        shard, starting a new shard if necessary.
+
+        :param key: The unique key of the sample.
+        :param members: A dictionary of file extensions to file contents.
+        """
+        if self.tar is None:
+            self.shard_name = f"{self.prefix}-{self.shards:06d}.tar"
+            self.shards += 1
+            self.tar = tarfile.open(os.path.join(self.base_dir,
+                                                 self.shard_name), "w")
+
+        offset = self.tar.offset
+
+        for extension, data in members.items():
+            info = tarfile.TarInfo(f"{key}.{extension}")
+            info.size = len(data)
+            info.mtime = self.mtime
+
+            self.tar.addfile(info, io.BytesIO(data))
+
+        self.index.append((key, self.shard_name, offset,
+                           self.tar.offset - offset))
+
+        if self.tar.offset >= self.max_size:
+            self.close()
+
+
+class ShardWriterGroup:
+    """
+    Represents a group of dedicated processes that write samples to tar
+    shards in the same directory, such that encoding and archiving happen
+    concurrently and no process ever blocks on both.
+
+    Samples are distributed over the processes in turn through bounded
+    queues, so that a slow file system throttles exporting rather than
+    exhausting memory.  Each process writes its own sequence of shards and
+    a partial index (see :function: 'write_shards'), which are merged by
+    :function: 'WebDatasetEntryExporter.write_index'.
+    """
+
+    def __init__(self, base_dir, processes=1, max_size=256 * 2 ** 20,
+                 queue_size=16):
+        self.base_dir = base_dir
+        self.processes = processes
+        self.max_size = max_size
+        self.queue_size = queue_size
+        self.writers = []
+        self.count = 0
+
+    def __enter__(self):
+        for index in range(self.processes):
+            samples = Queue(self.queue_size)
+            process = Process(target=write_shards,
+                              args=(samples, self.base_dir,
+                                    f"shard-{index:02d}", self.max_size),
+                              daemon=True)
+
+            process.start()
+            self.writers.append((samples, process))
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for samples, process in self.writers:
+            if process.is_alive():
+                put_sample(samples, process, None)
+
+        for _, process in self.writers:
+            process.join()
+
+        failed = [process.exitcode for _, process in self.writers
+                  if process.exitcode != 0]
+
+        self.writers = []
+
+        if failed and exc_type is None:
+            raise IOError(f"Could not write shards to: {self.base_dir} - "
+                          f"writer process(es) exited with: {failed}.")
+
+    def write(self, key, members):
+        """
+        Queues a sample with the specified key and members to be written by
+        the next writer process.
+
+        :param key: The unique key of the sample.
+        :param members: A dictionary of file extensions to file contents.
+        """
+        samples, process = self.writers[self.count % len(self.writers)]
+        self.count += 1
+
+        put_sample(samples, process, (key, members))
+
+
+def put_sample(samples, process, sample, timeout=1.0):
+    """
+    Puts the specified sample on the queue of the specified writer process,
+    waiting for space as long as the process is alive.
+
+    :param samples: The queue of samples to use.
+    :param process: The writer process consuming the queue.
+    :param sample: The sample to put.
+    :param timeout: The number of seconds to wait between checks.
+    :raises IOError: If the writer process has exited.
+    """
+    while True:
+        try:
+            samples.put(sample, timeout=timeout)
+            return
+        except queue.Full:
+            if not process.is_alive():
+                raise IOError(f"Shard writer process exited with: "
+                              f"{process.exitcode}.")
+
+
+def write_shards(samples, base_dir, prefix, max_size):
+    """
+    Writes every sample from the specified queue to a sequence of tar
+    shards until a sentinel (None) is received, and then writes the index
+    of every sample written to a partial index file.
+
+    :param samples: The queue of samples, as key and members pairs, to use.
+    :param base_dir: The directory to write shards to.
+    :param prefix: The prefix of each shard file name.
+    :param max_size: The size, in bytes, at which each shard is closed.
+    """
+    with ShardWriter(base_dir, prefix, max_size) as writer:
+        for key, members in iter(samples.get, None):
+            writer.write(key, members)
+
+    pd.DataFrame(writer.index, columns=INDEX_COLUMNS).to_csv(
+        os.path.join(base_dir, prefix + INDEX_PART_SUFFIX), index=False
+    )
+
+
+INDEX_COLUMNS = ["Key", "Shard", "Offset", "Size"]
+INDEX_PART_SUFFIX = ".index.part"
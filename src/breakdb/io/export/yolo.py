@@ -10,10 +10,8 @@ by the following YOLOv3 implementation:
 import logging
 import os
 
-import numpy as np
-
-from breakdb.io.export import DatabaseEntryExporter, make_directory, \
-    export_image, ExportEntryFormatError
+from breakdb.io.export import CLASS_NAMES, DatabaseEntryExporter, \
+    compute_bounding_box, make_directory, get_image_extension
 from breakdb.io.image import transform_coordinate_collection
 
 
@@ -23,65 +21,83 @@ class YOLODatabaseEntryExporter(DatabaseEntryExporter):
     database to the format used by a PyTorch YOLOv3 algorithm.
     """
 
+    format_name = "YOLOv3"
+
     def __init__(self):
         super().__init__()
 
-    def create_directory_structure(self, base_dir, force=False):
+        self.runs = set()
+
+    def begin_run(self, target, db, windows=None):
+        write_auxiliary_files(target.base_dir, CLASS_NAMES)
+
+        self.runs.add(target.base_dir)
+
+    def create_directory_structure(self, base_dir, force=False,
+                                   exist_ok=False):
         annotation_dir = os.path.join(base_dir, "labels")
         image_dir = os.path.join(base_dir, "images")
 
-        make_directory(base_dir, force)
-        make_directory(annotation_dir, force)
-        make_directory(image_dir, force)
+        make_directory(base_dir, force, exist_ok)
+        make_directory(annotation_dir, force, exist_ok)
+        make_directory(image_dir, force, exist_ok)
 
         return annotation_dir, image_dir, base_dir
 
-    def export(self, entry, base_dir, target_width=None, target_height=None,
-               ignore_scaling=False, ignore_windowing=True,
-               keep_aspect_ratio=True, no_upscale=False, skip_broken=False):
-        logger = logging.getLogger(__name__)
+    def end_run(self, target):
+        self.runs.discard(target.base_dir)
 
-        ds, name = entry
+    def export(self, entry, base_dir, *args, **kwargs):
+        # Outside of a run, exporting a single entry is a run of its own
+        # (see begin_run).
+        if base_dir not in self.runs:
+            write_auxiliary_files(base_dir, CLASS_NAMES)
 
-        try:
-            annotation_path = os.path.join(base_dir, "labels", name) + ".txt"
-            image_path = os.path.join(base_dir, "images", name) + ".jpg"
+        return super().export(entry, base_dir, *args, **kwargs)
 
-            logger.info("Exporting database entry: {}.", name)
-            logger.debug("Exporting image for: {} to: {}.", name, image_path)
+    def get_annotation_path(self, base_dir, name):
+        return os.path.join(base_dir, "labels", name) + ".txt"
 
-            dims, transform = export_image(ds, image_path, target_width,
-                                           target_height, ignore_scaling,
-                                           ignore_windowing, keep_aspect_ratio,
-                                           no_upscale)
+    def get_image_path(self, base_dir, name, image_format):
+        return os.path.join(base_dir, "images", name) + \
+            get_image_extension(image_format)
 
-            if ds.Annotation:
-                logger.debug("Exporting annotations for: {} to: {}.", name,
-                             annotation_path)
+    def write_annotation(self, ds, name, base_dir, image_path, dims,
+                         transform):
+        logger = logging.getLogger(__name__)
+
+        annotation_path = self.get_annotation_path(base_dir, name)
+
+        if ds.Annotation:
+            logger.debug("Exporting annotations for: {} to: {}.", name,
+                         annotation_path)
 
-                ds.Annotation = transform_coordinate_collection(ds.Annotation,
-                                                                transform[0],
-                                                                transform[1])
-                txts = create_annotations(int(ds.Classification), ds.Annotation,
-                                          dims[0], dims[1])
+            annotations = transform_coordinate_collection(ds.Annotation,
+                                                          transform[0],
+                                                          transform[1])
+            txts = create_annotations(int(ds.Classification), annotations,
+                                      dims[0], dims[1])
 
-                with open(annotation_path, "w") as f:
-                    for txt in txts:
-                        print(txt, file=f)
-            else:
-                logger.debug("No annotations to export for: {}.", name)
+            with open(annotation_path, "w") as f:
+                for txt in txts:
+                    print(txt, file=f)
+        else:
+            logger.debug("No annotations to export for: {}.", name)
 
-            write_auxiliary_files(base_dir, ["negative", "positive"])
+            # The annotations of a previous export must not outlive their
+            # removal from the database (e.g. when exporting labels only).
+            try:
+                os.remove(annotation_path)
+            except FileNotFoundError:
+                pass
 
-            return annotation_path, int(ds.Classification)
-        except Exception as ex:
-            if skip_broken:
-                logger.warning("Could not export database entry: {}.", name)
-                logger.warning("  Reason: {}.", ex)
+        return annotation_path, int(ds.Classification)
 
-                return ()
-            else:
-                raise ExportEntryFormatError(name, "YOLOv3") from ex
+    def write_index(self, base_dir, names, image_format):
+        with open(os.path.join(base_dir, "images.txt"), "w") as f:
+            for name in names:
+                print(self.get_image_path(base_dir, name, image_format),
+                      file=f)
 
 
 def create_annotation(classification, coords, width, height):
@@ -132,14 +148,7 @@ def create_bounding_box(coords, width, height):
     :param height: The height of an image.
     :return: A YOLOv3 bounding box.
     """
-    x = np.array([value for value in coords[0::2]], dtype=np.float)
-    y = np.array([value for value in coords[1::2]], dtype=np.float)
-
-    x_max = np.max(x)
-    x_min = np.min(x)
-
-    y_max = np.max(y)
-    y_min = np.min(y)
+    x_min, y_min, x_max, y_max = compute_bounding_box(coords)
 
     return [
         (x_max + x_min) / (2.0 * width),
@@ -2,13 +2,29 @@
 Represents a collection of functions to assist with loading image data from
 a collated DICOM database.
 """
+import io
+import os
 import sys
+import threading
+import time
+import zlib
 from enum import Enum
+from functools import lru_cache
 
 import numpy as np
 from PIL import Image
 from pydicom import Dataset, dcmread
-from pydicom.pixel_data_handlers.util import apply_modality_lut, apply_voi_lut
+from pydicom.encaps import defragment_data
+from pydicom.multival import MultiValue
+from pydicom.pixel_data_handlers import gdcm_handler, jpeg_ls_handler, \
+    numpy_handler, pillow_handler, pylibjpeg_handler, rle_handler
+from pydicom.pixel_data_handlers.util import apply_modality_lut, \
+    apply_voi_lut, get_j2k_parameters, pixel_dtype
+from pydicom.uid import DeflatedExplicitVRLittleEndian, \
+    ExplicitVRBigEndian, ExplicitVRLittleEndian, ImplicitVRLittleEndian, \
+    JPEG2000, JPEG2000Lossless, JPEGBaseline8Bit, JPEGExtended12Bit, \
+    JPEGLosslessP14, JPEGLosslessSV1, JPEGLSLossless, JPEGLSNearLossless, \
+    RLELossless, UID
 
 from breakdb.tag import has_tag, WindowingTag, make_tag_list, PixelTag, \
     ScalingTag
@@ -32,6 +48,31 @@ IMAGE_TAGS = make_tag_list(
 )
 
 
+_DECODE_STATISTICS = {}
+"""
+Represents the number of images, pixels, and seconds spent decoding (raw)
+pixel data in this process for each transfer syntax and decoder, since they
+were last collected.
+"""
+
+
+_DECODE_LOCK = threading.Lock()
+"""
+Represents the lock that guards the decoding statistics of this process,
+as images may be decoded by several threads at once.
+"""
+
+
+_SCRATCH = threading.local()
+"""
+Represents per-thread floating-point storage that is reused between images
+to avoid repeated allocation of full-size temporaries.
+"""
+
+
+VOI_FUNCTIONS = ["LINEAR", "LINEAR_EXACT", "SIGMOID"]
+
+
 class ImageMode(Enum):
     """
     Represents the different types of images supported by this project.
@@ -163,12 +204,383 @@ def compute_resize_dimensions(width, height, target_width, target_height,
     return np.int(resize_width), np.int(resize_height)
 
 
+def compute_image_layout(width, height, target_width, target_height,
+                         keep_aspect_ratio=True, no_upscale=False):
+    """
+    Computes the geometry of an image with the specified width and height
+    once it has been formatted for the specified dimensions (see
+    :function: 'format_as'), without any need for its pixel data.
+
+    The image is resized and, if that changes its dimensions, placed at the
+    center of a canvas of the target dimensions.
+
+    :param width: The current image width.
+    :param height: The current image height.
+    :param target_width: The maximum width to resize the image to.
+    :param target_height: The maximum height to resize the image to.
+    :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
+    stays the same during (any) resize operations.
+    :param no_upscale: Whether or not to forbid upscaling.
+    :return: A tuple containing the resized dimensions, the dimensions of
+    the formatted image, and the computed transform.
+    """
+    resize_width, resize_height = compute_resize_dimensions(
+        width, height, target_width, target_height, keep_aspect_ratio,
+        no_upscale
+    )
+    transform = compute_resize_transform(width, height, target_width,
+                                         target_height, resize_width,
+                                         resize_height)
+
+    if transform != ((0.0, 0.0), (1.0, 1.0)):
+        image_size = (target_width or resize_width,
+                      target_height or resize_height)
+    else:
+        image_size = (resize_width, resize_height)
+
+    return (resize_width, resize_height), image_size, transform
+
+
+@lru_cache(maxsize=64)
+def build_lookup_table(kind, itemsize, params):
+    """
+    Computes the windowed value of every possible pixel of an integer data
+    type with the specified kind and size for the specified scaling and
+    windowing parameters.
+
+    Tables are cached, so images that share a data type and parameters
+    (which is typical of a single modality or device) only compute theirs
+    once per process.  Entries are ordered by the unsigned bit pattern of
+    each pixel, so signed data may index the table through an unsigned view.
+
+    :param kind: The NumPy kind of the data type ("i" or "u").
+    :param itemsize: The size of the data type in bytes (at most two).
+    :param params: The scaling and windowing parameters to use.
+    :return: A read-only table of windowed pixel values.
+    """
+    domain = np.arange(2 ** (8 * itemsize), dtype=f"u{itemsize}")
+    table = compute_window(domain.view(f"{kind}{itemsize}"), params)
+
+    table.setflags(write=False)
+
+    return table
+
+
+def compute_reduction_factor(width, height, resize_width, resize_height,
+                             scale):
+    """
+    Computes the largest integer factor an image with the specified width
+    and height may be downsampled by such that it remains at least the
+    specified multiple of the specified resize dimensions.
+
+    :param width: The current image width.
+    :param height: The current image height.
+    :param resize_width: The width the image will be resized to.
+    :param resize_height: The height the image will be resized to.
+    :param scale: The minimum multiple of the resize dimensions to keep.
+    :return: An integer downsampling factor (one if no downsampling should
+    occur).
+    """
+    ratio = min(width / resize_width, height / resize_height)
+
+    return max(int(np.floor(ratio / scale)), 1)
+
+
+def compute_window(arr, params):
+    """
+    Applies the scaling and windowing operations described by the specified
+    parameters to the specified collection of pixels using double precision.
+
+    This is a reference implementation that is equivalent to applying
+    pydicom's modality and VOI LUT functions in succession; it is intended
+    for small arrays and scalars only.
+
+    :param arr: The collection of pixels (or single pixel) to transform.
+    :param params: The scaling and windowing parameters to use.
+    :return: A collection of transformed pixel values.
+    """
+    slope, intercept, voi_func, center, width, y_min, y_max = params
+
+    arr = np.asarray(arr, np.float64) * slope + intercept
+
+    if voi_func in ["LINEAR", "LINEAR_EXACT"]:
+        if voi_func == "LINEAR":
+            center -= 0.5
+            width -= 1
+
+        s = (y_max - y_min) / width
+        b = (-center / width + 0.5) * (y_max - y_min) + y_min
+
+        return np.clip(arr * s + b, min(y_min, y_max), max(y_min, y_max))
+    elif voi_func == "SIGMOID":
+        with np.errstate(over="ignore"):
+            return (y_max - y_min) / \
+                   (1.0 + np.exp((arr - center) * (-4.0 / width))) + y_min
+
+    return arr
+
+
+def decode_image(ds, meta, factor=1):
+    """
+    Decodes the (raw) image data of the specified DICOM database entry from
+    its DICOM dataset (see :function: 'load_image').
+
+    If the database entry records where its (raw) pixel data is located on
+    disk, either in its DICOM file or in a pixel pack, then the pixel data is
+    read (or memory-mapped) directly; pydicom is only used to decode
+    compressed pixel data.
+
+    Compressed pixel data may optionally be decoded at a reduced resolution
+    (see :function: 'decode_reduced'), which is much faster than decoding it
+    in full when the image is to be resized to a fraction of its size.
+
+    :param ds: The DICOM database entry to use.
+    :param meta: The DICOM dataset read from the file of the entry.
+    :param factor: The maximum integer factor to reduce compressed image
+    data by while decoding.
+    :return: A pair containing an array of (raw) image pixel data and the
+    factor that data was reduced by.
+    """
+    if is_packed(ds):
+        return read_packed(ds), 1
+
+    if is_mappable(ds):
+        return map_pixels(ds), 1
+
+    start = time.perf_counter()
+    result = decode_reduced(meta, factor)
+    handler = "reduced"
+
+    if not result:
+        arr, handler = decode_pixels(meta)
+        result = arr, 1
+
+    record_decode(meta.file_meta.TransferSyntaxUID, handler,
+                  meta.Rows * meta.Columns, time.perf_counter() - start)
+
+    return result
+
+
+def decode_jpeg(meta, data, factor):
+    """
+    Decodes the specified JPEG compressed (raw) pixel data at a reduced
+    resolution using DCT-domain scaling.
+
+    The JPEG decoder may scale an image by one half, one quarter, or one
+    eighth while decoding, which is considerably faster than decoding it in
+    full.  Only 8-bit grayscale images are supported.
+
+    :param meta: The DICOM dataset the pixel data belongs to.
+    :param data: The compressed pixel data of a single frame.
+    :param factor: The maximum factor to reduce the image by.
+    :return: A pair containing an array of (raw) image pixel data and the
+    factor it was reduced by, or None if the pixel data is not supported.
+    """
+    if meta.BitsAllocated != 8:
+        return None
+
+    image = Image.open(io.BytesIO(data))
+
+    if image.mode != "L":
+        return None
+
+    scale = 1 << (min(factor, 8).bit_length() - 1)
+
+    image.draft("L", (max(image.width // scale, 1),
+                      max(image.height // scale, 1)))
+
+    arr = np.asarray(image).view(pixel_dtype(meta))
+
+    return arr, image.decoderconfig[0]
+
+
+def decode_jpeg2000(meta, data, factor):
+    """
+    Decodes the specified JPEG 2000 compressed (raw) pixel data at a reduced
+    resolution level.
+
+    Each resolution level discarded halves the size of the decoded image
+    and no more levels than the encoder produced may be discarded (see
+    :function: 'get_j2k_levels').  The same corrections that pydicom
+    applies to the decoded values are applied here.
+
+    :param meta: The DICOM dataset the pixel data belongs to.
+    :param data: The compressed pixel data of a single frame.
+    :param factor: The maximum factor to reduce the image by.
+    :return: A pair containing an array of (raw) image pixel data and the
+    factor it was reduced by, or None if the pixel data is not supported.
+    """
+    levels = min(factor.bit_length() - 1, get_j2k_levels(data))
+
+    if levels < 1:
+        return None
+
+    image = Image.open(io.BytesIO(data))
+
+    if image.mode not in ["L", "I;16"]:
+        return None
+
+    # Pillow rounds reduced dimensions to the nearest integer, whereas
+    # OpenJPEG rounds them up, and decoding fails whenever the two differ.
+    while levels > 1 and any((n + (1 << levels - 1)) >> levels !=
+                             -(-n >> levels) for n in image.size):
+        levels -= 1
+
+    image.reduce = levels
+    image.load()
+
+    arr = np.frombuffer(image.tobytes(), pixel_dtype(meta))
+    arr = arr.reshape(image.height, image.width).copy()
+
+    params = get_j2k_parameters(data)
+    precision = params.get("precision", meta.BitsStored)
+    shift = meta.BitsAllocated - precision
+
+    # Pillow converts signed data to unsigned data, which must be undone.
+    if params.get("is_signed") and meta.PixelRepresentation == 1:
+        arr -= 2 ** (meta.BitsAllocated - 1)
+
+    if shift:
+        arr = np.right_shift(arr, shift)
+
+    return arr, 1 << levels
+
+
+def decode_pixels(meta):
+    """
+    Decodes the (raw) pixel data in the specified DICOM dataset in full
+    using the preferred pixel data handlers for its transfer syntax (see
+    :function: 'select_handlers').
+
+    Should a handler fail, the next is tried, and should every handler
+    fail, pydicom chooses one itself.
+
+    :param meta: The DICOM dataset to decode.
+    :return: A pair containing an array of (raw) image pixel data and the
+    name of the handler that decoded it.
+    """
+    for handler in select_handlers(meta.file_meta.TransferSyntaxUID):
+        try:
+            meta.convert_pixel_data(handler)
+        except Exception:
+            continue
+
+        return meta.pixel_array, handler
+
+    return meta.pixel_array, "pydicom"
+
+
+def decode_reduced(meta, factor):
+    """
+    Decodes the compressed (raw) pixel data in the specified DICOM dataset at
+    the lowest resolution its codec supports that is reduced by no more than
+    the specified factor.
+
+    As with :function: 'downsample', partial blocks along the right and
+    bottom edges are always included.
+
+    :param meta: The DICOM dataset to decode.
+    :param factor: The maximum integer factor to reduce the image by.
+    :return: A pair containing an array of (raw) image pixel data and the
+    factor it was reduced by, or None if the pixel data cannot be decoded
+    at a reduced resolution.
+    """
+    decoder = REDUCED_DECODERS.get(meta.file_meta.TransferSyntaxUID)
+
+    if factor <= 1 or not decoder or meta.get("SamplesPerPixel", 1) != 1:
+        return None
+
+    result = decoder(meta, defragment_data(meta.PixelData), factor)
+
+    if not result:
+        return None
+
+    arr, scale = result
+
+    if arr.shape != (-(-meta.Rows // scale), -(-meta.Columns // scale)):
+        return None
+
+    return arr, scale
+
+
+def downsample(arr, factor):
+    """
+    Downsamples the specified collection of (raw) pixels by the specified
+    integer factor by averaging each square block of pixels (an area, or box,
+    filter).
+
+    Blocks along the right and bottom edges may be partial; these are
+    averaged over the pixels they contain.  Integer data is rounded back to
+    its original data type, so that it may be rendered by any pixel pipeline.
+
+    :param arr: The collection of (raw) pixels to downsample.
+    :param factor: The integer factor to downsample by.
+    :return: A collection of downsampled pixels.
+    """
+    if factor <= 1:
+        return arr
+
+    rows = np.arange(0, arr.shape[0], factor)
+    cols = np.arange(0, arr.shape[1], factor)
+    accumulator = np.float64
+
+    if arr.dtype.kind in "iu":
+        # A 32-bit accumulator cannot overflow for 16-bit data unless a block
+        # holds more than 2^15 pixels, and is much cheaper to add into.
+        small = arr.dtype.itemsize <= 2 and factor * factor <= 2 ** 15
+        accumulator = np.int32 if small else np.int64
+
+    # Summing strided slices is considerably faster than np.add.reduceat,
+    # which reduces each block in a separate inner loop.
+    partial = np.zeros((len(rows),) + arr.shape[1:], dtype=accumulator)
+
+    for offset in range(factor):
+        block = arr[offset::factor]
+        partial[:len(block)] += block
+
+    sums = np.zeros((len(rows), len(cols)) + arr.shape[2:], dtype=accumulator)
+
+    for offset in range(factor):
+        block = partial[:, offset::factor]
+        sums[:, :block.shape[1]] += block
+
+    counts = np.outer(np.minimum(arr.shape[0] - rows, factor),
+                      np.minimum(arr.shape[1] - cols, factor))
+
+    if arr.ndim > 2:
+        counts = counts[..., np.newaxis]
+
+    means = sums / counts
+
+    if arr.dtype.kind in "iu":
+        np.rint(means, out=means)
+
+    return means.astype(arr.dtype.newbyteorder("="))
+
+
 def format_as(attrs, arr, target_width, target_height,
-              keep_aspect_ratio=True, no_upscale=False):
+              keep_aspect_ratio=True, no_upscale=False, factor=1,
+              resample="bicubic", reducing_gap=None):
     """
     Formats the specified image data array as a Pillow image and resizes it
     to the specified dimensions as necessary.
 
+    Arrays that are not already 8-bit are normalized before formatting,
+    unless the image mode is 16-bit grayscale ("I;16").
+
+    The array of image data may have been downsampled by an integer factor
+    (see :function: 'downsample'), in which case the image is resized from
+    the exact region of the downsampled array that corresponds to the
+    original image.  The computed transform always refers to the original
+    image dimensions.
+
+    If a reducing gap is given then large downscales are performed in two
+    steps: the image is first shrunk by the largest integer factor that
+    keeps it at least that multiple of its resized dimensions using a box
+    filter, and only then resampled with the chosen filter.  This is much
+    faster than resampling the full image and, for gaps of two or more, all
+    but indistinguishable from it.
+
     :param attrs: The current image attributes.
     :param arr: The array of image data.
     :param target_width: The maximum width to resize the image to.
@@ -176,29 +588,36 @@ def format_as(attrs, arr, target_width, target_height,
     :param keep_aspect_ratio: Whether or not to ensure the aspect ratio
     stays the same during (any) resize operations.
     :param no_upscale: Whether or not to forbid upscaling.
+    :param factor: The factor the array of image data was downsampled by.
+    :param resample: The name of the resampling filter to resize with (see
+    :attr: 'RESAMPLING_FILTERS').
+    :param reducing_gap: The minimum multiple of the resized dimensions to
+    shrink the image to before resampling (optional).
     :return: A formatted image and computed transform as a pair.
+    :raises KeyError: If the resampling filter is not supported.
     """
     width, height, mode = attrs
 
-    arr = normalize(arr)
-    resize_width, resize_height = compute_resize_dimensions(
-        attrs[0], attrs[1], target_width, target_height, keep_aspect_ratio,
-        no_upscale
-    )
-    transform = compute_resize_transform(attrs[0], attrs[1], target_width,
-                                         target_height, resize_width,
-                                         resize_height)
+    if arr.dtype != np.uint8 and mode != "I;16":
+        arr = normalize(arr, coerce_to_uint8=True)
 
-    if arr.dtype != np.uint8:
-        arr = arr.astype(np.uint8)
+    (resize_width, resize_height), image_size, transform = \
+        compute_image_layout(width, height, target_width, target_height,
+                             keep_aspect_ratio, no_upscale)
 
-    image = Image.fromarray(arr, mode=mode)
+    if mode == "I;16":
+        image = Image.fromarray(arr.astype(np.uint16, copy=False))
+    else:
+        image = Image.fromarray(arr, mode=mode)
 
-    if width != resize_width or height != resize_height:
-        image = image.resize((resize_width, resize_height), Image.BICUBIC)
+    if width != resize_width or height != resize_height or factor != 1:
+        image = image.resize((resize_width, resize_height),
+                             RESAMPLING_FILTERS[resample],
+                             box=(0, 0, width / factor, height / factor),
+                             reducing_gap=reducing_gap)
 
-    if transform != ((0.0, 0.0), (1.0, 1.0)):
-        scaled = Image.new(mode, (target_width, target_height), 0)
+    if image.size != image_size:
+        scaled = Image.new(mode, image_size, 0)
         scaled.paste(image, transform[0])
 
         image = scaled
@@ -206,6 +625,34 @@ def format_as(attrs, arr, target_width, target_height,
     return image, transform
 
 
+def get_j2k_levels(data):
+    """
+    Returns the number of wavelet decomposition levels in the specified JPEG
+    2000 codestream, which is the number of times its resolution may be
+    halved while decoding.
+
+    :param data: The JPEG 2000 codestream to inspect.
+    :return: The number of decomposition levels, or zero if they could not
+    be found.
+    """
+    offset = 2
+
+    # Only the main header is searched; the COD segment must precede the
+    # first tile-part (SOT) marker.
+    while offset + 4 <= len(data) and data[offset] == 0xFF:
+        marker = data[offset + 1]
+        length = int.from_bytes(data[offset + 2:offset + 4], "big")
+
+        if marker == 0x52:
+            return data[offset + 9] if offset + 9 < len(data) else 0
+        elif marker == 0x90:
+            break
+
+        offset += length + 2
+
+    return 0
+
+
 def get_mode(ds):
     """
     Returns the PIL compatible image mode associated with the photometric
@@ -223,6 +670,260 @@ def get_mode(ds):
         raise UnknownImageFormat(interp) from ke
 
 
+def get_read_range(ds):
+    """
+    Returns the range of the file that the (raw) pixel data associated with
+    the specified DICOM database entry is read from, such that it may be
+    read ahead (see :class: 'FilePrefetcher').
+
+    Pixel data in a pixel pack is read from its range of the pack alone;
+    otherwise the DICOM file is read in full.
+
+    :param ds: The DICOM database entry to use.
+    :return: A tuple of a file path, an offset, and a length (or None for
+    the rest of the file).
+    """
+    if is_packed(ds):
+        return ds["Pack File"], int(ds["Pack Offset"]), int(ds["Pack Length"])
+
+    return ds["File Path"], 0, None
+
+
+def get_read_ranges(db, rows):
+    """
+    Returns the range of the file that the (raw) pixel data of every one of
+    the specified rows of the specified collated DICOM database is read
+    from, as :function: 'get_read_range' would, from its columns alone,
+    such that no entry is ever indexed.
+
+    :param db: The DICOM database to use.
+    :param rows: The collection of row positions to use.
+    :return: A list of tuples of a file path, an offset, and a length (or
+    None for the rest of the file), in row order.
+    """
+    rows = list(rows)
+    file_paths = db["File Path"].to_numpy()[rows]
+
+    if "Pack Offset" not in db:
+        return [(file_path, 0, None) for file_path in file_paths]
+
+    packs = {}
+    ranges = []
+
+    for file_path, pack_path, offset, length in zip(
+            file_paths, db["Pack File"].to_numpy()[rows],
+            db["Pack Offset"].to_numpy()[rows],
+            db["Pack Length"].to_numpy()[rows]):
+        if offset >= 0 and pack_path not in packs:
+            packs[pack_path] = os.path.exists(pack_path)
+
+        if offset >= 0 and packs[pack_path]:
+            ranges.append((pack_path, int(offset), int(length)))
+        else:
+            ranges.append((file_path, 0, None))
+
+    return ranges
+
+
+def get_render_table(arr, params, dtype=np.uint8, extrema=None):
+    """
+    Computes the normalized and quantized value of every possible pixel of
+    the data type of the specified collection of integer pixels for the
+    specified scaling and windowing parameters.
+
+    Normalization bounds are taken from the extrema of the collection, which
+    may be given if they are already known.
+
+    :param arr: The collection of (raw) integer pixels to render.
+    :param params: The scaling and windowing parameters to use.
+    :param dtype: The unsigned integer type to quantize to.
+    :param extrema: The minimum and maximum (raw) pixel values (optional).
+    :return: A table of normalized pixel values, indexed by the unsigned bit
+    pattern of each pixel.
+    """
+    peak = float(np.iinfo(dtype).max)
+
+    if extrema is None:
+        extrema = [arr.min(), arr.max()]
+
+    bounds = compute_window(extrema, params)
+    low, high = bounds.min(), bounds.max()
+
+    if high == low:
+        return np.zeros(2 ** (8 * arr.dtype.itemsize), dtype)
+
+    table = build_lookup_table(arr.dtype.kind, arr.dtype.itemsize, params)
+    table = np.clip((table - low) * (peak / (high - low)), 0.0, peak)
+
+    return table.astype(dtype)
+
+
+def get_scratch(shape):
+    """
+    Returns an uninitialized, single precision array of the specified shape
+    whose storage is reused by all subsequent calls from the same thread.
+
+    :param shape: The shape of the array to provide.
+    :return: A single precision scratch array.
+    """
+    size = int(np.prod(shape))
+    buffer = getattr(_SCRATCH, "buffer", None)
+
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(size, np.float32)
+        _SCRATCH.buffer = buffer
+
+    return buffer[:size].reshape(shape)
+
+
+def get_window_parameters(ds, meta, ignore_scaling=False,
+                          ignore_windowing=False, slope=None, intercept=None,
+                          center=None, width=None, voi_func=None):
+    """
+    Collects the parameters necessary to apply any and all scaling and
+    windowing operations to the image data associated with the specified
+    DICOM database entry and dataset (header).
+
+    The parameters are resolved in exactly the same manner as
+    :function: 'read_from_dataset' and are returned as a tuple of: the
+    rescale slope and intercept, the VOI LUT function (None if windowing is
+    not applied), the window center and width, and the minimum and maximum
+    output values of the window.  A window given by both a center and width
+    is applied even if the entry itself is not windowed.
+
+    :param ds: The DICOM database entry to use.
+    :param meta: The DICOM dataset (header) to use.
+    :param ignore_scaling: Whether or not to ignore, or not apply,
+    any applicable scaling operations.
+    :param ignore_windowing: Whether or not to ignore, or not apply,
+    any applicable windowing operations.
+    :param slope: The rescale slope to use (optional).
+    :param intercept: The rescale intercept to use (optional).
+    :param center: The scaling center to use (optional).
+    :param width: The scaling window width to use (optional).
+    :param voi_func: The VOI LUT function to use.  This may be one of:
+    "Linear", "Linear_Exact", or "Sigmoid".
+    :return: A tuple of scaling and windowing parameters.
+    :raises ValueError: If the window width is invalid for the VOI LUT
+    function.
+    """
+    scaled = ds.Scaling and not ignore_scaling
+    windowed = ds.Windowing or (center is not None and width is not None)
+    params = [1.0, 0.0, None, 0.0, 0.0, 0.0, 0.0]
+
+    if scaled:
+        params[0] = float(meta.RescaleSlope if not slope else slope)
+        params[1] = float(meta.RescaleIntercept if not intercept else
+                          intercept)
+
+    if windowed and not ignore_windowing:
+        if voi_func:
+            params[2] = voi_func.upper()
+        elif has_tag(meta, WindowingTag.FUNCTION):
+            params[2] = str(meta.VOILUTFunction).upper()
+        else:
+            params[2] = "LINEAR"
+
+        params[3] = float(get_first(meta.WindowCenter if center is None else
+                                    center))
+        params[4] = float(get_first(meta.WindowWidth if width is None else
+                                    width))
+
+        if meta.PixelRepresentation == 0:
+            params[5] = 0.0
+            params[6] = 2.0 ** meta.BitsStored - 1
+        else:
+            params[5] = -2.0 ** (meta.BitsStored - 1)
+            params[6] = 2.0 ** (meta.BitsStored - 1) - 1
+
+        if scaled:
+            params[5] = params[5] * params[0] + params[1]
+            params[6] = params[6] * params[0] + params[1]
+
+        if params[2] not in VOI_FUNCTIONS:
+            params[2] = None
+        elif params[2] == "LINEAR" and params[4] < 1:
+            raise ValueError("The window width must be greater than or "
+                             "equal to one for a linear VOI LUT function.")
+        elif params[4] <= 0:
+            raise ValueError("The window width must be greater than zero.")
+
+    return tuple(params)
+
+
+def get_first(value):
+    """
+    Returns the first of the specified collection of values if it contains
+    multiple values, otherwise the value itself.
+
+    :param value: The (possibly multi-valued) value to use.
+    :return: A single value.
+    """
+    if isinstance(value, (list, tuple, MultiValue)):
+        return value[0]
+
+    return value
+
+
+def is_mappable(ds):
+    """
+    Returns whether or not the (raw) pixel data associated with the
+    specified DICOM database entry may be read directly from disk.
+
+    :param ds: The DICOM dataset to use.
+    :return: Whether or not pixel data may be memory-mapped.
+    """
+    return ds.get("Pixel Offset", -1) >= 0
+
+
+def is_packed(ds):
+    """
+    Returns whether or not the (raw) pixel data associated with the
+    specified DICOM database entry may be read from a pixel pack (see
+    :module: 'breakdb.io.pack') that exists.
+
+    :param ds: The DICOM dataset to use.
+    :return: Whether or not pixel data may be read from a pixel pack.
+    """
+    return ds.get("Pack Offset", -1) >= 0 and os.path.exists(ds["Pack File"])
+
+
+def load_image(ds):
+    """
+    Reads the DICOM dataset (header), and any (raw) pixel data that must be
+    decoded, from the DICOM file associated with the specified DICOM
+    database entry.
+
+    If the database entry records where its (raw) pixel data is located on
+    disk then only the DICOM header is read (see :function: 'decode_image').
+
+    :param ds: The DICOM database entry to use.
+    :return: A DICOM dataset.
+    """
+    return dcmread(ds["File Path"],
+                   stop_before_pixels=is_packed(ds) or is_mappable(ds),
+                   specific_tags=IMAGE_TAGS)
+
+
+def map_pixels(ds):
+    """
+    Memory-maps the (raw) pixel data associated with the specified DICOM
+    database entry directly from disk.
+
+    No data is read or copied until it is used and pydicom is bypassed
+    entirely.  The returned array is read-only and matches that which
+    pydicom would have decoded from the same file.
+
+    :param ds: The DICOM dataset to use.
+    :return: An array of (raw) image pixel data.
+    """
+    arr = np.memmap(ds["File Path"], dtype=np.dtype(ds["Pixel Type"]),
+                    mode="r", offset=int(ds["Pixel Offset"]),
+                    shape=parse_pixel_shape(ds["Pixel Shape"]))
+
+    return arr.view(np.ndarray)
+
+
 def normalize(arr, coerce_to_uint8=False):
     """
     Applies a linear normalization to the specified collection of pixels,
@@ -245,6 +946,37 @@ def normalize(arr, coerce_to_uint8=False):
     return arr if not coerce_to_uint8 else arr.astype(np.uint8)
 
 
+def parse_pixel_shape(value):
+    """
+    Parses the shape of (raw) pixel data as recorded in a database, of the
+    form "ROWSxCOLUMNS", or "ROWSxCOLUMNSxSAMPLES" for color images, such
+    that it survives every database format, including CSV.
+
+    :param value: The shape to parse, or a collection of its dimensions.
+    :return: A tuple of the dimensions of the pixel data.
+    """
+    if isinstance(value, str):
+        return tuple(int(size) for size in value.split("x"))
+
+    return tuple(int(size) for size in value)
+
+
+def pop_decode_statistics():
+    """
+    Returns and clears the decoding statistics recorded by this process
+    (see :function: 'record_decode').
+
+    :return: A dictionary of the number of images, pixels, and seconds
+    spent decoding, keyed by transfer syntax and decoder.
+    """
+    with _DECODE_LOCK:
+        statistics = dict(_DECODE_STATISTICS)
+
+        _DECODE_STATISTICS.clear()
+
+    return statistics
+
+
 def read_from_dataset(ds, coerce_to_original_data_type=False,
                       ignore_scaling=False, ignore_windowing=False,
                        slope=None, intercept=None, center=None,
@@ -286,46 +1018,466 @@ def read_from_dataset(ds, coerce_to_original_data_type=False,
     :return: A pair containing basic image attributes as a tuple and an
     array of image pixel data.
     """
-    file_path = ds["File Path"]
     img = Dataset()
+    meta, arr, _ = read_image(ds)
+    attrs = (meta.Columns, meta.Rows, get_mode(meta))
+    dtype = arr.dtype
 
-    with dcmread(file_path, specific_tags=IMAGE_TAGS) as meta:
-        attrs = (meta.Columns, meta.Rows, get_mode(meta))
-        arr = meta.pixel_array
-        dtype = arr.dtype
+    if ds.Scaling and not ignore_scaling:
+        img.RescaleIntercept = meta.RescaleIntercept if not intercept else \
+            intercept
+        img.RescaleSlope = meta.RescaleSlope if not slope else slope
 
-        if ds.Scaling and not ignore_scaling:
-            img.RescaleIntercept = meta.RescaleIntercept if not intercept else \
-                intercept
-            img.RescaleSlope = meta.RescaleSlope if not slope else slope
+        arr = apply_modality_lut(arr, img)
 
-            arr = apply_modality_lut(arr, img)
+    windowed = ds.Windowing or (center is not None and width is not None)
 
-        if ds.Windowing and not ignore_windowing:
-            img.BitsAllocated = meta.BitsAllocated
-            img.BitsStored = meta.BitsStored
-            img.Columns = meta.Columns
-            img.PhotometricInterpretation = meta.PhotometricInterpretation
-            img.PixelRepresentation = meta.PixelRepresentation
-            img.Rows = meta.Rows
-            img.SamplesPerPixel = meta.SamplesPerPixel
+    if windowed and not ignore_windowing:
+        img.BitsAllocated = meta.BitsAllocated
+        img.BitsStored = meta.BitsStored
+        img.Columns = meta.Columns
+        img.PhotometricInterpretation = meta.PhotometricInterpretation
+        img.PixelRepresentation = meta.PixelRepresentation
+        img.Rows = meta.Rows
+        img.SamplesPerPixel = meta.SamplesPerPixel
 
-            if voi_func:
-                img.VOILUTFunction = voi_func.upper()
-            elif has_tag(meta, WindowingTag.FUNCTION):
-                img.VOILUTFunction = meta.VOILUTFunction
-            else:
-                img.VOILUTFunction = "LINEAR"
+        if voi_func:
+            img.VOILUTFunction = voi_func.upper()
+        elif has_tag(meta, WindowingTag.FUNCTION):
+            img.VOILUTFunction = meta.VOILUTFunction
+        else:
+            img.VOILUTFunction = "LINEAR"
 
-            img.WindowCenter = meta.WindowCenter if not center else center
-            img.WindowWidth = meta.WindowWidth if not width else width
+        img.WindowCenter = meta.WindowCenter if center is None else center
+        img.WindowWidth = meta.WindowWidth if width is None else width
 
-            arr = apply_voi_lut(arr, img)
+        arr = apply_voi_lut(arr, img)
 
-        if coerce_to_original_data_type and arr.dtype != dtype:
-            arr = arr.astype(dtype)
+    if coerce_to_original_data_type and arr.dtype != dtype:
+        arr = arr.astype(dtype)
 
-        return attrs, arr
+    return attrs, arr
+
+
+def read_image(ds, factor=1):
+    """
+    Reads the DICOM dataset (header) and (raw) image data from the DICOM file
+    associated with the specified DICOM database entry.
+
+    This is equivalent to :function: 'load_image' followed by
+    :function: 'decode_image'.
+
+    :param ds: The DICOM database entry to use.
+    :param factor: The maximum integer factor to reduce compressed image
+    data by while decoding.
+    :return: A tuple containing a DICOM dataset, an array of (raw) image
+    pixel data, and the factor that data was reduced by.
+    """
+    meta = load_image(ds)
+
+    return (meta,) + decode_image(ds, meta, factor)
+
+
+def read_packed(ds):
+    """
+    Reads the (raw) pixel data associated with the specified DICOM database
+    entry from its pixel pack.
+
+    Uncompressed pixel data is memory-mapped, exactly as with
+    :function: 'map_pixels'; compressed pixel data is read and
+    decompressed.
+
+    :param ds: The DICOM dataset to use.
+    :return: An array of (raw) image pixel data.
+    """
+    dtype = np.dtype(ds["Pack Type"])
+    shape = tuple(ds["Pack Shape"])
+
+    if ds["Pack Compression"] == "none":
+        arr = np.memmap(ds["Pack File"], dtype=dtype, mode="r",
+                        offset=int(ds["Pack Offset"]), shape=shape)
+
+        return arr.view(np.ndarray)
+
+    with open(ds["Pack File"], "rb") as f:
+        f.seek(int(ds["Pack Offset"]))
+
+        data = zlib.decompress(f.read(int(ds["Pack Length"])))
+
+    return np.frombuffer(data, dtype).reshape(shape)
+
+
+def record_decode(syntax, handler, pixels, seconds):
+    """
+    Records that an image with the specified number of pixels and transfer
+    syntax was decoded by the specified decoder in the specified time.
+
+    Memory-mapped and packed pixel data is never recorded, as it is not
+    decoded.
+
+    :param syntax: The transfer syntax of the decoded image.
+    :param handler: The name of the decoder used.
+    :param pixels: The number of pixels in the (original) image.
+    :param seconds: The time spent decoding.
+    """
+    with _DECODE_LOCK:
+        counts = _DECODE_STATISTICS.setdefault((str(syntax), handler),
+                                               [0, 0, 0.0])
+
+        counts[0] += 1
+        counts[1] += pixels
+        counts[2] += seconds
+
+
+def render_channels(arr, params_list, pipeline="lut", dtype=np.uint8):
+    """
+    Renders the specified collection of pixels once for each of the
+    specified sets of scaling and windowing parameters and interleaves the
+    results as the channels of a single multi-channel image.
+
+    Every channel is rendered into its (strided) slice of one interleaved
+    output array in turn.  With the lookup table pipeline, the extrema of
+    the pixels are only computed once, and every channel is gathered from
+    its own table as a single window would be (see
+    :function: 'render_lookup').
+
+    :param arr: The two-dimensional collection of (raw) pixels to render.
+    :param params_list: The collection of scaling and windowing parameters
+    to use, one per channel.
+    :param pipeline: The pixel pipeline to use.
+    :param dtype: The unsigned integer type to quantize to.
+    :return: A collection of normalized pixel values with the channels as
+    the last dimension.
+    :raises KeyError: If the pixel pipeline is unknown.
+    """
+    if pipeline not in PIXEL_PIPELINES:
+        raise KeyError(f"Cannot render pixels - unknown pipeline: "
+                       f"{pipeline}.")
+
+    out = np.empty(arr.shape + (len(params_list),), dtype)
+
+    if pipeline == "lut" and supports_lookup(arr):
+        extrema = [arr.min(), arr.max()]
+        index = arr.view(arr.dtype.str.replace("i", "u"))
+
+        for channel, params in enumerate(params_list):
+            table = get_render_table(arr, params, dtype, extrema)
+            out[..., channel] = table[index]
+    else:
+        for channel, params in enumerate(params_list):
+            render_pixels(arr, params, out[..., channel], pipeline)
+
+    return out
+
+
+def render_decoded(ds, meta, arr, scale=1, ignore_scaling=False,
+                   ignore_windowing=False, slope=None, intercept=None,
+                   center=None, width=None, voi_func=None, pipeline="lut",
+                   factor=1, resample=True, dtype=np.uint8, windows=None):
+    """
+    Renders the specified (raw) image data of the specified DICOM database
+    entry, as decoded by :function: 'decode_image', exactly as
+    :function: 'render_from_dataset' would.
+
+    :param ds: The DICOM database entry to use.
+    :param meta: The DICOM dataset read from the file of the entry.
+    :param arr: The array of (raw) image pixel data.
+    :param scale: The factor the (raw) image data was reduced by while
+    decoding.
+    :param ignore_scaling: Whether or not to ignore, or not apply,
+    any applicable scaling operations.
+    :param ignore_windowing: Whether or not to ignore, or not apply,
+    any applicable windowing operations.
+    :param slope: The rescale slope to use (optional).
+    :param intercept: The rescale intercept to use (optional).
+    :param center: The scaling center to use (optional).
+    :param width: The scaling window width to use (optional).
+    :param voi_func: The VOI LUT function to use.  This may be one of:
+    "Linear", "Linear_Exact", or "Sigmoid".
+    :param pipeline: The pixel pipeline to render with.
+    :param factor: The maximum integer factor to reduce the (raw) image data
+    by.
+    :param resample: Whether or not to downsample the (raw) image data by
+    whatever remains of the factor after decoding.
+    :param dtype: The unsigned integer type to render to.
+    :param windows: The collection of one or three windows to render as
+    channels (optional).
+    :return: A tuple containing basic image attributes as a tuple, an array
+    of normalized image pixel data, and the factor that data was reduced by.
+    :raises ValueError: If windows are given for an image that is not
+    grayscale, or there are neither one nor three of them.
+    """
+
+    if resample and factor // scale > 1:
+        arr = downsample(arr, factor // scale)
+        scale *= factor // scale
+
+    attrs = (meta.Columns, meta.Rows, get_mode(meta))
+
+    if not windows:
+        params = get_window_parameters(ds, meta, ignore_scaling,
+                                       ignore_windowing, slope, intercept,
+                                       center, width, voi_func)
+
+        return attrs, render_pixels(arr, params, pipeline=pipeline,
+                                    dtype=dtype), scale
+
+    if len(windows) not in [1, 3]:
+        raise ValueError(f"Cannot render: {len(windows)} windows - only one "
+                         f"or three are supported.")
+
+    if attrs[2] != "L":
+        raise ValueError(f"Cannot render windows for a: {attrs[2]} image.")
+
+    params_list = [
+        get_window_parameters(ds, meta, ignore_scaling, window is None,
+                              slope, intercept, *(window or (None, None)),
+                              voi_func)
+        for window in windows
+    ]
+
+    if len(windows) == 1:
+        return attrs, render_pixels(arr, params_list[0], pipeline=pipeline,
+                                    dtype=dtype), scale
+
+    return attrs[:2] + ("RGB",), render_channels(arr, params_list, pipeline,
+                                                 dtype), scale
+
+
+def render_from_dataset(ds, ignore_scaling=False, ignore_windowing=False,
+                        slope=None, intercept=None, center=None, width=None,
+                        voi_func=None, pipeline="lut", factor=1,
+                        resample=True, dtype=np.uint8, windows=None):
+    """
+    Reads the (raw) image data from the DICOM file associated with the
+    specified DICOM database entry and renders it as a normalized 8-bit
+    image.
+
+    This is equivalent to normalizing the result of
+    :function: 'read_from_dataset' but is considerably faster and uses far
+    less memory.
+
+    The (raw) image data may optionally be reduced in size before any
+    scaling or windowing operations are applied, which is much faster when
+    an image is to be resized to a fraction of its original size.
+    Compressed image data is decoded at a reduced resolution where possible
+    and, if resampling is allowed, whatever remains of the factor is made up
+    by downsampling.  The returned image attributes always describe the
+    original image.
+
+    If a collection of windows is given then the image is rendered once per
+    window, from the same (raw) image data, and the results are stacked as
+    the channels of an RGB image (see :function: 'render_channels').  Each
+    window is a pair of a center and width, which is applied whether or not
+    the image itself is windowed, or None to use the full range of the
+    (scaled) image.  A single window renders a grayscale image instead.
+
+    :param ds: The DICOM database entry to use.
+    :param ignore_scaling: Whether or not to ignore, or not apply,
+    any applicable scaling operations.
+    :param ignore_windowing: Whether or not to ignore, or not apply,
+    any applicable windowing operations.
+    :param slope: The rescale slope to use (optional).
+    :param intercept: The rescale intercept to use (optional).
+    :param center: The scaling center to use (optional).
+    :param width: The scaling window width to use (optional).
+    :param voi_func: The VOI LUT function to use.  This may be one of:
+    "Linear", "Linear_Exact", or "Sigmoid".
+    :param pipeline: The pixel pipeline to render with.
+    :param factor: The maximum integer factor to reduce the (raw) image data
+    by.
+    :param resample: Whether or not to downsample the (raw) image data by
+    whatever remains of the factor after decoding.
+    :param dtype: The unsigned integer type to render to.
+    :param windows: The collection of one or three windows to render as
+    channels (optional).
+    :return: A tuple containing basic image attributes as a tuple, an array
+    of normalized image pixel data, and the factor that data was reduced by.
+    :raises ValueError: If windows are given for an image that is not
+    grayscale, or there are neither one nor three of them.
+    """
+    meta, arr, scale = read_image(ds, factor)
+
+    return render_decoded(ds, meta, arr, scale, ignore_scaling,
+                          ignore_windowing, slope, intercept, center, width,
+                          voi_func, pipeline, factor, resample, dtype,
+                          windows)
+
+
+def render_lookup(arr, params, out=None, dtype=np.uint8):
+    """
+    Applies the scaling, windowing, and normalization operations described
+    by the specified parameters to the specified collection of integer
+    pixels using a lookup table.
+
+    The windowed value of every possible pixel is computed once per
+    parameter set and cached (see :function: 'build_lookup_table'); for each
+    image only the table is normalized and quantized, after which every
+    pixel is converted with a single gather.  Only integer data of at most
+    16 bits is supported (see :function: 'supports_lookup').
+
+    :param arr: The collection of (raw) integer pixels to render.
+    :param params: The scaling and windowing parameters to use.
+    :param out: The array to write the result to (optional).
+    :param dtype: The unsigned integer type to quantize to, if no output
+    array is given.
+    :return: A collection of normalized pixel values.
+    """
+    dtype = out.dtype if out is not None else np.dtype(dtype)
+    table = get_render_table(arr, params, dtype)
+    index = arr.view(arr.dtype.str.replace("i", "u"))
+
+    if out is None:
+        return table[index]
+
+    out[...] = table[index]
+
+    return out
+
+
+def render_pixels(arr, params, out=None, pipeline="lut", dtype=np.uint8):
+    """
+    Applies the scaling, windowing, and normalization operations described
+    by the specified parameters to the specified collection of pixels and
+    quantizes the result to unsigned integers (8-bit by default) using the
+    specified pixel pipeline.
+
+    The lookup table pipeline ("lut") is only used for data it supports;
+    all other data is rendered with the floating-point pipeline ("float").
+
+    :param arr: The collection of (raw) pixels to render.
+    :param params: The scaling and windowing parameters to use.
+    :param out: The array to write the result to (optional).
+    :param pipeline: The pixel pipeline to use.
+    :param dtype: The unsigned integer type to quantize to, if no output
+    array is given.
+    :return: A collection of normalized pixel values.
+    :raises KeyError: If the pixel pipeline is unknown.
+    """
+    if pipeline not in PIXEL_PIPELINES:
+        raise KeyError(f"Cannot render pixels - unknown pipeline: "
+                       f"{pipeline}.")
+
+    if pipeline == "lut" and not supports_lookup(arr):
+        pipeline = "float"
+
+    return PIXEL_PIPELINES[pipeline](arr, params, out, dtype)
+
+
+def render_float(arr, params, out=None, dtype=np.uint8):
+    """
+    Applies the scaling, windowing, and normalization operations described
+    by the specified parameters to the specified collection of pixels and
+    quantizes the result to unsigned integers (8-bit by default).
+
+    All operations are fused into a handful of in-place passes over a single,
+    reused single precision buffer; no full-size double precision
+    temporaries are created.  Because every supported operation is monotonic,
+    the bounds used for normalization are computed from the extrema of the
+    (raw) pixels alone.  The result is identical to that of
+    :function: 'normalize' applied to the output of
+    :function: 'read_from_dataset' to within one intensity level.
+
+    :param arr: The collection of (raw) pixels to render.
+    :param params: The scaling and windowing parameters to use.
+    :param out: The array to write the result to (optional).
+    :param dtype: The unsigned integer type to quantize to, if no output
+    array is given.
+    :return: A collection of normalized pixel values.
+    """
+    slope, intercept, voi_func, center, width, y_min, y_max = params
+
+    if out is None:
+        out = np.empty(arr.shape, dtype)
+
+    peak = float(np.iinfo(out.dtype).max)
+
+    bounds = compute_window([arr.min(), arr.max()], params)
+    low, high = bounds.min(), bounds.max()
+
+    if high == low:
+        out.fill(0)
+        return out
+
+    k = peak / (high - low)
+    buffer = get_scratch(arr.shape)
+
+    if voi_func in ["LINEAR", "LINEAR_EXACT"]:
+        if voi_func == "LINEAR":
+            center -= 0.5
+            width -= 1
+
+        s = (y_max - y_min) / width
+        b = (-center / width + 0.5) * (y_max - y_min) + y_min
+
+        np.multiply(arr, slope * s * k, out=buffer)
+        buffer += (intercept * s + b - low) * k
+    elif voi_func == "SIGMOID":
+        s = -4.0 / width
+
+        np.multiply(arr, slope * s, out=buffer)
+        buffer += (intercept - center) * s
+
+        with np.errstate(over="ignore"):
+            np.exp(buffer, out=buffer)
+
+        buffer += 1.0
+        np.reciprocal(buffer, out=buffer)
+        buffer *= (y_max - y_min) * k
+        buffer += (y_min - low) * k
+    else:
+        np.multiply(arr, slope * k, out=buffer)
+        buffer += (intercept - low) * k
+
+    np.clip(buffer, 0.0, peak, out=buffer)
+    np.copyto(out, buffer, casting="unsafe")
+
+    return out
+
+
+@lru_cache(maxsize=None)
+def select_handlers(syntax):
+    """
+    Returns the names of every pydicom pixel data handler installed that
+    supports the specified transfer syntax, fastest first.
+
+    Handlers are ordered as given by :attr: 'DECODER_PREFERENCES', so that
+    slow pure-Python decoders are only used as a last resort.  The
+    pylibjpeg handler is only used for transfer syntaxes whose plugin is
+    installed (see :attr: 'PYLIBJPEG_PLUGINS').
+
+    :param syntax: The transfer syntax to decode.
+    :return: A tuple of the names of pixel data handlers, which is empty if
+    no preferred handler is available and pydicom should choose one itself.
+    """
+    syntax = UID(syntax)
+    names = []
+
+    for name in DECODER_PREFERENCES.get(syntax, []):
+        handler = PIXEL_HANDLERS[name]
+
+        if not handler.is_available() or \
+                not handler.supports_transfer_syntax(syntax):
+            continue
+
+        if name == "pylibjpeg" and \
+                not getattr(handler, PYLIBJPEG_PLUGINS[syntax], False):
+            continue
+
+        names.append(name)
+
+    return tuple(names)
+
+
+def supports_lookup(arr):
+    """
+    Returns whether or not the specified collection of pixels may be
+    rendered with a lookup table.
+
+    :param arr: The collection of pixels to check.
+    :return: Whether or not pixels are integers of at most 16 bits.
+    """
+    return arr.dtype.kind in "iu" and arr.dtype.itemsize <= 2
 
 
 def transform_coordinate_collection(coord_list, origin, ratios):
@@ -366,3 +1518,67 @@ def transform_coords(coords, origin, ratios):
     y_t = y * ratios[1] + origin[1]
 
     return np.insert(y_t, np.arange(len(x_t)), x_t)
+
+
+PIXEL_PIPELINES = {
+    "float": render_float,
+    "lut": render_lookup
+}
+
+
+RESAMPLING_FILTERS = {
+    "bicubic": Image.BICUBIC,
+    "bilinear": Image.BILINEAR,
+    "box": Image.BOX,
+    "hamming": Image.HAMMING,
+    "lanczos": Image.LANCZOS,
+    "nearest": Image.NEAREST
+}
+
+
+PIXEL_HANDLERS = {
+    "gdcm": gdcm_handler,
+    "jpeg_ls": jpeg_ls_handler,
+    "numpy": numpy_handler,
+    "pillow": pillow_handler,
+    "pylibjpeg": pylibjpeg_handler,
+    "rle": rle_handler
+}
+
+
+DECODER_PREFERENCES = {
+    DeflatedExplicitVRLittleEndian: ["numpy"],
+    ExplicitVRBigEndian: ["numpy"],
+    ExplicitVRLittleEndian: ["numpy"],
+    ImplicitVRLittleEndian: ["numpy"],
+    JPEG2000: ["pylibjpeg", "pillow", "gdcm"],
+    JPEG2000Lossless: ["pylibjpeg", "pillow", "gdcm"],
+    JPEGBaseline8Bit: ["pillow", "pylibjpeg", "gdcm"],
+    JPEGExtended12Bit: ["pylibjpeg", "gdcm", "pillow"],
+    JPEGLosslessP14: ["pylibjpeg", "gdcm"],
+    JPEGLosslessSV1: ["pylibjpeg", "gdcm"],
+    JPEGLSLossless: ["pylibjpeg", "jpeg_ls", "gdcm"],
+    JPEGLSNearLossless: ["pylibjpeg", "jpeg_ls", "gdcm"],
+    RLELossless: ["pylibjpeg", "gdcm", "rle"]
+}
+
+
+PYLIBJPEG_PLUGINS = {
+    JPEG2000: "HAVE_OPENJPEG",
+    JPEG2000Lossless: "HAVE_OPENJPEG",
+    JPEGBaseline8Bit: "HAVE_LIBJPEG",
+    JPEGExtended12Bit: "HAVE_LIBJPEG",
+    JPEGLosslessP14: "HAVE_LIBJPEG",
+    JPEGLosslessSV1: "HAVE_LIBJPEG",
+    JPEGLSLossless: "HAVE_LIBJPEG",
+    JPEGLSNearLossless: "HAVE_LIBJPEG",
+    RLELossless: "HAVE_RLE"
+}
+
+
+REDUCED_DECODERS = {
+    JPEG2000: decode_jpeg2000,
+    JPEG2000Lossless: decode_jpeg2000,
+    JPEGBaseline8Bit: decode_jpeg,
+    JPEGExtended12Bit: decode_jpeg
+}
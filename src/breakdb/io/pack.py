@@ -0,0 +1,101 @@
+"""
+Contains classes and functions pertaining to pixel packs, which cache the
+decoded (raw) pixel data of every entry of a collated DICOM database in a
+single file, such that images need never be decoded again.
+
+The location of each entry's pixels in a pack is joined to the database
+itself (see :attr: 'PACK_COLUMNS'), and entries are read from their pack,
+when it exists, instead of their DICOM file (see
+:function: 'breakdb.io.image.read_image').
+"""
+import logging
+import os
+import zlib
+
+from breakdb.io.image import read_image
+
+
+def pack_entry(ds, compress_level=None, skip_broken=False):
+    """
+    Decodes the (raw) pixel data of the specified DICOM database entry, in
+    full and in its original data type, for a pixel pack.
+
+    Any pack the entry is already in is ignored, so that a pack may be
+    rebuilt from the DICOM files it was built from.
+
+    :param ds: The DICOM database entry to use.
+    :param compress_level: The zlib compression level to compress the pixel
+    data with (optional).
+    :param skip_broken: Whether or not to ignore I/O errors.
+    :return: A tuple containing the (compressed) pixel data, its NumPy data
+    type, its shape, and the name of its compression, or None if the entry
+    could not be decoded and broken entries are skipped.
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        _, arr, _ = read_image(ds.drop(PACK_COLUMNS, errors="ignore"))
+    except Exception as ex:
+        if not skip_broken:
+            raise
+
+        logger.warning("Could not pack database entry: {}.", ds.get("ID"))
+        logger.warning("  Reason: {}.", ex)
+
+        return None
+
+    data = arr.tobytes()
+
+    if compress_level is None:
+        return data, arr.dtype.str, list(arr.shape), "none"
+
+    return zlib.compress(data, compress_level), arr.dtype.str, \
+        list(arr.shape), "zlib"
+
+
+def write_pack(packed, file_path):
+    """
+    Writes the specified collection of packed pixel data to a pixel pack.
+
+    Every image is aligned to :attr: 'PACK_ALIGNMENT' bytes.  The pack is
+    written to a temporary file that only replaces the specified file once
+    complete.
+
+    :param packed: The collection of packed pixel data to write (see
+    :function: 'pack_entry').
+    :param file_path: The file to write the pixel pack to.
+    :return: A list containing, for each image, the values of its
+    :attr: 'PACK_COLUMNS'.
+    """
+    temp_path = file_path + ".tmp"
+    rows = []
+
+    with open(temp_path, "wb") as f:
+        for result in packed:
+            if not result:
+                rows.append([file_path, -1, 0, None, None, "none"])
+                continue
+
+            data, dtype, shape, compression = result
+
+            f.write(bytes(-f.tell() % PACK_ALIGNMENT))
+            rows.append([file_path, f.tell(), len(data), dtype, shape,
+                         compression])
+            f.write(data)
+
+    os.replace(temp_path, file_path)
+
+    return rows
+
+
+PACK_ALIGNMENT = 64
+
+
+PACK_COLUMNS = [
+    "Pack File",         # Location of the pixel pack on disk.
+    "Pack Offset",       # Location of pixel data in the pack (or -1).
+    "Pack Length",       # The size of (compressed) pixel data (in bytes).
+    "Pack Type",         # The data type of pixel data.
+    "Pack Shape",        # The dimensions of pixel data.
+    "Pack Compression"   # The compression of pixel data ("none" or "zlib").
+]
@@ -0,0 +1,239 @@
+"""
+Contains classes and functions pertaining to warming the page cache with
+files that are about to be read, such that readers mostly find their input
+already in memory instead of stalling on cold reads from slow storage (e.g.
+spinning disks or network file systems).
+"""
+import logging
+import os
+import threading
+from collections import deque
+
+
+class FilePrefetcher:
+    """
+    Represents a sliding window, of bounded size, over a sequence of
+    upcoming file ranges that a small pool of threads reads ahead of their
+    reader.
+
+    Ranges are prefetched in order for as long as every range that has been
+    prefetched, but not yet read (see :function: 'release'), fits in the
+    window; a range larger than the window is prefetched on its own.  Each
+    range is either advised to the kernel ("advise", see
+    :function: 'os.posix_fadvise'), which reads it asynchronously, or read
+    by the prefetching thread itself ("read"), which also works on file
+    systems that ignore such advice.
+    """
+
+    def __init__(self, window, threads=2, mode="advise"):
+        """
+        :param window: The maximum number of bytes prefetched ahead of the
+        reader.
+        :param threads: The number of threads to prefetch with.
+        :param mode: Whether to advise the kernel of each range ("advise")
+        or read it ("read").
+        :raises ValueError: If the mode is unknown.
+        """
+        if mode not in PREFETCH_MODES:
+            raise ValueError(f"Unknown prefetch mode: {mode}.")
+
+        if mode == "advise" and not hasattr(os, "posix_fadvise"):
+            mode = "read"
+
+        self.closed = False
+        self.condition = threading.Condition()
+        self.counts = [0, 0]
+        self.mode = mode
+        self.pending = deque()
+        self.used = 0
+        self.window = window
+        self.workers = [
+            threading.Thread(target=self.run, daemon=True)
+            for _ in range(threads)
+        ]
+
+        for worker in self.workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def admit(self, item, size):
+        """
+        Waits until the specified item, of the specified size, fits in the
+        window of this prefetcher and reserves room for it.
+
+        :param item: The item to admit.
+        :param size: The number of bytes to prefetch.
+        :return: Whether or not the item was admitted; items already read,
+        or left when this prefetcher closes, are not.
+        """
+        with self.condition:
+            while not self.closed and not item[4] and self.used and \
+                    self.used + size > self.window:
+                self.condition.wait()
+
+            if self.closed or item[4]:
+                return False
+
+            item[3] = size
+            self.used += size
+
+            return True
+
+    def close(self):
+        """
+        Stops prefetching and waits for every thread to exit.
+        """
+        logger = logging.getLogger(__name__)
+
+        with self.condition:
+            if self.closed:
+                return
+
+            self.closed = True
+            self.condition.notify_all()
+
+        for worker in self.workers:
+            worker.join()
+
+        logger.debug("Prefetched: {} ranges ({:.1f} MB).", self.counts[0],
+                     self.counts[1] / 2 ** 20)
+
+    def iterate(self, items, handles):
+        """
+        Yields each of the specified items, in order, and marks the file
+        range of each, by its handle, as read once the next item is
+        requested (see :function: 'release').
+
+        :param items: The collection of items to iterate over.
+        :param handles: The handles of the file ranges of the items, in
+        order (see :function: 'prefetch').
+        :return: A generator of the items.
+        """
+        try:
+            for item, handle in zip(items, handles):
+                yield item
+
+                self.release([handle])
+        finally:
+            self.release(handles)
+
+    def prefetch(self, ranges):
+        """
+        Appends the specified file ranges to those that will be read next,
+        in order.
+
+        :param ranges: The collection of file ranges, each as a tuple of a
+        file path (or None to prefetch nothing), an offset, and a length (or
+        None to prefetch up to the end of the file).
+        :return: A list of handles to release each range with once it has
+        been read (see :function: 'release').
+        """
+        handles = [[file_path, offset, length, 0, file_path is None]
+                   for file_path, offset, length in ranges]
+
+        with self.condition:
+            self.pending.extend(item for item in handles if not item[4])
+            self.condition.notify_all()
+
+        return handles
+
+    def release(self, handles):
+        """
+        Marks the file ranges of the specified handles as read, freeing their
+        room in the window; ranges not yet prefetched will no longer be.
+
+        Releasing a range more than once has no effect.
+
+        :param handles: The collection of handles of the ranges read.
+        """
+        with self.condition:
+            for item in handles:
+                if not item[4]:
+                    item[4] = True
+                    self.used -= item[3]
+
+            self.condition.notify_all()
+
+    def run(self):
+        """
+        Prefetches upcoming file ranges until this prefetcher is closed.
+        """
+        logger = logging.getLogger(__name__)
+        buffer = bytearray(2 ** 20) if self.mode == "read" else None
+
+        while True:
+            with self.condition:
+                while not self.closed and not self.pending:
+                    self.condition.wait()
+
+                if self.closed:
+                    return
+
+                item = self.pending.popleft()
+
+            file_path, offset, length = item[:3]
+
+            try:
+                size = os.path.getsize(file_path) - offset
+
+                if length is not None:
+                    size = min(size, length)
+
+                if not self.admit(item, max(size, 0)):
+                    continue
+
+                warm_range(file_path, offset, size, buffer)
+            except OSError as ex:
+                logger.debug("Could not prefetch: {}: {}.", file_path, ex)
+                continue
+
+            with self.condition:
+                self.counts[0] += 1
+                self.counts[1] += size
+
+
+def warm_range(file_path, offset, length, buffer=None):
+    """
+    Brings the specified range of the specified file into the page cache.
+
+    :param file_path: The path to the file to use.
+    :param offset: The offset of the range.
+    :param length: The length of the range.
+    :param buffer: The buffer to read the range into, block by block, or
+    None to advise the kernel to read it asynchronously instead.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        if buffer is None:
+            # The kernel reads at most its read-ahead window ahead for each
+            # piece of advice, so larger ranges are advised block by block.
+            for start in range(offset, offset + length, ADVISE_BLOCK_SIZE):
+                os.posix_fadvise(f.fileno(), start,
+                                 min(ADVISE_BLOCK_SIZE,
+                                     offset + length - start),
+                                 os.POSIX_FADV_WILLNEED)
+
+            return
+
+        f.seek(offset)
+
+        view = memoryview(buffer)
+
+        while length > 0:
+            read = f.readinto(view[:min(length, len(buffer))])
+
+            if not read:
+                break
+
+            length -= read
+
+
+# The default read-ahead window of most block devices.
+ADVISE_BLOCK_SIZE = 2 ** 17
+
+
+PREFETCH_MODES = ["advise", "read"]
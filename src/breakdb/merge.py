@@ -6,7 +6,7 @@ import logging
 from collections import defaultdict
 
 from breakdb.tag import has_tag, get_tag, CommonTag, AnnotationTag, \
-    ScalingTag, PixelTag, MiscTag, MissingTag, WindowingTag
+    ScalingTag, PixelTag, MiscTag, MissingTag, WindowingTag, LayoutTag
 from breakdb.util import remove_duplicates
 
 
@@ -68,7 +68,17 @@ def make_database_entry(merged):
             has_tag(merged, ScalingTag.SLOPE),
         has_tag(merged, WindowingTag.CENTER) and \
             has_tag(merged, WindowingTag.WIDTH),
-        remove_duplicates(get_tag(merged, AnnotationTag.SEQUENCE))
+        remove_duplicates(get_tag(merged, AnnotationTag.SEQUENCE)),
+        get_tag(merged, LayoutTag.TRANSFER_SYNTAX) \
+            if has_tag(merged, LayoutTag.TRANSFER_SYNTAX) else "",
+        get_tag(merged, LayoutTag.OFFSET) \
+            if has_tag(merged, LayoutTag.OFFSET) else -1,
+        get_tag(merged, LayoutTag.LENGTH) \
+            if has_tag(merged, LayoutTag.LENGTH) else -1,
+        get_tag(merged, LayoutTag.TYPE) \
+            if has_tag(merged, LayoutTag.TYPE) else "",
+        "x".join(str(size) for size in get_tag(merged, LayoutTag.SHAPE)) \
+            if has_tag(merged, LayoutTag.SHAPE) else ""
     ]
 
 
@@ -162,6 +172,9 @@ def merge_dataset(src, dest):
                              get_tag(dest, PixelTag.DATA),
                              get_tag(src, PixelTag.DATA))
 
+    for tag in LayoutTag:
+        dest.update(merge_tag(src, dest, tag))
+
     return dest
 
 
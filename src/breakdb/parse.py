@@ -4,13 +4,16 @@ usable programmatic structures.
 """
 import logging
 
+import numpy as np
 from pydicom import dcmread
 from pydicom.errors import InvalidDicomError
+from pydicom.pixel_data_handlers.util import pixel_dtype
 
 from breakdb.tag import CommonTag, ReferenceTag, AnnotationTag, get_tag, \
     get_tag_at, make_tag_dict, has_tag, get_sequence, has_sequence, PixelTag, \
     ScalingTag, MissingTag, MalformedSequence, MissingSequence, replace_tag, \
-    MiscTag, check_tag, check_sequence_length, WindowingTag, make_tag_list
+    MiscTag, check_tag, check_sequence_length, WindowingTag, make_tag_list, \
+    LayoutTag
 
 ALL_TAGS = make_tag_list(
     AnnotationTag.SEQUENCE,
@@ -24,6 +27,7 @@ ALL_TAGS = make_tag_list(
     PixelTag.COLUMNS,
     PixelTag.DATA,
     PixelTag.PHOTOMETRIC_INTERPRETATION,
+    PixelTag.PLANAR_CONFIGURATION,
     PixelTag.REPRESENTATION,
     PixelTag.ROWS,
     PixelTag.SAMPLES_PER_PIXEL,
@@ -36,6 +40,10 @@ ALL_TAGS = make_tag_list(
     WindowingTag.WIDTH
 )
 
+# Parsing reads DICOM headers alone, which rarely span more than a few
+# kilobytes; large values, such as pixel data, are skipped.
+HEADER_PREFETCH_SIZE = 2 ** 18
+
 
 class ParsingError(Exception):
     """
@@ -209,6 +217,72 @@ def parse_common(ds):
     )
 
 
+def parse_layout(ds):
+    """
+    Parses and returns a dictionary describing where and how the (raw) pixel
+    data in a DICOM dataset read from disk is stored.
+
+    Only pixel data that is stored natively (uncompressed) as a single,
+    contiguous block of interleaved samples may be read directly from disk.
+    For all other pixel data the offset is -1, indicating that it must be
+    decoded instead.
+
+    :param ds: The dataset to search.
+    :return: A dictionary of pixel layout information.
+    :raises MissingTag: If one or more tags could not be found.
+    """
+    elem = dict(ds.items()).get(PixelTag.DATA.value)
+    syntax = ds.file_meta.TransferSyntaxUID
+    layout = {
+        LayoutTag.LENGTH.value: -1,
+        LayoutTag.OFFSET.value: -1,
+        LayoutTag.SHAPE.value: [],
+        LayoutTag.TRANSFER_SYNTAX.value: str(syntax),
+        LayoutTag.TYPE.value: ""
+    }
+
+    if elem is None:
+        raise MissingTag(PixelTag.DATA)
+
+    samples = get_tag(ds, PixelTag.SAMPLES_PER_PIXEL).value
+    shape = [get_tag(ds, PixelTag.ROWS).value,
+             get_tag(ds, PixelTag.COLUMNS).value]
+
+    if samples > 1:
+        shape.append(samples)
+
+    if get_tag(ds, PixelTag.BITS_ALLOCATED).value % 8 != 0:
+        return layout
+
+    dtype = pixel_dtype(ds)
+
+    layout[LayoutTag.SHAPE.value] = shape
+    layout[LayoutTag.TYPE.value] = dtype.str
+
+    offset = getattr(elem, "value_tell", None)
+    length = int(np.prod(shape)) * dtype.itemsize
+
+    if offset is None or elem.length < length or syntax.is_compressed or \
+            syntax.is_deflated:
+        return layout
+
+    if get_tag(ds, PixelTag.PHOTOMETRIC_INTERPRETATION).value == \
+            "YBR_FULL_422":
+        return layout
+
+    if samples > 1 and (not has_tag(ds, PixelTag.PLANAR_CONFIGURATION) or
+                        get_tag(ds, PixelTag.PLANAR_CONFIGURATION).value != 0):
+        return layout
+
+    if dtype.itemsize == 1 and not ds.is_little_endian:
+        return layout
+
+    layout[LayoutTag.LENGTH.value] = length
+    layout[LayoutTag.OFFSET.value] = offset
+
+    return layout
+
+
 def parse_misc(ds):
     """
     Parses and returns a dictionary of miscellaneous information in a DICOM
@@ -353,6 +427,7 @@ def parse_dicom(file_path, skip_broken):
             if has_tag(parsed, PixelTag.COLUMNS) and \
                     has_tag(parsed, PixelTag.ROWS):
                 parsed.update({PixelTag.DATA.value: file_path})
+                parsed.update(parse_layout(ds))
 
             if has_tag(parsed, ReferenceTag.SEQUENCE):
                 ref = get_tag(parsed, ReferenceTag.SEQUENCE)
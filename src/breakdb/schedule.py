@@ -0,0 +1,310 @@
+"""
+Contains classes and functions pertaining to scheduling work by where the
+files it reads are stored, such that every storage device is read in the
+order of its layout, with its own number of concurrent tasks, or by how
+much work it is, such that workers finish together, rather than in the
+order files were found or entries were stored.
+"""
+import os
+import queue
+import threading
+from collections import deque
+from functools import partial
+from itertools import zip_longest
+
+
+class DeviceScheduler:
+    """
+    Represents a scheduler that runs tasks, each of which reads from a
+    single storage device, on a pool of workers, with at most a given
+    number of tasks running against each device at once.
+
+    Every device is given its own dispatching threads, one per concurrent
+    task, which hand its tasks to the pool in order and wait for each to
+    finish, such that a slow device (e.g. network storage) holds back no
+    more than its own share of the pool, while every other device is read
+    at its own pace.  Pools of processes run one task per process at a
+    time, including hybrid pools (see :class: 'HybridPool').
+    """
+
+    def __init__(self, limits=None, default_limit=1, order=None):
+        """
+        :param limits: The dictionary of the maximum number of concurrent
+        tasks of each device, by device number (optional).
+        :param default_limit: The maximum number of concurrent tasks of any
+        other device.
+        :param order: How to order the work of each device (optional, see
+        :function: 'group_by_locality').
+        :raises ValueError: If the order is unknown.
+        """
+        if order not in LOCALITY_ORDERS:
+            raise ValueError(f"Unknown locality order: {order}.")
+
+        self.default_limit = default_limit
+        self.limits = limits or {}
+        self.order = order
+
+    def get_limit(self, device):
+        """
+        Returns the maximum number of tasks that may run against the
+        specified device at once.
+
+        :param device: The device number to use.
+        :return: The maximum number of concurrent tasks (at least one).
+        """
+        return max(1, self.limits.get(device, self.default_limit))
+
+    def imap_unordered(self, pool, fn, tasks):
+        """
+        Applies the specified function to the item of every one of the
+        specified tasks on the specified pool, lazily, as devices allow.
+
+        Once a task fails, no more tasks are dispatched and the exception is
+        raised once every task already dispatched has finished.
+
+        :param pool: The pool of workers to use (see
+        :function: 'create_executor').
+        :param fn: The function to apply.
+        :param tasks: The collection of tasks, each as a tuple of the device
+        number it reads from and its item.
+        :return: An iterator of pairs of the position of each task and its
+        result, in the order tasks finish.
+        """
+        devices = {}
+        results = queue.Queue()
+        stopped = threading.Event()
+
+        for index, (device, item) in enumerate(tasks):
+            devices.setdefault(device, deque()).append((index, item))
+
+        def dispatch(pending):
+            while not stopped.is_set():
+                try:
+                    index, item = pending.popleft()
+                except IndexError:
+                    break
+
+                try:
+                    results.put((index, pool.apply(fn, (item,)), None))
+                except Exception as ex:
+                    results.put((index, None, ex))
+
+            results.put(None)
+
+        dispatchers = [
+            threading.Thread(target=dispatch, args=(pending,), daemon=True)
+            for device, pending in devices.items()
+            for _ in range(min(self.get_limit(device), len(pending)))
+        ]
+
+        for dispatcher in dispatchers:
+            dispatcher.start()
+
+        error = None
+        running = len(dispatchers)
+
+        try:
+            while running:
+                result = results.get()
+
+                if result is None:
+                    running -= 1
+                    continue
+
+                index, value, ex = result
+
+                if ex is not None:
+                    stopped.set()
+                    error = error or ex
+                elif error is None:
+                    yield index, value
+        finally:
+            stopped.set()
+
+        if error is not None:
+            raise error
+
+
+def apply_each(fn, items):
+    """
+    Applies the specified function to every one of the specified items, in
+    order, such that a single task may carry many small items.
+
+    :param fn: The function to apply.
+    :param items: The collection of items to apply the function to.
+    :return: A list of the results, in order.
+    """
+    return [fn(item) for item in items]
+
+
+def apply_indexed(fn, item):
+    """
+    Applies the specified function to the value of the specified item,
+    keeping its position, such that results may arrive in any order.
+
+    :param fn: The function to apply.
+    :param item: A tuple of the position of the item and its value.
+    :return: A tuple of the position of the item and the result.
+    """
+    index, value = item
+
+    return index, fn(value)
+
+
+def create_tasks(groups, split):
+    """
+    Splits the positions of every device of the specified groups into tasks
+    with the specified function, such that no task reads from more than one
+    device.
+
+    Tasks alternate between devices, in order, so that every device is
+    reached early when tasks are run in sequence.
+
+    :param groups: The dictionary of the positions of every device, by
+    device number, in order (see :function: 'group_by_locality').
+    :param split: The function to split the positions of a device into
+    collections of positions with (see :function: 'split_rows').
+    :return: A list of tasks, each as a tuple of the device number and a
+    collection of positions.
+    """
+    chunks = [
+        [(device, chunk) for chunk in split(positions)]
+        for device, positions in groups.items()
+    ]
+
+    return [task for tasks in zip_longest(*chunks) for task in tasks
+            if task is not None]
+
+
+def get_locality(file_path):
+    """
+    Computes where the specified file is stored.
+
+    Files that cannot be found are placed on an unknown device (-1).
+
+    :param file_path: The path to the file to use.
+    :return: A tuple of the device number, inode number, directory, and
+    file name.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return -1, 0, directory, name
+
+    return stat.st_dev, stat.st_ino, directory, name
+
+
+def get_file_size(file_path):
+    """
+    Returns the size of the specified file, or zero if it cannot be found.
+
+    :param file_path: The path to the file to use.
+    :return: The size of the file in bytes.
+    """
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def group_by_locality(ranges, order=None):
+    """
+    Groups the positions of the specified file ranges by the storage device
+    of their files and orders each group by where its ranges are stored.
+
+    Ranges are ordered by inode ("inode"), which most file systems allocate
+    in the order of their layout, by directory and file name
+    ("directory"), or kept in the given order (None); ranges of the same
+    file are ordered by offset, unless kept in the given order.
+
+    :param ranges: The collection of file ranges, each as a tuple of a file
+    path and an offset.
+    :param order: How to order the ranges of each device (optional).
+    :return: A dictionary of a list of positions of every device, by device
+    number, in the order of first appearance.
+    :raises ValueError: If the order is unknown.
+    """
+    if order not in LOCALITY_ORDERS:
+        raise ValueError(f"Unknown locality order: {order}.")
+
+    cache = {}
+    groups = {}
+    keys = []
+
+    for position, (file_path, offset) in enumerate(ranges):
+        if file_path not in cache:
+            cache[file_path] = get_locality(file_path)
+
+        device, inode, directory, name = cache[file_path]
+
+        groups.setdefault(device, []).append(position)
+        keys.append({
+            "directory": (directory, name, offset),
+            "inode": (inode, offset),
+            None: (position,)
+        }[order])
+
+    for positions in groups.values():
+        positions.sort(key=keys.__getitem__)
+
+    return groups
+
+
+def imap_indexed(pool, fn, items):
+    """
+    Applies the specified function to every one of the specified items on
+    the specified pool, lazily, handing each item to the next free worker.
+
+    :param pool: The pool of workers to use (see
+    :function: 'create_executor').
+    :param fn: The function to apply.
+    :param items: The collection of items to apply the function to.
+    :return: An iterator of pairs of the position of each item and its
+    result, in the order items finish.
+    """
+    return pool.imap_unordered(partial(apply_indexed, fn), enumerate(items))
+
+
+def split_by_cost(costs, processes, max_size=64):
+    """
+    Orders the positions of the specified estimated costs from the largest
+    cost to the smallest and splits them into tasks for a pool of workers
+    of the specified size.
+
+    Every task holds about half of each worker's share of the work that
+    remains (guided self-scheduling), but no more than the specified number
+    of positions.  The largest items are therefore handed out first, on
+    their own, and tasks shrink as work runs out, such that no worker is
+    left with a large item, or a large task, while every other worker is
+    idle.
+
+    :param costs: The collection of the estimated cost of every position.
+    :param processes: The number of workers in the pool.
+    :param max_size: The maximum number of positions per task.
+    :return: A list of lists of positions, largest first.
+    """
+    costs = [max(cost, 1) for cost in costs]
+    remaining = sum(costs)
+    tasks = []
+    task = []
+    size = 0
+
+    for position in sorted(range(len(costs)), key=lambda p: -costs[p]):
+        task.append(position)
+        size += costs[position]
+
+        if size * 2 * processes >= remaining or len(task) >= max_size:
+            tasks.append(task)
+            remaining -= size
+            task = []
+            size = 0
+
+    if task:
+        tasks.append(task)
+
+    return tasks
+
+
+LOCALITY_ORDERS = [None, "directory", "inode"]
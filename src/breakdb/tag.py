@@ -93,6 +93,49 @@ class CommonTag(Enum):
     """
 
 
+@unique
+class LayoutTag(Enum):
+    """
+    Represents a collection of keys that describe how (raw) pixel data is
+    physically stored in a DICOM file.
+
+    With the exception of the transfer syntax, these are not DICOM tags but
+    are instead computed during parsing.
+    """
+
+    LENGTH = "PixelDataLength"
+    """
+    Represents the length, in bytes, of the (raw) pixel data.
+    """
+
+    OFFSET = "PixelDataOffset"
+    """
+    Represents the position, in bytes, of the (raw) pixel data relative to the 
+    start of a file.
+    
+    This value is -1 if the pixel data may not be read directly from disk 
+    (e.g. it is compressed).
+    """
+
+    SHAPE = "PixelDataShape"
+    """
+    Represents the shape of the (raw) pixel data as a collection of rows, 
+    columns, and - for color images only - samples per pixel.
+    """
+
+    TRANSFER_SYNTAX = Tag(0x0002, 0x0010)
+    """
+    Represents the encoding of a DICOM file, including whether or not its 
+    pixel data is compressed.
+    """
+
+    TYPE = "PixelDataType"
+    """
+    Represents the NumPy data type, including byte order, of the (raw) pixel 
+    data.
+    """
+
+
 @unique
 class MiscTag(Enum):
     """
@@ -150,6 +193,15 @@ class PixelTag(Enum):
     For this project, most DICOM files with be in MONOCHROME1 or MONOCHROME2.
     """
 
+    PLANAR_CONFIGURATION = Tag(0x0028, 0x0006)
+    """
+    Represents whether multi-sample (color) pixel data is stored with samples
+    interleaved per pixel (0) or as separate planes, one per sample (1).
+    
+    This value is only present if the number of samples per pixel is greater
+    than one.
+    """
+
     REPRESENTATION = Tag(0x0028, 0x0103)
     """
     Represents whether or not the (raw) pixel data is intended to be signed 
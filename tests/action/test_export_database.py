@@ -0,0 +1,40 @@
+"""
+Contains unit tests to ensure that databases are exported in full from the
+command line.
+"""
+import os
+
+import pandas as pd
+
+from breakdb.__main__ import parse_args
+from breakdb.action import export_database, ExitCode
+from breakdb.io import write_database
+
+
+class TestExportDatabase:
+    """
+    Test suite for :function: 'export_database'.
+    """
+
+    def test_export_database_names_labels_as_incremental_export(
+            self, create_entry, tmp_path, monkeypatch, disable_logging):
+        db = pd.DataFrame([create_entry(64, 48, [[8, 8, 40, 8, 40, 24]], 1)
+                           for _ in range(3)])
+        db["ID"] = ["a", "b", "c"]
+        db_path = str(tmp_path / "db.json")
+        out_dir = tmp_path / "out"
+
+        write_database(db, db_path)
+
+        for option in ["--incremental", "--labels-only"]:
+            monkeypatch.setattr("sys.argv", [
+                "breakdb", "export", "-d", str(out_dir), "-t", "yolov3",
+                "-p", "1", "--executor", "thread", option, db_path
+            ])
+
+            assert export_database(parse_args()) != ExitCode.FAILURE
+
+        assert sorted(os.listdir(out_dir / "labels")) == ["a.txt", "b.txt",
+                                                          "c.txt"]
+        assert sorted(os.listdir(out_dir / "images")) == ["a.jpg", "b.jpg",
+                                                          "c.jpg"]
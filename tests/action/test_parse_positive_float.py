@@ -0,0 +1,39 @@
+"""
+Contains unit tests to ensure that numbers given on the command line are
+rejected unless they are positive.
+"""
+import pytest
+
+from breakdb.__main__ import parse_args
+from breakdb.action import parse_positive_float
+
+
+class TestParsePositiveFloat:
+    """
+    Test suite for :function: 'parse_positive_float'.
+    """
+
+    def test_parse_positive_float_accepts_positive_numbers(self):
+        assert parse_positive_float("1.5") == 1.5
+        assert parse_positive_float("3") == 3.0
+
+    @pytest.mark.parametrize("value", ["0", "-2", "nan", "inf", "two"])
+    def test_parse_positive_float_rejects_other_values(self, value):
+        with pytest.raises(ValueError):
+            parse_positive_float(value)
+
+    def test_parse_positive_float_validates_resize_first(self, monkeypatch):
+        monkeypatch.setattr("sys.argv", [
+            "breakdb", "export", "-d", "out", "-t", "yolov3",
+            "--resize-first", "0", "db.json"
+        ])
+
+        with pytest.raises(SystemExit):
+            parse_args()
+
+        monkeypatch.setattr("sys.argv", [
+            "breakdb", "export", "-d", "out", "--resize-first", "-t",
+            "yolov3", "db.json"
+        ])
+
+        assert parse_args().resize_first == 2.0
@@ -1,7 +1,27 @@
 """
 Project PyTest configuration; handles fixtures, plugins, and other details.
 """
+import logging
 import os
 import sys
 
-from tests.helpers.dataset import create_dataset
+import pytest
+
+from tests.helpers.dataset import create_dataset, create_dicom_file, \
+    create_entry
+
+
+@pytest.fixture(scope="function")
+def disable_logging():
+    """
+    Disables logging for the duration of a test.
+
+    The project formats log messages with its own (brace-style) formatter,
+    which is not installed under test, so tests that log warnings (e.g.
+    for broken entries) would otherwise fail to format them.
+    """
+    logging.disable(logging.CRITICAL)
+
+    yield
+
+    logging.disable(logging.NOTSET)
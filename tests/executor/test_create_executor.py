@@ -0,0 +1,76 @@
+"""
+Contains unit tests to ensure that pools of processes, threads, and threads
+within processes apply functions to every item alike.
+"""
+import os
+import threading
+
+import pytest
+
+from breakdb.executor import create_executor
+
+
+def identify(item):
+    """
+    Returns the specified item along with the process and thread that
+    received it.
+
+    :param item: The item to identify.
+    :return: A tuple of the item, process identifier, and thread
+    identifier.
+    """
+    return item, os.getpid(), threading.get_ident()
+
+
+class TestCreateExecutor:
+    """
+    Test suite for :function: 'create_executor'.
+    """
+
+    @pytest.mark.parametrize("executor", ["hybrid", "process", "thread"])
+    def test_create_executor_maps_in_order(self, executor):
+        with create_executor(executor, 2, threads=3) as pool:
+            mapped = pool.map(identify, range(50))
+            imapped = list(pool.imap(identify, range(50)))
+
+        assert [item for item, _, _ in mapped] == list(range(50))
+        assert [item for item, _, _ in imapped] == list(range(50))
+
+    @pytest.mark.parametrize("executor", ["hybrid", "process", "thread"])
+    def test_create_executor_applies_unordered(self, executor):
+        with create_executor(executor, 2, threads=2) as pool:
+            results = pool.imap_unordered(identify, range(9))
+            items = sorted(item for item, _, _ in results)
+
+            assert pool.apply(identify, (9,))[0] == 9
+
+        assert items == list(range(9))
+
+    def test_create_executor_shares_thread_state(self):
+        calls = []
+
+        pool = create_executor("thread", 4, initializer=calls.append,
+                               initargs=("init",),
+                               finalizer=lambda: calls.append("finish"))
+
+        with pool:
+            results = pool.map(identify, range(20))
+
+            assert calls == ["init"]
+
+            pool.close()
+            pool.join()
+
+        assert calls == ["init", "finish"]
+        assert {pid for _, pid, _ in results} == {os.getpid()}
+
+    def test_create_executor_runs_hybrid_threads(self):
+        with create_executor("hybrid", 1, threads=2) as pool:
+            results = pool.map(identify, range(8), chunksize=2)
+
+        assert len({pid for _, pid, _ in results}) == 1
+        assert os.getpid() not in {pid for _, pid, _ in results}
+
+    def test_create_executor_rejects_unknown(self):
+        with pytest.raises(ValueError):
+            create_executor("fiber", 2)
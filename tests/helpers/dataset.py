@@ -1,13 +1,20 @@
 """
 Contains helper functions related to creating randomized datasets for testing.
 """
+import io
 import string
 from functools import partial
 
 import numpy as np
+import pandas as pd
 import pytest
+from PIL import Image
 from pydicom import Dataset, Sequence
-from pydicom.uid import generate_uid, PYDICOM_ROOT_UID
+from pydicom.dataset import FileDataset, FileMetaDataset
+from pydicom.encaps import encapsulate
+from pydicom.uid import generate_uid, PYDICOM_ROOT_UID, ExplicitVRBigEndian, \
+    ExplicitVRLittleEndian, ImplicitVRLittleEndian, JPEG2000Lossless, \
+    JPEGBaseline8Bit, SecondaryCaptureImageStorage
 
 
 def create_random_string(n=20):
@@ -133,3 +140,131 @@ def create_dataset():
         return ds
 
     return create_dataset_impl
+
+
+@pytest.fixture(scope="function")
+def create_dicom_file(tmp_path):
+    """
+    Returns a factory function to write a DICOM file containing randomized
+    (raw) pixel data to a temporary directory.
+
+    :param tmp_path: The temporary directory to write to.
+    :return: A factory function to create a DICOM file on disk.
+    """
+    def create_dicom_file_impl(name="image.dcm", cols=64, rows=48,
+                               syntax=ExplicitVRLittleEndian, signed=False,
+                               bits_stored=12, samples=1):
+        """
+        Creates a DICOM file with randomized pixel data of the specified
+        dimensions and encoding.
+
+        Grayscale pixel data may also be compressed with either baseline
+        JPEG (8-bit only) or lossless JPEG 2000.
+
+        :param name: The name of the file to create.
+        :param cols: The number of columns (width) of the image.
+        :param rows: The number of rows (height) of the image.
+        :param syntax: The transfer syntax to encode the file with.
+        :param signed: Whether or not the pixel data is signed.
+        :param bits_stored: The number of bits used per pixel.
+        :param samples: The number of samples per pixel.
+        :return: The path to the DICOM file and its pixel data as a pair.
+        """
+        file_path = str(tmp_path / name)
+        shape = (rows, cols) if samples == 1 else (rows, cols, samples)
+        low = -2 ** (bits_stored - 1) if signed else 0
+        high = 2 ** (bits_stored - 1) if signed else 2 ** bits_stored
+        dtype = np.int16 if signed else np.uint16
+
+        if bits_stored <= 8:
+            dtype = np.int8 if signed else np.uint8
+
+        if samples > 1:
+            low, high, dtype = 0, 256, np.uint8
+
+        arr = np.random.randint(low, high, shape).astype(dtype)
+
+        meta = FileMetaDataset()
+        meta.MediaStorageSOPClassUID = SecondaryCaptureImageStorage
+        meta.MediaStorageSOPInstanceUID = generate_uid()
+        meta.TransferSyntaxUID = syntax
+
+        ds = FileDataset(file_path, {}, file_meta=meta, preamble=b"\0" * 128)
+
+        ds.is_little_endian = syntax != ExplicitVRBigEndian
+        ds.is_implicit_VR = syntax == ImplicitVRLittleEndian
+
+        ds.SOPClassUID = meta.MediaStorageSOPClassUID
+        ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+        ds.SeriesInstanceUID = generate_uid()
+        ds.StudyInstanceUID = generate_uid()
+
+        ds.BitsAllocated = arr.dtype.itemsize * 8
+        ds.BitsStored = bits_stored if samples == 1 else 8
+        ds.HighBit = ds.BitsStored - 1
+        ds.Columns = cols
+        ds.Rows = rows
+        ds.PhotometricInterpretation = "MONOCHROME2" if samples == 1 else \
+            "RGB"
+        ds.PixelRepresentation = 1 if signed else 0
+        ds.SamplesPerPixel = samples
+
+        if samples > 1:
+            ds.PlanarConfiguration = 0
+
+        if syntax in [JPEG2000Lossless, JPEGBaseline8Bit]:
+            stream = io.BytesIO()
+
+            if syntax == JPEGBaseline8Bit:
+                Image.fromarray(arr).save(stream, "JPEG", quality=95)
+            else:
+                Image.fromarray(arr).save(stream, "JPEG2000", no_jp2=True,
+                                          num_resolutions=6)
+
+            ds.PixelData = encapsulate([stream.getvalue()])
+            ds["PixelData"].is_undefined_length = True
+        else:
+            byte_order = ">" if syntax == ExplicitVRBigEndian else "<"
+            ds.PixelData = arr.astype(
+                arr.dtype.newbyteorder(byte_order)).tobytes()
+
+        ds.save_as(file_path, write_like_original=False)
+
+        return file_path, arr
+
+    return create_dicom_file_impl
+
+
+@pytest.fixture(scope="function")
+def create_entry(create_dicom_file):
+    """
+    Returns a factory function to create a minimal DICOM database entry
+    backed by a DICOM file on disk.
+
+    :param create_dicom_file: The factory used to create DICOM files.
+    :return: A factory function to create a database entry.
+    """
+    def create_entry_impl(cols=64, rows=48, annotations=None,
+                          classification=0):
+        """
+        Creates a minimal DICOM database entry with no scaling or windowing.
+
+        :param cols: The number of columns (width) of the image.
+        :param rows: The number of rows (height) of the image.
+        :param annotations: The collection of annotations (optional).
+        :param classification: The classification of the image.
+        :return: A database entry.
+        """
+        file_path, _ = create_dicom_file(cols=cols, rows=rows)
+
+        return pd.Series({
+            "File Path": file_path,
+            "Width": cols,
+            "Height": rows,
+            "Scaling": False,
+            "Windowing": False,
+            "Annotation": annotations or [],
+            "Classification": classification
+        })
+
+    return create_entry_impl
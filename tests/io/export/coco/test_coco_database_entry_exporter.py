@@ -0,0 +1,112 @@
+"""
+Contains unit tests to ensure that database entries are exported to images
+and a single COCO annotation document.
+"""
+import json
+import os
+
+from breakdb.action import collect_records
+from breakdb.io import get_entry_exporter
+from breakdb.io.export import ExportTarget, export_targets
+
+
+class TestCOCODatabaseEntryExporter:
+    """
+    Test suite for :class: 'COCODatabaseEntryExporter'.
+    """
+
+    def test_coco_database_entry_exporter_writes_document(self, create_entry,
+                                                          tmp_path,
+                                                          disable_logging):
+        exporter = get_entry_exporter("coco")
+        target = ExportTarget(exporter, str(tmp_path), 32, 32, "png")
+        entries = [
+            create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24],
+                                  [0, 0, 16, 0, 16, 16, 0, 16]], 1),
+            create_entry(64, 48, [], 0),
+            create_entry(64, 48, [[8, 8, 24, 8, 24, 40, 8, 40]], 1)
+        ]
+        entries[1]["File Path"] = entries[1]["File Path"] + ".missing"
+        names = ["0", "1", "2"]
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        results = [
+            export_targets((ds, name), [target], skip_broken=True)
+            for ds, name in zip(entries, names)
+        ]
+
+        collect_records(results, names, [target])
+
+        assert results[0][0] == (
+            exporter.get_image_path(target.base_dir, "0", "png"), 1
+        )
+
+        exporter.write_index(target.base_dir,
+                             [name for name, result in zip(names, results)
+                              if result[0]], target.image_format)
+
+        with open(tmp_path / "annotations" / "instances.json") as f:
+            document = json.load(f)
+
+        assert document["images"] == [
+            {"id": 1, "file_name": "0.png", "width": 32, "height": 32},
+            {"id": 2, "file_name": "2.png", "width": 32, "height": 32}
+        ]
+        assert [annotation["id"] for annotation in
+                document["annotations"]] == [1, 2, 3]
+        assert [annotation["image_id"] for annotation in
+                document["annotations"]] == [1, 1, 2]
+        assert [annotation["category_id"] for annotation in
+                document["annotations"]] == [1, 1, 1]
+        assert [annotation["bbox"] for annotation in
+                document["annotations"]] == [[4, 8, 16, 8], [0, 4, 8, 8],
+                                             [4, 8, 8, 16]]
+        assert [annotation["area"] for annotation in
+                document["annotations"]] == [128, 64, 128]
+        assert document["categories"] == [{"id": 0, "name": "negative"},
+                                          {"id": 1, "name": "positive"}]
+
+        assert os.path.exists(tmp_path / "images" / "2.png")
+        assert not exporter.records
+
+    def test_coco_database_entry_exporter_keeps_targets_apart(self,
+                                                              create_entry,
+                                                              tmp_path):
+        exporter = get_entry_exporter("coco")
+        targets = [ExportTarget(exporter, str(tmp_path / str(size)), size,
+                                size, "png") for size in [32, 16]]
+        entries = [create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], 1),
+                   create_entry(64, 48, [[8, 8, 24, 8, 24, 40, 8, 40]], 0)]
+        names = ["0", "1"]
+
+        for target in targets:
+            exporter.create_directory_structure(target.base_dir)
+            exporter.begin_run(target, None)
+
+        results = [export_targets((ds, name), targets)
+                   for ds, name in zip(entries, names)]
+
+        collect_records(results, names, targets)
+
+        for target in targets:
+            exporter.write_index(target.base_dir, names, target.image_format)
+
+        for size in [32, 16]:
+            with open(tmp_path / str(size) / "annotations" /
+                      "instances.json") as f:
+                document = json.load(f)
+
+            # Images keep their aspect ratio and are padded vertically.
+            scale = size / 64
+            pad = (size - 48 * scale) / 2
+
+            assert [(image["width"], image["height"]) for image in
+                    document["images"]] == [(size, size)] * 2
+            assert [annotation["bbox"] for annotation in
+                    document["annotations"]] == [
+                [8 * scale, 8 * scale + pad, 32 * scale, 16 * scale],
+                [8 * scale, 8 * scale + pad, 16 * scale, 32 * scale]
+            ]
+
+        assert not exporter.records
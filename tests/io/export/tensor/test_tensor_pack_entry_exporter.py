@@ -0,0 +1,65 @@
+"""
+Contains unit tests to ensure that database entries are exported directly
+into their slots of a memory-mapped tensor pack.
+"""
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from breakdb.io import get_entry_exporter
+from breakdb.io.export import ExportTarget, export_targets, save_image, \
+    render_image
+
+
+class TestTensorPackEntryExporter:
+    """
+    Test suite for :class: 'TensorPackEntryExporter'.
+    """
+
+    def test_tensor_pack_entry_exporter_packs_entries(self, create_entry,
+                                                      tmp_path,
+                                                      disable_logging):
+        exporter = get_entry_exporter("npy")
+        target = ExportTarget(exporter, str(tmp_path), 32, 32)
+        entries = [
+            create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24],
+                                  [0, 0, 16, 0, 16, 16, 0, 16]], 1),
+            create_entry(64, 48, [], 0),
+            create_entry(64, 48, [[8, 8, 24, 8, 24, 40, 8, 40]], 1)
+        ]
+        entries[1]["File Path"] = entries[1]["File Path"] + ".missing"
+        names = ["0", "1", "2"]
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+        exporter.allocate(target.base_dir, pd.DataFrame(entries), 32, 32)
+
+        results = [
+            export_targets((ds, name), [pickle.loads(pickle.dumps(target))],
+                           skip_broken=True)[0]
+            for ds, name in zip(entries, names)
+        ]
+
+        exporter.write_index(target.base_dir,
+                             [name for name, result in zip(names, results)
+                              if result], target.image_format)
+
+        images = np.load(tmp_path / "images.npy", mmap_mode="r")
+        expected_path = str(tmp_path / "expected.png")
+
+        save_image(render_image(entries[2], [(32, 32)]), expected_path, 32,
+                   32, image_format="png")
+
+        with Image.open(expected_path) as expected:
+            assert np.array_equal(images[2], np.asarray(expected))
+
+        assert images.shape == (3, 32, 32)
+        assert not images[1].any()
+        assert list(np.load(tmp_path / "classes.npy")) == [1, -1, 1]
+        assert list(np.load(tmp_path / "box_offsets.npy")) == [0, 2, 2, 3]
+        assert np.load(tmp_path / "boxes.npy").tolist() == [
+            [4, 8, 20, 16], [0, 4, 8, 12], [4, 8, 12, 24]
+        ]
+        assert not os.path.exists(tmp_path / "labels.part.npy")
@@ -0,0 +1,112 @@
+"""
+Contains unit tests to ensure that images are exported in each supported
+image format with the requested encoder options.
+"""
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from breakdb.io.export import export_image, get_image_extension, \
+    IMAGE_ENCODERS
+
+
+class TestExportImage:
+    """
+    Test suite for :function: 'export_image'.
+    """
+
+    @pytest.mark.parametrize("image_format,mode", [("jpeg", "L"),
+                                                   ("png", "L"),
+                                                   ("png16", "I;16"),
+                                                   ("webp", "L")])
+    def test_export_image_saves_each_format(self, create_entry, tmp_path,
+                                            image_format, mode):
+        ds = create_entry()
+        file_path = str(tmp_path / "image") + get_image_extension(image_format)
+
+        dims, _ = export_image(ds, file_path, 32, 24,
+                               image_format=image_format)
+
+        with Image.open(file_path) as image:
+            assert image.format == IMAGE_ENCODERS[image_format][0]
+            assert image.mode in [mode, "RGB"]
+            assert image.size == (32, 24)
+
+        assert dims == (32, 24, "L")
+
+    def test_export_image_saves_lossless_formats_equally(self, create_entry,
+                                                         tmp_path):
+        ds = create_entry()
+        results = []
+
+        for image_format in ["png", "png16", "webp"]:
+            file_path = str(tmp_path / image_format) + \
+                get_image_extension(image_format)
+
+            export_image(ds, file_path, image_format=image_format)
+
+            with Image.open(file_path) as image:
+                results.append(np.asarray(image.convert("L")
+                                          if image.mode == "RGB" else image))
+
+        assert np.array_equal(results[0], results[2])
+        assert np.abs((results[1] >> 8).astype(int) -
+                      results[0].astype(int)).max() <= 1
+
+    def test_export_image_applies_encoder_options(self, create_entry,
+                                                  tmp_path):
+        ds = create_entry(256, 256)
+        large_path = str(tmp_path / "large.jpg")
+        small_path = str(tmp_path / "small.jpg")
+
+        export_image(ds, large_path, encoder_options={"quality": 95})
+        export_image(ds, small_path, encoder_options={"quality": 10})
+
+        assert os.path.getsize(large_path) > os.path.getsize(small_path)
+
+    def test_export_image_raises_with_unknown_format(self, create_entry,
+                                                     tmp_path):
+        with pytest.raises(KeyError):
+            export_image(create_entry(), str(tmp_path / "image.tiff"),
+                         image_format="tiff")
+
+    def test_export_image_stacks_windows_as_channels(self, create_entry,
+                                                     tmp_path):
+        ds = create_entry()
+        file_path = str(tmp_path / "image.png")
+        windows = [(3000.0, 400.0), (1500.0, 1500.0), None]
+
+        dims, _ = export_image(ds, file_path, image_format="png",
+                               windows=windows)
+
+        with Image.open(file_path) as image:
+            assert image.mode == "RGB"
+            channels = [np.asarray(band) for band in image.split()]
+
+        full_path = str(tmp_path / "full.png")
+
+        export_image(ds, full_path, image_format="png")
+
+        with Image.open(full_path) as image:
+            assert np.array_equal(channels[2], np.asarray(image))
+
+        assert dims == (64, 48, "RGB")
+        assert not np.array_equal(channels[0], channels[1])
+
+    def test_export_image_renders_single_window_as_grayscale(self,
+                                                             create_entry,
+                                                             tmp_path):
+        file_path = str(tmp_path / "image.png")
+
+        dims, _ = export_image(create_entry(), file_path, image_format="png",
+                               windows=[(2048.0, 1024.0)])
+
+        assert dims == (64, 48, "L")
+
+    def test_export_image_raises_with_two_windows(self, create_entry,
+                                                  tmp_path):
+        with pytest.raises(ValueError):
+            export_image(create_entry(), str(tmp_path / "image.png"),
+                         image_format="png", windows=[None, None])
@@ -0,0 +1,111 @@
+"""
+Contains unit tests to ensure that export manifests correctly track which
+database entries are up to date.
+"""
+import pytest
+
+from breakdb.io.export.manifest import ExportManifest
+
+
+@pytest.fixture(scope="function")
+def create_manifest(tmp_path):
+    """
+    Returns a factory function to create an export manifest with a single
+    recorded entry whose files exist in a temporary directory.
+
+    :param tmp_path: The temporary directory to use.
+    :return: A factory function to create an export manifest.
+    """
+    def create_manifest_impl(entry_id="1.2.3"):
+        """
+        Creates an export manifest that records one exported entry with the
+        specified identifier.
+
+        :param entry_id: The identifier of the entry to record.
+        :return: A pair containing the export manifest and the files of the
+        recorded entry.
+        """
+        files = [str(tmp_path / f"{entry_id}.jpg"),
+                 str(tmp_path / f"{entry_id}.xml")]
+
+        for file_path in files:
+            with open(file_path, "w") as f:
+                f.write(entry_id)
+
+        manifest = ExportManifest(str(tmp_path / "manifest.jsonl"))
+
+        with manifest:
+            manifest.record(entry_id, "entry", "params", files,
+                            [(files[1], 1)])
+
+        return manifest, files
+
+    return create_manifest_impl
+
+
+class TestExportManifest:
+    """
+    Test suite for :class: 'ExportManifest'.
+    """
+
+    def test_export_manifest_is_current_after_reload(self, create_manifest):
+        manifest, files = create_manifest()
+        reloaded = ExportManifest(manifest.file_path)
+
+        assert reloaded.load() == 1
+        assert reloaded.is_current("1.2.3", "entry", "params")
+        assert reloaded.get_results("1.2.3") == [(files[1], 1)]
+
+    @pytest.mark.parametrize("entry_id,entry_hash,params_hash", [
+        ("1.2.4", "entry", "params"),
+        ("1.2.3", "changed", "params"),
+        ("1.2.3", "entry", "changed")
+    ])
+    def test_export_manifest_is_not_current_when_changed(self,
+                                                         create_manifest,
+                                                         entry_id,
+                                                         entry_hash,
+                                                         params_hash):
+        manifest, _ = create_manifest()
+
+        assert not manifest.is_current(entry_id, entry_hash, params_hash)
+
+    def test_export_manifest_is_not_current_with_missing_files(
+            self, create_manifest, tmp_path):
+        manifest, files = create_manifest()
+
+        (tmp_path / files[0]).unlink()
+
+        assert not manifest.is_current("1.2.3", "entry", "params")
+
+    def test_export_manifest_ignores_truncated_records(self, create_manifest,
+                                                       disable_logging):
+        manifest, _ = create_manifest()
+
+        with open(manifest.file_path, "a") as f:
+            f.write('{"ID": "1.2.4", "Hash": "ent')
+
+        assert ExportManifest(manifest.file_path).load() == 1
+
+    def test_export_manifest_removes_files(self, create_manifest, tmp_path):
+        manifest, files = create_manifest()
+
+        manifest.remove("1.2.3")
+        manifest.compact()
+
+        assert not any((tmp_path / file_path).exists() for file_path in files)
+        assert ExportManifest(manifest.file_path).load() == 0
+
+    def test_export_manifest_keeps_latest_record(self, create_manifest):
+        manifest, files = create_manifest()
+
+        with manifest:
+            manifest.record("1.2.3", "updated", "params", files,
+                            [(files[1], 0)])
+
+        reloaded = ExportManifest(manifest.file_path)
+
+        assert reloaded.load() == 1
+        assert reloaded.is_current("1.2.3", "updated", "params")
+        assert reloaded.get_results("1.2.3") == [(files[1], 0)]
+
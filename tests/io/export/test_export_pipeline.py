@@ -0,0 +1,95 @@
+"""
+Contains unit tests to ensure that items pass through every stage of an
+export pipeline, in order, and that the time spent by each stage is
+recorded.
+"""
+import threading
+
+import pytest
+
+from breakdb.io.export.pipeline import ExportPipeline
+
+
+class TestExportPipeline:
+    """
+    Test suite for :class: 'ExportPipeline'.
+    """
+
+    def test_export_pipeline_applies_stages(self):
+        stages = [("add", lambda item: item + 1, 3),
+                  ("double", lambda item: item * 2, 1)]
+
+        with ExportPipeline(stages) as pipeline:
+            futures = [pipeline.submit(item) for item in range(20)]
+
+        assert [future.result() for future in futures] == \
+            [(item + 1) * 2 for item in range(20)]
+
+        stats = pipeline.get_statistics()
+
+        assert list(stats) == ["add", "double"]
+        assert [counts[0] for counts in stats.values()] == [20, 20]
+        assert stats["add"][3] == pytest.approx(3 * stats["double"][3])
+
+    def test_export_pipeline_pops_statistics(self):
+        with ExportPipeline([("add", lambda item: item + 1, 2)]) as pipeline:
+            first = [pipeline.submit(item) for item in range(3)]
+
+            assert [future.result() for future in first] == [1, 2, 3]
+            assert pipeline.pop_statistics()["add"][0] == 3
+
+            second = [pipeline.submit(item) for item in range(5)]
+
+            assert [future.result() for future in second] == [1, 2, 3, 4, 5]
+            assert pipeline.pop_statistics()["add"][0] == 5
+
+        assert pipeline.pop_statistics()["add"][0] == 0
+        assert pipeline.get_statistics()["add"][0] == 8
+
+    def test_export_pipeline_fails_items(self):
+        def check(item):
+            if item == 2:
+                raise ValueError("Broken item.")
+
+            return item
+
+        calls = []
+        stages = [("check", check, 1),
+                  ("record", lambda item: calls.append(item) or item, 1)]
+
+        with ExportPipeline(stages) as pipeline:
+            futures = [pipeline.submit(item) for item in range(4)]
+
+        with pytest.raises(ValueError):
+            futures[2].result()
+
+        assert [futures[item].result() for item in [0, 1, 3]] == [0, 1, 3]
+        assert calls == [0, 1, 3]
+
+    def test_export_pipeline_bounds_queues(self):
+        release = threading.Event()
+        submitted = []
+
+        def submit_all(pipeline):
+            for item in range(4):
+                pipeline.submit(item)
+                submitted.append(item)
+
+        with ExportPipeline([("wait", lambda _: release.wait(), 1)],
+                            queue_size=2) as pipeline:
+            submitter = threading.Thread(target=submit_all,
+                                         args=(pipeline,))
+            submitter.start()
+            submitter.join(0.2)
+
+            # One item is being processed and two are waiting.
+            assert submitted == [0, 1, 2]
+
+            release.set()
+            submitter.join()
+
+        assert submitted == [0, 1, 2, 3]
+
+    def test_export_pipeline_requires_threads(self):
+        with pytest.raises(ValueError):
+            ExportPipeline([("none", lambda item: item, 0)])
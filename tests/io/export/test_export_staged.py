@@ -0,0 +1,108 @@
+"""
+Contains unit tests to ensure that database entries exported through a
+pipeline of stages are exported exactly as they would be otherwise.
+"""
+import os
+
+import pytest
+
+from breakdb.io import get_entry_exporter
+from breakdb.io.export import ExportEntryFormatError, ExportTarget, \
+    create_export_pipeline, export_staged, export_targets, STAGE_NAMES
+
+
+class TestExportStaged:
+    """
+    Test suite for :function: 'export_staged'.
+    """
+
+    def test_export_staged_matches_export_targets(self, create_entry,
+                                                  tmp_path):
+        entries = [
+            (create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], index % 2),
+             str(index))
+            for index in range(6)
+        ]
+        targets = {}
+
+        for name in ["staged", "direct"]:
+            exporter = get_entry_exporter("yolov3")
+            targets[name] = [ExportTarget(exporter, str(tmp_path / name),
+                                          32, 24)]
+
+            exporter.create_directory_structure(str(tmp_path / name))
+
+        with create_export_pipeline([2, 1, 1, 2]) as staged:
+            results, stats = export_staged(entries, targets["staged"],
+                                           staged)
+        expected = [export_targets(entry, targets["direct"])
+                    for entry in entries]
+
+        assert list(stats) == STAGE_NAMES
+        assert all(counts[0] == len(entries) for counts in stats.values())
+
+        for result, expected_result in zip(results, expected):
+            (path, classification), = result
+            (expected_path, expected_classification), = expected_result
+
+            assert os.path.relpath(path, tmp_path / "staged") == \
+                os.path.relpath(expected_path, tmp_path / "direct")
+            assert classification == expected_classification
+
+        for entry_name in [name for _, name in entries]:
+            paths = [
+                target.exporter.get_image_path(target.base_dir, entry_name,
+                                               target.image_format)
+                for target in targets["staged"] + targets["direct"]
+            ]
+
+            with open(paths[0], "rb") as staged, \
+                    open(paths[1], "rb") as direct:
+                assert staged.read() == direct.read()
+
+    def test_export_staged_skips_broken(self, create_entry, tmp_path,
+                                        disable_logging):
+        exporter = get_entry_exporter("voc")
+        target = ExportTarget(exporter, str(tmp_path), 32, 24)
+        broken = create_entry()
+        broken["File Path"] = broken["File Path"] + ".missing"
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        with create_export_pipeline([1, 1, 1, 1]) as staged:
+            results, _ = export_staged([(create_entry(), "0"),
+                                        (broken, "1"),
+                                        (create_entry(), "2")], [target],
+                                       staged, skip_broken=True)
+
+        assert [bool(result[0]) for result in results] == [True, False, True]
+
+    def test_export_staged_raises_on_broken(self, create_entry, tmp_path):
+        exporter = get_entry_exporter("voc")
+        target = ExportTarget(exporter, str(tmp_path), 32, 24)
+        broken = create_entry()
+        broken["File Path"] = broken["File Path"] + ".missing"
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        with pytest.raises(ExportEntryFormatError), \
+                create_export_pipeline([1, 1, 1, 1]) as staged:
+            export_staged([(broken, "0")], [target], staged)
+
+    def test_export_staged_shares_pipeline(self, create_entry, tmp_path):
+        exporter = get_entry_exporter("voc")
+        target = ExportTarget(exporter, str(tmp_path), 32, 24)
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        with create_export_pipeline([1, 2, 1, 1]) as staged:
+            stats_list = [
+                export_staged([(create_entry(), str(index))
+                               for index in range(start, start + 3)],
+                              [target], staged)[1]
+                for start in [0, 3]
+            ]
+
+        assert [[counts[0] for counts in stats.values()]
+                for stats in stats_list] == [[3] * 4, [3] * 4]
+        assert len(os.listdir(tmp_path / "JPEGImages")) == 6
@@ -0,0 +1,189 @@
+"""
+Contains unit tests to ensure that a database entry is exported to several
+export targets from a single decode.
+"""
+import copy
+import os
+
+import pytest
+from PIL import Image
+
+from breakdb.io import get_entry_exporter
+from breakdb.io.export import ExportEntryFormatError, ExportTarget, \
+    export_targets, get_fan_out_name
+from breakdb.io.image import pop_decode_statistics
+
+
+@pytest.fixture(scope="function")
+def create_targets(tmp_path):
+    """
+    Returns a factory function to create export targets, along with their
+    directory structures, in a temporary directory.
+
+    :param tmp_path: The temporary directory to export to.
+    :return: A factory function to create export targets.
+    """
+    def create_targets_impl(*specs):
+        """
+        Creates an export target for each of the specified format type,
+        width, height, and image format combinations.
+
+        :param specs: A collection of export target specifications.
+        :return: A list of export targets.
+        """
+        targets = []
+
+        for export_type, width, height, image_format in specs:
+            exporter = get_entry_exporter(export_type)
+            base_dir = str(tmp_path / f"{export_type}-{width}x{height}")
+
+            exporter.create_directory_structure(base_dir)
+            targets.append(ExportTarget(exporter, base_dir, width, height,
+                                        image_format))
+
+        return targets
+
+    return create_targets_impl
+
+
+class TestExportTargets:
+    """
+    Test suite for :function: 'export_targets'.
+    """
+
+    def test_export_targets_exports_each_target(self, create_entry,
+                                                create_targets):
+        ds = create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], 1)
+        targets = create_targets(("voc", 32, 24, "jpeg"),
+                                 ("yolov3", 16, 12, "png16"),
+                                 ("voc", 64, 48, "webp"))
+
+        results = export_targets((ds, "entry"), targets)
+
+        assert len(results) == len(targets)
+
+        for target, (annotation_path, classification) in zip(targets,
+                                                             results):
+            image_path = target.exporter.get_image_path(target.base_dir,
+                                                        "entry",
+                                                        target.image_format)
+
+            assert os.path.exists(annotation_path)
+            assert classification == 1
+
+            with Image.open(image_path) as image:
+                assert image.size == (target.target_width,
+                                      target.target_height)
+
+    def test_export_targets_decodes_once(self, create_entry,
+                                         create_targets):
+        ds = create_entry()
+        targets = create_targets(("voc", 32, 24, "jpeg"),
+                                 ("voc", 16, 12, "png"),
+                                 ("yolov3", 64, 48, "png16"))
+
+        pop_decode_statistics()
+        export_targets((ds, "entry"), targets)
+
+        stats = pop_decode_statistics()
+
+        assert sum(images for images, _, _ in stats.values()) == 1
+
+    def test_export_targets_transforms_annotations_per_target(
+            self, create_entry, create_targets):
+        annotations = [[8, 8, 40, 8, 40, 24, 8, 24]]
+        ds = create_entry(64, 48, copy.deepcopy(annotations), 1)
+        targets = create_targets(("yolov3", 32, 24, "jpeg"),
+                                 ("yolov3", 16, 12, "jpeg"))
+
+        results = export_targets((ds, "entry"), targets)
+
+        for annotation_path, _ in results:
+            with open(annotation_path) as f:
+                values = [float(value) for value in f.read().split()]
+
+            assert values == pytest.approx([1, 0.375, 1 / 3, 0.5, 1 / 3])
+
+        assert ds["Annotation"] == annotations
+
+    def test_export_targets_exports_labels_only(self, create_entry,
+                                                create_targets):
+        ds = create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], 1)
+        targets = create_targets(("voc", 32, 32, "jpeg"),
+                                 ("yolov3", 16, 12, "png"))
+
+        expected = []
+
+        for annotation_path, _ in export_targets((ds, "full"), targets,
+                                                 keep_aspect_ratio=True):
+            with open(annotation_path) as f:
+                expected.append(f.read().replace("full", "entry"))
+
+        pop_decode_statistics()
+        results = export_targets((ds, "entry"), targets,
+                                 keep_aspect_ratio=True, labels_only=True)
+
+        for (annotation_path, _), text in zip(results, expected):
+            with open(annotation_path) as f:
+                assert f.read() == text
+
+        for target in targets:
+            assert not os.path.exists(
+                target.exporter.get_image_path(target.base_dir, "entry",
+                                               target.image_format)
+            )
+
+        assert not pop_decode_statistics()
+
+    def test_export_targets_fans_out(self, create_entry, create_targets):
+        ds = create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], 1)
+        targets = create_targets(("voc", 32, 24, "jpeg"),
+                                 ("yolov3", 16, 12, "png"))
+
+        for target in targets:
+            target.fan_out = 2
+
+        results = export_targets((ds, "entry"), targets)
+        name = get_fan_out_name("entry", 2)
+
+        for target, (annotation_path, _) in zip(targets, results):
+            target.exporter.write_index(target.base_dir, [name],
+                                        target.image_format)
+
+            image_path = target.exporter.get_image_path(target.base_dir,
+                                                        name,
+                                                        target.image_format)
+
+            assert annotation_path == \
+                target.exporter.get_annotation_path(target.base_dir, name)
+            assert os.path.exists(annotation_path)
+            assert os.path.exists(image_path)
+
+        with open(os.path.join(targets[0].base_dir, "ImageSets", "Main",
+                               "trainval.txt")) as f:
+            assert f.read().split() == [name.replace(os.sep, "/")]
+
+        with open(os.path.join(targets[1].base_dir, "images.txt")) as f:
+            assert f.read().split() == [
+                targets[1].exporter.get_image_path(targets[1].base_dir, name,
+                                                   "png")
+            ]
+
+    def test_export_targets_skips_broken(self, create_entry, create_targets,
+                                         disable_logging):
+        ds = create_entry()
+        ds["File Path"] = ds["File Path"] + ".missing"
+        targets = create_targets(("voc", 32, 24, "jpeg"),
+                                 ("yolov3", 16, 12, "jpeg"))
+
+        assert export_targets((ds, "entry"), targets,
+                              skip_broken=True) == [(), ()]
+
+    def test_export_targets_raises_on_broken(self, create_entry,
+                                             create_targets):
+        ds = create_entry()
+        ds["File Path"] = ds["File Path"] + ".missing"
+        targets = create_targets(("voc", 32, 24, "jpeg"))
+
+        with pytest.raises(ExportEntryFormatError):
+            export_targets((ds, "entry"), targets)
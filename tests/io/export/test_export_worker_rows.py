@@ -0,0 +1,65 @@
+"""
+Contains unit tests to ensure that worker processes export entries of their
+own copy of a database by row position alone.
+"""
+import os
+
+import pandas as pd
+
+from breakdb.io import get_entry_exporter
+from breakdb.io.export import ExportTarget, create_export_pipeline, \
+    export_worker_rows, finalize_worker, initialize_worker
+
+
+class TestExportWorkerRows:
+    """
+    Test suite for :function: 'export_worker_rows'.
+    """
+
+    def test_export_worker_rows_exports_rows(self, create_entry, tmp_path):
+        exporter = get_entry_exporter("voc")
+        target = ExportTarget(exporter, str(tmp_path), 32, 32)
+        db = pd.DataFrame([create_entry(64, 48, [], classification)
+                           for classification in [0, 1, 0, 1]])
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+        initialize_worker([target], db)
+
+        try:
+            results, _ = export_worker_rows(range(1, 3))
+        finally:
+            finalize_worker()
+
+        assert results == [
+            [(exporter.get_annotation_path(target.base_dir, "1"), 1)],
+            [(exporter.get_annotation_path(target.base_dir, "2"), 0)]
+        ]
+        assert sorted(os.listdir(tmp_path / "JPEGImages")) == ["1.jpg",
+                                                               "2.jpg"]
+
+    def test_export_worker_rows_keeps_pipeline(self, create_entry, tmp_path,
+                                               monkeypatch):
+        pipelines = []
+        monkeypatch.setattr(
+            "breakdb.io.export.create_export_pipeline",
+            lambda stage_threads: pipelines.append(
+                create_export_pipeline(stage_threads)
+            ) or pipelines[-1]
+        )
+
+        exporter = get_entry_exporter("voc")
+        target = ExportTarget(exporter, str(tmp_path), 32, 32)
+        db = pd.DataFrame([create_entry() for _ in range(4)])
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+        initialize_worker([target], db, stage_threads=[1, 1, 1, 1])
+
+        try:
+            stats_list = [export_worker_rows(rows)[1]["stages"]
+                          for rows in [range(0, 2), range(2, 4)]]
+        finally:
+            finalize_worker()
+
+        assert len(pipelines) == 1
+        assert pipelines[0].stop_time is not None
+        assert [stats["read"][0] for stats in stats_list] == [2, 2]
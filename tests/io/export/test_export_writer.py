@@ -0,0 +1,63 @@
+"""
+Contains unit tests to ensure that rendered entries are saved in the
+background by a bounded number of threads.
+"""
+import threading
+
+import pytest
+
+from breakdb.io import get_entry_exporter
+from breakdb.io.export import ExportTarget, ExportWriter, export_targets
+
+
+class TestExportWriter:
+    """
+    Test suite for :class: 'ExportWriter'.
+    """
+
+    def test_export_writer_bounds_pending(self):
+        release = threading.Event()
+        submitted = []
+
+        def submit_all(writer):
+            for index in range(3):
+                writer.submit(release.wait)
+                submitted.append(index)
+
+        with ExportWriter(threads=1, max_pending=2) as writer:
+            submitter = threading.Thread(target=submit_all, args=(writer,))
+            submitter.start()
+            submitter.join(0.2)
+
+            assert submitted == [0, 1]
+
+            release.set()
+            submitter.join()
+
+        assert submitted == [0, 1, 2]
+
+    def test_export_writer_saves_entries(self, create_entry, tmp_path):
+        exporter = get_entry_exporter("yolov3")
+        target = ExportTarget(exporter, str(tmp_path), 32, 24)
+        entries = [create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], 1),
+                   create_entry(64, 48, [], 0)]
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        with ExportWriter(threads=2) as writer:
+            futures = [
+                export_targets((ds, str(index)), [target], writer=writer)
+                for index, ds in enumerate(entries)
+            ]
+
+            results = [future.result() for future in futures]
+
+        assert results == [
+            [(exporter.get_annotation_path(target.base_dir, "0"), 1)],
+            [(exporter.get_annotation_path(target.base_dir, "1"), 0)]
+        ]
+
+        with open(exporter.get_annotation_path(target.base_dir, "0")) as f:
+            values = [float(value) for value in f.read().split()]
+
+        assert values == pytest.approx([1, 0.375, 1 / 3, 0.5, 1 / 3])
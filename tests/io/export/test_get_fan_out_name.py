@@ -0,0 +1,37 @@
+"""
+Contains unit tests to ensure that entry names are spread over hashed
+subdirectories.
+"""
+import os
+
+from breakdb.io.export import get_fan_out_name
+
+
+class TestGetFanOutName:
+    """
+    Test suite for :function: 'get_fan_out_name'.
+    """
+
+    def test_get_fan_out_name_without_levels(self):
+        assert get_fan_out_name("1.2.3") == "1.2.3"
+        assert get_fan_out_name("1.2.3", 0) == "1.2.3"
+
+    def test_get_fan_out_name_prefixes_levels(self):
+        name = get_fan_out_name("1.2.3", 2)
+        parts = name.split(os.sep)
+
+        assert len(parts) == 3
+        assert parts[-1] == "1.2.3"
+        assert all(len(part) == 2 and int(part, 16) >= 0
+                   for part in parts[:-1])
+
+    def test_get_fan_out_name_is_stable(self):
+        assert get_fan_out_name("1.2.3", 2) == get_fan_out_name("1.2.3", 2)
+        assert get_fan_out_name("1.2.3", 1).split(os.sep)[0] == \
+            get_fan_out_name("1.2.3", 2).split(os.sep)[0]
+
+    def test_get_fan_out_name_spreads_names(self):
+        dirs = set(os.path.dirname(get_fan_out_name(str(index), 1))
+                   for index in range(4096))
+
+        assert len(dirs) == 256
@@ -0,0 +1,22 @@
+"""
+Contains unit tests to ensure that database entries are hashed by all of
+their fields.
+"""
+import pandas as pd
+
+from breakdb.io.export.manifest import hash_entry
+
+
+class TestHashEntry:
+    """
+    Test suite for :function: 'hash_entry'.
+    """
+
+    def test_hash_entry_changes_with_any_field(self):
+        entry = pd.Series({"ID": "1.2.3", "Annotation": [[1, 2, 3, 4]],
+                           "Classification": True})
+        changed = entry.copy()
+        changed["Annotation"] = [[1, 2, 3, 5]]
+
+        assert hash_entry(entry) == hash_entry(entry.copy())
+        assert hash_entry(entry) != hash_entry(changed)
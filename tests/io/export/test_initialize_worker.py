@@ -0,0 +1,108 @@
+"""
+Contains unit tests to ensure that export pool workers prepare and finish
+their exporters exactly once each.
+"""
+import os
+from multiprocessing.pool import Pool
+
+import pandas as pd
+
+from breakdb.executor import create_executor
+from breakdb.io.export import ExportTarget, export_worker_rows, \
+    finalize_worker, initialize_worker
+from breakdb.io.export.yolo import YOLODatabaseEntryExporter
+
+
+class RecordingEntryExporter(YOLODatabaseEntryExporter):
+    """
+    Represents a YOLOv3 exporter that records, in files, which worker
+    processes were prepared and finished, and which exported each entry.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.worker = None
+
+    def finish_worker(self, target):
+        with open(os.path.join(target.base_dir, f"finish-{self.worker}"),
+                  "w"):
+            pass
+
+    def init_worker(self, target):
+        self.worker = os.getpid()
+
+        with open(os.path.join(target.base_dir, f"init-{self.worker}"),
+                  "w"):
+            pass
+
+    def write_annotation(self, ds, name, base_dir, image_path, dims,
+                         transform):
+        with open(os.path.join(base_dir, f"entry-{name}"), "w") as f:
+            print(self.worker, file=f)
+
+        return super().write_annotation(ds, name, base_dir, image_path,
+                                        dims, transform)
+
+
+class TestInitializeWorker:
+    """
+    Test suite for :function: 'initialize_worker'.
+    """
+
+    def test_initialize_worker_prepares_and_finishes_once(self, create_entry,
+                                                          tmp_path):
+        exporter = RecordingEntryExporter()
+        target = ExportTarget(exporter, str(tmp_path), 32, 32)
+        db = pd.DataFrame([create_entry() for _ in range(8)])
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        with Pool(processes=2, initializer=initialize_worker,
+                  initargs=([target], db)) as pool:
+            exported = pool.map(export_worker_rows,
+                                [range(start, start + 2)
+                                 for start in range(0, len(db), 2)], 1)
+
+            pool.close()
+            pool.join()
+
+        files = os.listdir(tmp_path)
+        initialized = {name[5:] for name in files if name.startswith("init-")}
+        finished = {name[7:] for name in files if name.startswith("finish-")}
+
+        for index in range(len(db)):
+            with open(tmp_path / f"entry-{index}") as f:
+                assert f.read().strip() in initialized
+
+        assert all(result for chunk, _ in exported for result in chunk)
+        assert len(initialized) == 2
+        assert finished == initialized
+
+    def test_initialize_worker_leaves_finishing_to_pool(self, create_entry,
+                                                        tmp_path,
+                                                        monkeypatch):
+        registered = []
+        monkeypatch.setattr("breakdb.io.export.Finalize",
+                            lambda *args, **kwargs: registered.append(args))
+
+        exporter = RecordingEntryExporter()
+        target = ExportTarget(exporter, str(tmp_path), 32, 32)
+        db = pd.DataFrame([create_entry() for _ in range(4)])
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        with create_executor("thread", 2, initializer=initialize_worker,
+                             initargs=([target], db, False, 0, None, None,
+                                       False),
+                             finalizer=finalize_worker) as pool:
+            pool.map(export_worker_rows, [range(0, 2), range(2, 4)], 1)
+
+            pool.close()
+            pool.join()
+
+        files = os.listdir(tmp_path)
+
+        assert not registered
+        assert [name for name in files if name.startswith("finish-")] == \
+            [f"finish-{os.getpid()}"]
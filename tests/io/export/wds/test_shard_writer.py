@@ -0,0 +1,60 @@
+"""
+Contains unit tests to ensure that samples are written to tar shards of
+bounded size with an accurate index.
+"""
+import tarfile
+
+from breakdb.io.export.wds import ShardWriter
+
+
+def create_members(key, size):
+    """
+    Creates the members of a sample with an image of the specified size.
+
+    :param key: The key of the sample.
+    :param size: The size of the image, in bytes.
+    :return: A dictionary of file extensions to file contents.
+    """
+    return {"jpg": bytes(size), "cls": b"1", "json": f'"{key}"'.encode()}
+
+
+class TestShardWriter:
+    """
+    Test suite for :class: 'ShardWriter'.
+    """
+
+    def test_shard_writer_groups_sample_members(self, tmp_path):
+        with ShardWriter(str(tmp_path), "shard") as writer:
+            writer.write("00", create_members("00", 100))
+            writer.write("01", create_members("01", 100))
+
+        with tarfile.open(tmp_path / "shard-000000.tar") as tar:
+            assert tar.getnames() == ["00.jpg", "00.cls", "00.json",
+                                      "01.jpg", "01.cls", "01.json"]
+            assert tar.extractfile("01.json").read() == b'"01"'
+
+    def test_shard_writer_rolls_over_shards(self, tmp_path):
+        with ShardWriter(str(tmp_path), "shard", 8192) as writer:
+            for index in range(5):
+                writer.write(f"{index:02d}", create_members(index, 2048))
+
+        shards = sorted(path.name for path in tmp_path.glob("*.tar"))
+
+        assert shards == ["shard-000000.tar", "shard-000001.tar",
+                          "shard-000002.tar"]
+        assert [shard for _, shard, _, _ in writer.index] == \
+            [shards[0], shards[0], shards[1], shards[1], shards[2]]
+
+    def test_shard_writer_indexes_offsets(self, tmp_path):
+        with ShardWriter(str(tmp_path), "shard") as writer:
+            for index in range(3):
+                writer.write(f"{index:02d}", create_members(index, 700))
+
+        for key, shard, offset, size in writer.index:
+            with open(tmp_path / shard, "rb") as f:
+                f.seek(offset)
+
+                with tarfile.open(fileobj=f) as tar:
+                    assert tar.next().name == f"{key}.jpg"
+
+            assert size == 3 * 512 + 1024 + 512 + 512
@@ -0,0 +1,55 @@
+"""
+Contains unit tests to ensure that samples exported to a WebDataset target
+are written to tar shards by dedicated writer processes and indexed.
+"""
+import json
+import tarfile
+
+import pandas as pd
+
+from breakdb.io import get_entry_exporter
+from breakdb.io.export import ExportTarget, export_targets
+from breakdb.io.export.wds import ShardWriterGroup
+
+
+class TestShardWriterGroup:
+    """
+    Test suite for :class: 'ShardWriterGroup'.
+    """
+
+    def test_shard_writer_group_writes_exported_samples(self, create_entry,
+                                                        tmp_path):
+        exporter = get_entry_exporter("wds")
+        target = ExportTarget(exporter, str(tmp_path), 32, 24)
+        names = [f"{index:02d}" for index in range(5)]
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+
+        with ShardWriterGroup(target.base_dir, processes=2) as writers:
+            for name in names:
+                ds = create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], 1)
+                (key, classification, members), = export_targets(
+                    (ds, name), [target]
+                )
+
+                assert (key, classification) == (name, 1)
+
+                writers.write(key, members)
+
+        exporter.write_index(target.base_dir, names, target.image_format)
+
+        index = pd.read_csv(tmp_path / "index.csv", dtype={"Key": str})
+
+        assert list(index["Key"]) == names
+        assert sorted(set(index["Shard"])) == ["shard-00-000000.tar",
+                                               "shard-01-000000.tar"]
+        assert not list(tmp_path.glob("*.part"))
+
+        with tarfile.open(tmp_path / index["Shard"][3]) as tar:
+            metadata = json.load(tar.extractfile("03.json"))
+
+            assert tar.extractfile("03.cls").read() == b"1"
+            assert tar.getmember("03.jpg").size > 0
+
+        assert (metadata["Width"], metadata["Height"]) == (32, 24)
+        assert metadata["Annotation"] == [[4, 4, 20, 4, 20, 12, 4, 12]]
@@ -0,0 +1,68 @@
+"""
+Contains unit tests to ensure that single database entries are exported to
+a complete YOLOv3 dataset.
+"""
+import os
+
+from breakdb.io.export import CLASS_NAMES, ExportTarget, export_targets
+from breakdb.io.export.yolo import YOLODatabaseEntryExporter
+
+
+class TestYOLODatabaseEntryExporter:
+    """
+    Test suite for :class: 'YOLODatabaseEntryExporter'.
+    """
+
+    def test_yolo_database_entry_exporter_writes_class_names(self,
+                                                             create_entry,
+                                                             tmp_path,
+                                                             disable_logging):
+        exporter = YOLODatabaseEntryExporter()
+
+        exporter.create_directory_structure(str(tmp_path), exist_ok=True)
+
+        result = exporter.export((create_entry(), "0"), str(tmp_path), 32, 32)
+
+        with open(tmp_path / "classes.names") as f:
+            assert f.read().split() == CLASS_NAMES
+
+        assert result is not None
+        assert os.path.exists(tmp_path / "images" / "0.jpg")
+
+    def test_yolo_database_entry_exporter_writes_class_names_once(
+            self, create_entry, tmp_path, disable_logging):
+        exporter = YOLODatabaseEntryExporter()
+        target = ExportTarget(exporter, str(tmp_path), 32, 32)
+        class_path = tmp_path / "classes.names"
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+        exporter.begin_run(target, None)
+
+        os.remove(class_path)
+
+        exporter.export((create_entry(), "0"), target.base_dir, 32, 32)
+
+        assert not os.path.exists(class_path)
+
+        exporter.end_run(target)
+        exporter.export((create_entry(), "1"), target.base_dir, 32, 32)
+
+        assert os.path.exists(class_path)
+
+    def test_yolo_database_entry_exporter_removes_stale_labels(self,
+                                                               create_entry,
+                                                               tmp_path):
+        exporter = YOLODatabaseEntryExporter()
+        target = ExportTarget(exporter, str(tmp_path), 32, 32)
+        ds = create_entry(64, 48, [[8, 8, 40, 8, 40, 24, 8, 24]], 1)
+        annotation_path = exporter.get_annotation_path(target.base_dir, "0")
+
+        exporter.create_directory_structure(target.base_dir, exist_ok=True)
+        export_targets((ds, "0"), [target])
+
+        assert os.path.exists(annotation_path)
+
+        ds["Annotation"] = []
+        export_targets((ds, "0"), [target], labels_only=True)
+
+        assert not os.path.exists(annotation_path)
@@ -0,0 +1,47 @@
+"""
+Contains unit tests to ensure that the geometry of formatted images is
+computed without their pixel data.
+"""
+import numpy as np
+import pytest
+
+from breakdb.io.image import compute_image_layout, format_as
+
+
+class TestComputeImageLayout:
+    """
+    Test suite for :function: 'compute_image_layout'.
+    """
+
+    @pytest.mark.parametrize("target_width,target_height", [(None, None),
+                                                            (64, 48),
+                                                            (32, 32),
+                                                            (100, 40),
+                                                            (200, 300)])
+    @pytest.mark.parametrize("keep_aspect_ratio", [False, True])
+    @pytest.mark.parametrize("no_upscale", [False, True])
+    def test_compute_image_layout_matches_format_as(self, target_width,
+                                                    target_height,
+                                                    keep_aspect_ratio,
+                                                    no_upscale):
+        arr = np.random.randint(0, 256, (48, 64)).astype(np.uint8)
+        image, transform = format_as((64, 48, "L"), arr, target_width,
+                                     target_height, keep_aspect_ratio,
+                                     no_upscale)
+
+        _, image_size, expected = compute_image_layout(64, 48, target_width,
+                                                       target_height,
+                                                       keep_aspect_ratio,
+                                                       no_upscale)
+
+        assert image.size == image_size
+        assert transform == expected
+
+    def test_compute_image_layout_centers_resized_image(self):
+        resize_size, image_size, transform = compute_image_layout(
+            64, 48, 32, 32
+        )
+
+        assert resize_size == (32, 24)
+        assert image_size == (32, 32)
+        assert transform == ((0, 4), (0.5, 0.5))
@@ -0,0 +1,22 @@
+"""
+Contains unit tests to ensure that downsampling factors keep images at least
+a multiple of their resize dimensions.
+"""
+from breakdb.io.image import compute_reduction_factor
+
+
+class TestComputeReductionFactor:
+    """
+    Test suite for :function: 'compute_reduction_factor'.
+    """
+
+    def test_compute_reduction_factor_keeps_scaled_dimensions(self):
+        assert compute_reduction_factor(3000, 3000, 416, 416, 2.0) == 3
+        assert compute_reduction_factor(3000, 3000, 416, 416, 1.0) == 7
+
+    def test_compute_reduction_factor_uses_limiting_dimension(self):
+        assert compute_reduction_factor(4000, 1000, 100, 100, 1.0) == 10
+
+    def test_compute_reduction_factor_never_upsamples(self):
+        assert compute_reduction_factor(300, 300, 416, 416, 2.0) == 1
+        assert compute_reduction_factor(416, 416, 416, 416, 1.0) == 1
@@ -0,0 +1,40 @@
+"""
+Contains unit tests to ensure that pixel data is decoded by the first
+preferred pixel data handler that succeeds.
+"""
+import numpy as np
+from pydicom import dcmread
+
+from breakdb.io.image import decode_pixels
+
+
+class TestDecodePixels:
+    """
+    Test suite for :function: 'decode_pixels'.
+    """
+
+    def test_decode_pixels_falls_back_to_next_handler(self, create_dicom_file,
+                                                      monkeypatch):
+        file_path, expected = create_dicom_file()
+        monkeypatch.setattr("breakdb.io.image.select_handlers",
+                            lambda syntax: ("gdcm", "numpy"))
+        monkeypatch.setattr("pydicom.pixel_data_handlers.gdcm_handler."
+                            "is_available", lambda: False)
+
+        arr, handler = decode_pixels(dcmread(file_path))
+
+        assert handler == "numpy"
+        assert np.array_equal(arr, expected)
+
+    def test_decode_pixels_falls_back_to_pydicom(self, create_dicom_file,
+                                                 monkeypatch):
+        file_path, expected = create_dicom_file()
+        monkeypatch.setattr("breakdb.io.image.select_handlers",
+                            lambda syntax: ("gdcm",))
+        monkeypatch.setattr("pydicom.pixel_data_handlers.gdcm_handler."
+                            "is_available", lambda: False)
+
+        arr, handler = decode_pixels(dcmread(file_path))
+
+        assert handler == "pydicom"
+        assert np.array_equal(arr, expected)
@@ -0,0 +1,77 @@
+"""
+Contains unit tests to ensure that compressed (raw) pixel data is decoded at
+a reduced resolution that matches downsampling the full-resolution image.
+"""
+import pytest
+from pydicom import dcmread
+from pydicom.encaps import defragment_data
+from pydicom.uid import ExplicitVRLittleEndian, JPEG2000Lossless, \
+    JPEGBaseline8Bit
+
+from breakdb.io.image import decode_reduced, downsample, get_j2k_levels
+
+
+class TestDecodeReduced:
+    """
+    Test suite for :function: 'decode_reduced'.
+    """
+
+    def test_decode_reduced_is_none_for_uncompressed_data(self,
+                                                          create_dicom_file):
+        file_path, _ = create_dicom_file(syntax=ExplicitVRLittleEndian)
+
+        assert decode_reduced(dcmread(file_path), 4) is None
+
+    @pytest.mark.parametrize("syntax", [JPEG2000Lossless, JPEGBaseline8Bit])
+    def test_decode_reduced_is_none_without_reduction(self, create_dicom_file,
+                                                      syntax):
+        file_path, _ = create_dicom_file(syntax=syntax, bits_stored=8)
+
+        assert decode_reduced(dcmread(file_path), 1) is None
+
+    @pytest.mark.parametrize("syntax,bits_stored", [
+        (JPEG2000Lossless, 8),
+        (JPEG2000Lossless, 12),
+        (JPEG2000Lossless, 16),
+        (JPEGBaseline8Bit, 8)
+    ])
+    @pytest.mark.parametrize("factor,expected", [(2, 2), (3, 2), (4, 4),
+                                                 (7, 4), (8, 8)])
+    def test_decode_reduced_matches_downsampling(self, create_dicom_file,
+                                                 syntax, bits_stored, factor,
+                                                 expected):
+        file_path, _ = create_dicom_file(syntax=syntax, cols=200, rows=160,
+                                         bits_stored=bits_stored)
+        meta = dcmread(file_path)
+
+        arr, scale = decode_reduced(meta, factor)
+        reference = downsample(meta.pixel_array, scale)
+
+        assert scale == expected
+        assert arr.shape == reference.shape
+        assert arr.dtype == reference.dtype
+        assert abs(arr.mean() - reference.mean()) < 0.02 * 2 ** bits_stored
+
+    def test_decode_reduced_is_limited_by_resolution_levels(
+            self, create_dicom_file):
+        file_path, _ = create_dicom_file(syntax=JPEG2000Lossless, cols=256,
+                                         rows=256)
+        meta = dcmread(file_path)
+        levels = get_j2k_levels(defragment_data(meta.PixelData))
+
+        _, scale = decode_reduced(meta, 2 ** (levels + 2))
+
+        assert levels == 5
+        assert scale == 2 ** levels
+
+    @pytest.mark.parametrize("syntax,expected", [(JPEG2000Lossless, 2),
+                                                 (JPEGBaseline8Bit, 8)])
+    def test_decode_reduced_includes_partial_blocks(self, create_dicom_file,
+                                                    syntax, expected):
+        file_path, _ = create_dicom_file(syntax=syntax, cols=203, rows=157,
+                                         bits_stored=8)
+
+        arr, scale = decode_reduced(dcmread(file_path), 8)
+
+        assert scale == expected
+        assert arr.shape == (-(-157 // scale), -(-203 // scale))
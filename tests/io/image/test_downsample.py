@@ -0,0 +1,67 @@
+"""
+Contains unit tests to ensure that pixel data is downsampled by averaging
+blocks of pixels.
+"""
+import numpy as np
+import pytest
+
+from breakdb.io.image import downsample
+
+
+def block_mean(arr, factor):
+    """
+    Computes the mean of each (possibly partial) block of pixels of the
+    specified size.
+
+    :param arr: The collection of pixels to average.
+    :param factor: The block size to use.
+    :return: A collection of block means.
+    """
+    return np.array([[arr[i:i + factor, j:j + factor].reshape(
+        -1, *arr.shape[2:]).mean(axis=0)
+        for j in range(0, arr.shape[1], factor)]
+        for i in range(0, arr.shape[0], factor)])
+
+
+class TestDownsample:
+    """
+    Test suite for :function: 'downsample'.
+    """
+
+    def test_downsample_does_nothing_with_unit_factor(self):
+        arr = np.arange(12, dtype=np.uint16).reshape(3, 4)
+
+        assert downsample(arr, 1) is arr
+
+    @pytest.mark.parametrize("dtype", ["<u2", ">u2", "<i2", ">i2", "u1"])
+    @pytest.mark.parametrize("factor", [2, 3, 4])
+    def test_downsample_averages_blocks(self, dtype, factor):
+        info = np.iinfo(np.dtype(dtype))
+        arr = np.random.randint(info.min, info.max, (13, 17)).astype(dtype)
+
+        result = downsample(arr, factor)
+
+        assert result.shape == (-(-13 // factor), -(-17 // factor))
+        assert result.dtype == np.dtype(dtype).newbyteorder("=")
+        assert np.array_equal(result, np.rint(block_mean(arr, factor)))
+
+    def test_downsample_averages_samples_separately(self):
+        arr = np.random.randint(0, 256, (10, 9, 3)).astype(np.uint8)
+
+        result = downsample(arr, 4)
+
+        assert result.shape == (3, 3, 3)
+        assert np.array_equal(result, np.rint(block_mean(arr, 4)))
+
+    def test_downsample_does_not_overflow(self):
+        arr = np.full((200, 200), 65535, np.uint16)
+
+        assert np.all(downsample(arr, 181) == 65535)
+
+    def test_downsample_preserves_floating_point_data(self):
+        arr = np.random.rand(11, 7).astype(np.float32)
+
+        result = downsample(arr, 3)
+
+        assert result.dtype == np.float32
+        assert np.allclose(result, block_mean(arr, 3))
@@ -0,0 +1,69 @@
+"""
+Contains unit tests to ensure that image data is formatted and resized
+correctly with each resampling option.
+"""
+import numpy as np
+import pytest
+
+from breakdb.io.image import format_as, RESAMPLING_FILTERS
+
+
+def create_image(width=1200, height=900):
+    """
+    Creates a smooth 8-bit test image of the specified dimensions.
+
+    :param width: The width of the image.
+    :param height: The height of the image.
+    :return: An array of 8-bit image data.
+    """
+    y, x = np.mgrid[0:height, 0:width]
+    arr = 127 + 100 * np.sin(x / 40.0) * np.cos(y / 57.0)
+
+    return arr.astype(np.uint8)
+
+
+class TestFormatAs:
+    """
+    Test suite for :function: 'format_as'.
+    """
+
+    @pytest.mark.parametrize("resample", list(RESAMPLING_FILTERS.keys()))
+    def test_format_as_resizes_with_each_filter(self, resample):
+        arr = create_image()
+
+        image, transform = format_as((1200, 900, "L"), arr, 160, 120,
+                                     resample=resample)
+
+        assert image.size == (160, 120)
+        assert transform == ((0.0, 0.0), (160 / 1200, 120 / 900))
+
+    def test_format_as_raises_with_unknown_filter(self):
+        with pytest.raises(KeyError):
+            format_as((1200, 900, "L"), create_image(), 160, 120,
+                      resample="unknown")
+
+    @pytest.mark.parametrize("reducing_gap", [1.0, 2.0, 3.0])
+    def test_format_as_pre_shrinks_closely(self, reducing_gap):
+        arr = create_image()
+
+        expected, expected_transform = format_as((1200, 900, "L"), arr, 160,
+                                                 120)
+        image, transform = format_as((1200, 900, "L"), arr, 160, 120,
+                                     reducing_gap=reducing_gap)
+        diff = np.abs(np.asarray(image, float) - np.asarray(expected, float))
+
+        assert image.size == expected.size
+        assert transform == expected_transform
+        assert diff.mean() < 1.0
+
+    def test_format_as_pre_shrinks_downsampled_data(self):
+        arr = create_image()
+
+        expected, _ = format_as((1200, 900, "L"), arr, 160, 120,
+                                reducing_gap=2.0)
+        image, _ = format_as((1200, 900, "L"), arr[::3, ::3], 160, 120,
+                             factor=3, reducing_gap=2.0)
+        diff = np.abs(np.asarray(image, float) - np.asarray(expected, float))
+
+        assert image.size == expected.size
+        assert diff.mean() < 2.0
@@ -0,0 +1,28 @@
+"""
+Contains unit tests to ensure that the file range read for the pixel data
+of a database entry covers its pixel pack range, if any, or its DICOM file.
+"""
+import pandas as pd
+
+from breakdb.io.image import get_read_range
+
+
+class TestGetReadRange:
+    """
+    Test suite for :function: 'get_read_range'.
+    """
+
+    def test_get_read_range_reads_file(self):
+        ds = pd.Series({"File Path": "a.dcm", "Pack File": "db.pixels",
+                        "Pack Offset": -1, "Pack Length": 0})
+
+        assert get_read_range(ds) == ("a.dcm", 0, None)
+
+    def test_get_read_range_reads_pack(self, tmp_path):
+        pack_path = tmp_path / "db.pixels"
+        pack_path.write_bytes(bytes(64))
+
+        ds = pd.Series({"File Path": "a.dcm", "Pack File": str(pack_path),
+                        "Pack Offset": 16, "Pack Length": 32})
+
+        assert get_read_range(ds) == (str(pack_path), 16, 32)
@@ -0,0 +1,37 @@
+"""
+Contains unit tests to ensure that the file ranges read for the pixel data
+of database rows are computed from their columns as they would be for each
+entry.
+"""
+import pandas as pd
+
+from breakdb.io.image import get_read_range, get_read_ranges
+
+
+class TestGetReadRanges:
+    """
+    Test suite for :function: 'get_read_ranges'.
+    """
+
+    def test_get_read_ranges_matches_get_read_range(self, tmp_path):
+        pack_path = tmp_path / "db.pixels"
+        pack_path.write_bytes(bytes(64))
+
+        db = pd.DataFrame({
+            "File Path": ["a.dcm", "b.dcm", "c.dcm", "d.dcm"],
+            "Pack File": [str(pack_path), str(pack_path),
+                          str(tmp_path / "missing.pixels"), str(pack_path)],
+            "Pack Offset": [16, -1, 0, 48],
+            "Pack Length": [32, 0, 16, 16]
+        })
+
+        assert get_read_ranges(db, [3, 0, 1, 2]) == [
+            get_read_range(db.iloc[row, :]) for row in [3, 0, 1, 2]
+        ]
+        assert get_read_ranges(db, range(2)) == [(str(pack_path), 16, 32),
+                                                 ("b.dcm", 0, None)]
+
+    def test_get_read_ranges_reads_files_without_pack(self):
+        db = pd.DataFrame({"File Path": ["a.dcm", "b.dcm"]})
+
+        assert get_read_ranges(db, [1]) == [("b.dcm", 0, None)]
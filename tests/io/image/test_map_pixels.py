@@ -0,0 +1,67 @@
+"""
+Contains unit tests to ensure that memory-mapping (raw) pixel data directly
+from disk produces the same image data as decoding it with pydicom.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from pydicom import dcmread
+from pydicom.uid import ExplicitVRBigEndian, ExplicitVRLittleEndian, \
+    ImplicitVRLittleEndian
+
+from breakdb.io.image import is_mappable, map_pixels
+from breakdb.parse import parse_dicom
+from breakdb.tag import LayoutTag, get_tag
+
+
+def make_entry(file_path):
+    """
+    Parses the specified DICOM file and returns the subset of a database
+    entry needed to locate its pixel data.
+
+    :param file_path: The DICOM file to parse.
+    :return: A partial database entry.
+    """
+    _, parsed = parse_dicom(file_path, skip_broken=False)
+
+    return pd.Series({
+        "File Path": file_path,
+        "Pixel Offset": get_tag(parsed, LayoutTag.OFFSET),
+        "Pixel Type": get_tag(parsed, LayoutTag.TYPE),
+        "Pixel Shape": get_tag(parsed, LayoutTag.SHAPE)
+    })
+
+
+class TestMapPixels:
+    """
+    Test suite for :function: 'map_pixels'.
+    """
+
+    def test_is_mappable_is_false_without_layout(self):
+        assert not is_mappable(pd.Series({"File Path": "image.dcm"}))
+        assert not is_mappable(pd.Series({"Pixel Offset": -1}))
+
+    @pytest.mark.parametrize("syntax", [
+        ExplicitVRBigEndian, ExplicitVRLittleEndian, ImplicitVRLittleEndian
+    ])
+    @pytest.mark.parametrize("signed", [False, True])
+    def test_map_pixels_matches_pydicom(self, create_dicom_file, syntax,
+                                        signed):
+        file_path, arr = create_dicom_file(syntax=syntax, signed=signed)
+        entry = make_entry(file_path)
+
+        mapped = map_pixels(entry)
+        decoded = dcmread(file_path).pixel_array
+
+        assert is_mappable(entry)
+        assert mapped.dtype == decoded.dtype
+        assert np.array_equal(mapped, decoded)
+        assert np.array_equal(mapped, arr)
+
+    def test_map_pixels_matches_pydicom_with_color_data(self,
+                                                        create_dicom_file):
+        file_path, arr = create_dicom_file(samples=3)
+        mapped = map_pixels(make_entry(file_path))
+
+        assert np.array_equal(mapped, dcmread(file_path).pixel_array)
+        assert np.array_equal(mapped, arr)
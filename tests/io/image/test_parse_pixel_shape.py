@@ -0,0 +1,43 @@
+"""
+Contains unit tests to ensure that the shape of (raw) pixel data recorded
+in a database survives every database format.
+"""
+import numpy as np
+import pytest
+from pydicom import dcmread
+
+from breakdb.__main__ import parse_args
+from breakdb.action import create_database, ExitCode
+from breakdb.io import read_database
+from breakdb.io.image import is_mappable, map_pixels, parse_pixel_shape
+
+
+class TestParsePixelShape:
+    """
+    Test suite for :function: 'parse_pixel_shape'.
+    """
+
+    def test_parse_pixel_shape_parses_strings_and_collections(self):
+        assert parse_pixel_shape("48x64") == (48, 64)
+        assert parse_pixel_shape("48x64x3") == (48, 64, 3)
+        assert parse_pixel_shape([48, 64]) == (48, 64)
+
+    @pytest.mark.parametrize("extension", [".csv", ".json"])
+    def test_parse_pixel_shape_survives_database(self, create_dicom_file,
+                                                 tmp_path, monkeypatch,
+                                                 disable_logging, extension):
+        file_path, arr = create_dicom_file(samples=3)
+        db_path = str(tmp_path / f"db{extension}")
+
+        monkeypatch.setattr("sys.argv", [
+            "breakdb", "create", "-o", db_path, "-p", "1", "--executor",
+            "thread", str(tmp_path)
+        ])
+
+        assert create_database(parse_args()) != ExitCode.FAILURE
+
+        ds = read_database(db_path).iloc[0, :]
+
+        assert is_mappable(ds)
+        assert np.array_equal(map_pixels(ds), arr)
+        assert np.array_equal(map_pixels(ds), dcmread(file_path).pixel_array)
@@ -0,0 +1,43 @@
+"""
+Contains unit tests to ensure that decoding statistics are recorded for
+each image that is decoded and cleared once collected.
+"""
+import pandas as pd
+from pydicom.uid import JPEG2000Lossless, RLELossless
+
+from breakdb.io.image import pop_decode_statistics, read_image, \
+    record_decode
+
+
+class TestPopDecodeStatistics:
+    """
+    Test suite for :function: 'pop_decode_statistics'.
+    """
+
+    def test_pop_decode_statistics_accumulates_and_clears(self):
+        pop_decode_statistics()
+
+        record_decode(RLELossless, "rle", 100, 0.5)
+        record_decode(RLELossless, "rle", 50, 0.25)
+        record_decode(RLELossless, "gdcm", 10, 0.125)
+
+        assert pop_decode_statistics() == {
+            (RLELossless, "rle"): [2, 150, 0.75],
+            (RLELossless, "gdcm"): [1, 10, 0.125]
+        }
+        assert pop_decode_statistics() == {}
+
+    def test_pop_decode_statistics_records_read_images(self,
+                                                       create_dicom_file):
+        file_path, _ = create_dicom_file(syntax=JPEG2000Lossless, cols=64,
+                                         rows=48)
+        ds = pd.Series({"File Path": file_path})
+
+        pop_decode_statistics()
+        read_image(ds)
+        read_image(ds, factor=2)
+
+        stats = pop_decode_statistics()
+
+        assert stats[(JPEG2000Lossless, "pillow")][:2] == [1, 64 * 48]
+        assert stats[(JPEG2000Lossless, "reduced")][:2] == [1, 64 * 48]
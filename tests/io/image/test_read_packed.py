@@ -0,0 +1,74 @@
+"""
+Contains unit tests to ensure that (raw) pixel data read from a pixel pack
+matches that decoded from the original DICOM file.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydicom.uid import ExplicitVRLittleEndian, JPEG2000Lossless
+
+from breakdb.io.image import is_packed, pop_decode_statistics, read_image, \
+    read_packed
+from breakdb.io.pack import PACK_COLUMNS, pack_entry, write_pack
+
+
+class TestReadPacked:
+    """
+    Test suite for :function: 'read_packed'.
+    """
+
+    @pytest.mark.parametrize("syntax", [ExplicitVRLittleEndian,
+                                        JPEG2000Lossless])
+    @pytest.mark.parametrize("compress_level", [None, 1])
+    def test_read_packed_matches_decoded(self, create_dicom_file, tmp_path,
+                                         syntax, compress_level):
+        entries = []
+        arrays = []
+
+        for index in range(3):
+            file_path, arr = create_dicom_file(name=f"{index}.dcm",
+                                               syntax=syntax, signed=False)
+
+            entries.append(pd.Series({"File Path": file_path}))
+            arrays.append(arr)
+
+        pack_path = str(tmp_path / "db.pixels")
+        rows = write_pack((pack_entry(ds, compress_level) for ds in entries),
+                          pack_path)
+
+        pop_decode_statistics()
+
+        for ds, row, arr in zip(entries, rows, arrays):
+            packed = pd.concat([ds, pd.Series(dict(zip(PACK_COLUMNS, row)))])
+            _, read, factor = read_image(packed, factor=2)
+
+            assert is_packed(packed)
+            assert row[1] % 64 == 0
+            assert factor == 1
+            assert read.dtype == arr.dtype
+            assert np.array_equal(read, arr)
+            assert np.array_equal(read_packed(packed), arr)
+
+        assert not pop_decode_statistics()
+
+    def test_read_packed_falls_back_without_pack(self, create_dicom_file,
+                                                 tmp_path):
+        file_path, arr = create_dicom_file()
+        ds = pd.Series({"File Path": file_path})
+        pack_path = str(tmp_path / "db.pixels")
+        row = write_pack([pack_entry(ds)], pack_path)[0]
+        packed = pd.concat([ds, pd.Series(dict(zip(PACK_COLUMNS, row)))])
+
+        os.remove(pack_path)
+
+        assert not is_packed(packed)
+        assert np.array_equal(read_image(packed)[1], arr)
+
+    def test_write_pack_skips_broken(self, tmp_path):
+        pack_path = str(tmp_path / "db.pixels")
+        rows = write_pack([None], pack_path)
+
+        assert rows[0][1] == -1
+        assert not is_packed(pd.Series(dict(zip(PACK_COLUMNS, rows[0]))))
@@ -0,0 +1,62 @@
+"""
+Contains unit tests to ensure that several windows are rendered as the
+channels of a single image.
+"""
+import numpy as np
+import pytest
+
+from breakdb.io.image import render_channels, render_pixels
+
+
+def make_parameters_list():
+    """
+    Creates a collection of window parameters for 12-bit unsigned data: a
+    narrow and a wide linear window and the full range.
+
+    :return: A list of tuples of window parameters.
+    """
+    return [
+        (1.0, 0.0, "LINEAR", 3000.0, 400.0, 0.0, 4095.0),
+        (1.0, 0.0, "LINEAR", 1500.0, 1500.0, 0.0, 4095.0),
+        (1.0, 0.0, None, 0.0, 0.0, 0.0, 0.0)
+    ]
+
+
+class TestRenderChannels:
+    """
+    Test suite for :function: 'render_channels'.
+    """
+
+    @pytest.mark.parametrize("pipeline", ["float", "lut"])
+    @pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+    def test_render_channels_matches_render_pixels(self, pipeline, dtype):
+        arr = np.random.randint(0, 4096, (48, 64)).astype(np.uint16)
+        params_list = make_parameters_list()
+
+        result = render_channels(arr, params_list, pipeline, dtype)
+
+        assert result.shape == (48, 64, 3)
+        assert result.dtype == dtype
+
+        for channel, params in enumerate(params_list):
+            expected = render_pixels(arr, params, pipeline=pipeline,
+                                     dtype=dtype)
+
+            assert np.array_equal(result[..., channel], expected)
+
+    def test_render_channels_supports_signed_data(self):
+        arr = np.random.randint(-2048, 2048, (32, 32)).astype(np.int16)
+        params_list = [(1.0, 0.0, "LINEAR", 0.0, 400.0, -2048.0, 2047.0),
+                       (1.0, 0.0, None, 0.0, 0.0, 0.0, 0.0)]
+
+        result = render_channels(arr, params_list)
+
+        for channel, params in enumerate(params_list):
+            assert np.array_equal(result[..., channel],
+                                  render_pixels(arr, params))
+
+    def test_render_channels_raises_with_unknown_pipeline(self):
+        arr = np.zeros((8, 8), np.uint16)
+
+        with pytest.raises(KeyError):
+            render_channels(arr, make_parameters_list(), "unknown")
@@ -0,0 +1,89 @@
+"""
+Contains unit tests to ensure that rendering pixel data with cached lookup
+tables matches the floating-point pixel pipeline.
+"""
+import numpy as np
+import pytest
+
+from breakdb.io.image import build_lookup_table, render_float, \
+    render_lookup, render_pixels, supports_lookup
+
+
+def make_parameters(voi_func, center=2048.0, width=1024.0):
+    """
+    Creates a tuple of window parameters for 12-bit unsigned data that has
+    been rescaled.
+
+    :param voi_func: The VOI LUT function to use.
+    :param center: The window center to use.
+    :param width: The window width to use.
+    :return: A tuple of window parameters.
+    """
+    return 1.5, -100.0, voi_func, center, width, -100.0, 4095 * 1.5 - 100.0
+
+
+class TestRenderLookup:
+    """
+    Test suite for :function: 'render_lookup'.
+    """
+
+    @pytest.mark.parametrize("dtype", ["<u2", ">u2", "<i2", ">i2", "u1",
+                                       "i1"])
+    @pytest.mark.parametrize("voi_func", [None, "LINEAR", "LINEAR_EXACT",
+                                          "SIGMOID"])
+    def test_render_lookup_matches_float_pipeline(self, dtype, voi_func):
+        info = np.iinfo(np.dtype(dtype))
+        arr = np.random.randint(info.min, info.max, (64, 48)).astype(dtype)
+        params = make_parameters(voi_func, float(arr.mean()),
+                                 float(arr.std()) + 1.0)
+
+        result = render_lookup(arr, params)
+        expected = render_float(arr, params)
+
+        assert result.dtype == np.uint8
+        assert np.abs(result.astype(int) - expected.astype(int)).max() <= 1
+
+    def test_render_lookup_is_zero_with_constant_data(self):
+        arr = np.full((16, 16), 1234, np.uint16)
+
+        assert np.array_equal(render_lookup(arr, make_parameters("LINEAR")),
+                              np.zeros((16, 16), np.uint8))
+
+    def test_render_lookup_reuses_cached_tables(self):
+        params = make_parameters("SIGMOID", 1000.0, 77.0)
+        arr0 = np.random.randint(0, 4096, (16, 16)).astype(np.uint16)
+        arr1 = np.random.randint(0, 4096, (32, 8)).astype(np.uint16)
+
+        render_lookup(arr0, params)
+        hits = build_lookup_table.cache_info().hits
+        render_lookup(arr1, params)
+
+        assert build_lookup_table.cache_info().hits == hits + 1
+
+    def test_render_lookup_writes_to_output(self):
+        arr = np.random.randint(0, 4096, (16, 16)).astype(np.uint16)
+        out = np.empty((16, 16), np.uint8)
+        params = make_parameters("LINEAR")
+
+        result = render_lookup(arr, params, out=out)
+
+        assert result is out
+        assert np.array_equal(out, render_lookup(arr, params))
+
+    def test_supports_lookup_only_allows_small_integers(self):
+        assert supports_lookup(np.zeros(4, np.uint8))
+        assert supports_lookup(np.zeros(4, np.int16))
+        assert not supports_lookup(np.zeros(4, np.int32))
+        assert not supports_lookup(np.zeros(4, np.float32))
+
+    def test_render_pixels_falls_back_for_unsupported_data(self):
+        arr = np.random.rand(16, 16) * 4096
+        params = make_parameters("LINEAR")
+
+        assert np.array_equal(render_pixels(arr, params, pipeline="lut"),
+                              render_float(arr, params))
+
+    def test_render_pixels_throws_with_unknown_pipeline(self):
+        with pytest.raises(KeyError):
+            render_pixels(np.zeros(4, np.uint8), make_parameters("LINEAR"),
+                          pipeline="unknown")
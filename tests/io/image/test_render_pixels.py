@@ -0,0 +1,127 @@
+"""
+Contains unit tests to ensure that the fused scaling, windowing, and
+normalization of pixel data matches the reference implementation.
+"""
+import numpy as np
+import pytest
+from pydicom import Dataset
+from pydicom.pixel_data_handlers.util import apply_modality_lut, \
+    apply_voi_lut
+
+from breakdb.io.image import compute_window, normalize, render_pixels
+
+
+def make_parameters(slope, intercept, voi_func, center, width, bits=12):
+    """
+    Creates both a tuple of window parameters and an equivalent DICOM dataset
+    for use with pydicom's LUT functions.
+
+    :param slope: The rescale slope to use.
+    :param intercept: The rescale intercept to use.
+    :param voi_func: The VOI LUT function to use.
+    :param center: The window center to use.
+    :param width: The window width to use.
+    :param bits: The number of bits stored per pixel.
+    :return: A tuple of window parameters and a DICOM dataset as a pair.
+    """
+    ds = Dataset()
+
+    ds.BitsStored = bits
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.PixelRepresentation = 0
+    ds.RescaleSlope = slope
+    ds.RescaleIntercept = intercept
+    ds.VOILUTFunction = voi_func
+    ds.WindowCenter = center
+    ds.WindowWidth = width
+
+    y_min = intercept
+    y_max = (2.0 ** bits - 1) * slope + intercept
+
+    return (slope, intercept, voi_func, center, width, y_min, y_max), ds
+
+
+def reference(arr, ds):
+    """
+    Renders the specified pixels using pydicom and :function: 'normalize'.
+
+    :param arr: The collection of pixels to render.
+    :param ds: The DICOM dataset of scaling and windowing parameters.
+    :return: A collection of normalized 8-bit pixel values.
+    """
+    return normalize(apply_voi_lut(apply_modality_lut(arr, ds), ds),
+                     coerce_to_uint8=True)
+
+
+class TestRenderPixels:
+    """
+    Test suite for :function: 'render_pixels' and :function: 'compute_window'.
+    """
+
+    @pytest.mark.parametrize("voi_func", ["LINEAR", "LINEAR_EXACT",
+                                          "SIGMOID"])
+    def test_compute_window_matches_pydicom(self, voi_func):
+        arr = np.random.randint(0, 4096, (32, 32)).astype(np.uint16)
+        params, ds = make_parameters(1.5, -100.0, voi_func, 1200.0, 800.0)
+
+        expected = apply_voi_lut(apply_modality_lut(arr, ds), ds)
+
+        assert np.allclose(compute_window(arr, params), expected)
+
+    @pytest.mark.parametrize("voi_func", ["LINEAR", "LINEAR_EXACT",
+                                          "SIGMOID"])
+    @pytest.mark.parametrize("slope", [1.0, 2.5, -1.0])
+    def test_render_pixels_matches_reference(self, voi_func, slope):
+        arr = np.random.randint(0, 4096, (64, 48)).astype(np.uint16)
+        center = np.random.randint(500, 3500) * slope
+        width = np.random.randint(100, 3000) * abs(slope)
+        params, ds = make_parameters(slope, 10.0, voi_func, center, width)
+
+        result = render_pixels(arr, params)
+        expected = reference(arr, ds)
+
+        assert result.dtype == np.uint8
+        assert np.abs(result.astype(int) - expected.astype(int)).max() <= 1
+
+    def test_render_pixels_matches_reference_without_windowing(self):
+        arr = np.random.randint(-1024, 3072, (64, 48)).astype(np.int16)
+        params = (1.0, 0.0, None, 0.0, 0.0, 0.0, 0.0)
+
+        result = render_pixels(arr, params)
+        expected = normalize(arr, coerce_to_uint8=True)
+
+        assert result.min() == 0
+        assert result.max() == 255
+        assert np.abs(result.astype(int) - expected.astype(int)).max() <= 1
+
+    def test_render_pixels_is_zero_with_constant_data(self):
+        arr = np.full((16, 16), 1234, np.uint16)
+        params, _ = make_parameters(1.0, 0.0, "LINEAR", 2048.0, 4096.0)
+
+        assert np.array_equal(render_pixels(arr, params),
+                              np.zeros((16, 16), np.uint8))
+
+    def test_render_pixels_writes_to_output(self):
+        arr = np.random.randint(0, 4096, (16, 16)).astype(np.uint16)
+        out = np.empty((16, 16), np.uint8)
+        params, _ = make_parameters(1.0, 0.0, "LINEAR", 2048.0, 4096.0)
+
+        result = render_pixels(arr, params, out=out)
+
+        assert result is out
+        assert np.array_equal(out, render_pixels(arr, params))
+
+    @pytest.mark.parametrize("pipeline", ["float", "lut"])
+    @pytest.mark.parametrize("voi_func", ["LINEAR", "SIGMOID"])
+    def test_render_pixels_renders_16_bits(self, pipeline, voi_func):
+        arr = np.random.randint(0, 4096, (64, 48)).astype(np.uint16)
+        params, _ = make_parameters(1.5, -100.0, voi_func, 2000.0, 1500.0)
+
+        result = render_pixels(arr, params, pipeline=pipeline,
+                               dtype=np.uint16)
+        expected = render_pixels(arr, params, pipeline=pipeline)
+
+        assert result.dtype == np.uint16
+        assert result.max() >= 65534
+        assert np.abs((result >> 8).astype(int) -
+                      expected.astype(int)).max() <= 1
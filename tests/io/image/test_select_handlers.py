@@ -0,0 +1,63 @@
+"""
+Contains unit tests to ensure that the fastest available pixel data handler
+is chosen for each transfer syntax.
+"""
+import pytest
+from pydicom.uid import ExplicitVRLittleEndian, JPEGBaseline8Bit, \
+    JPEGLSLossless, RLELossless
+
+from breakdb.io.image import select_handlers, PIXEL_HANDLERS
+
+
+@pytest.fixture(autouse=True)
+def clear_handler_cache():
+    """
+    Ensures that handler availability is re-evaluated for every test.
+    """
+    select_handlers.cache_clear()
+    yield
+    select_handlers.cache_clear()
+
+
+class TestSelectHandler:
+    """
+    Test suite for :function: 'select_handlers'.
+    """
+
+    def test_select_handlers_uses_numpy_for_uncompressed_data(self):
+        assert select_handlers(ExplicitVRLittleEndian) == ("numpy",)
+
+    def test_select_handlers_accepts_plain_strings(self):
+        assert select_handlers(str(ExplicitVRLittleEndian)) == ("numpy",)
+
+    def test_select_handlers_is_empty_for_unknown_syntax(self):
+        assert select_handlers("1.2.3.4") == ()
+
+    def test_select_handlers_prefers_fastest_available(self, monkeypatch):
+        monkeypatch.setattr(PIXEL_HANDLERS["pylibjpeg"], "is_available",
+                            lambda: True)
+        monkeypatch.setattr(PIXEL_HANDLERS["pylibjpeg"],
+                            "supports_transfer_syntax", lambda syntax: True)
+        monkeypatch.setattr(PIXEL_HANDLERS["pylibjpeg"], "HAVE_RLE", True)
+
+        assert select_handlers(RLELossless)[0] == "pylibjpeg"
+        assert select_handlers(JPEGBaseline8Bit)[0] == "pillow"
+
+    def test_select_handlers_skips_unavailable_handlers(self, monkeypatch):
+        for name in ["gdcm", "pylibjpeg"]:
+            monkeypatch.setattr(PIXEL_HANDLERS[name], "is_available",
+                                lambda: False)
+
+        assert select_handlers(RLELossless) == ("rle",)
+
+    def test_select_handlers_skips_missing_plugins(self, monkeypatch):
+        monkeypatch.setattr(PIXEL_HANDLERS["pylibjpeg"], "is_available",
+                            lambda: True)
+        monkeypatch.setattr(PIXEL_HANDLERS["pylibjpeg"],
+                            "supports_transfer_syntax", lambda syntax: True)
+        monkeypatch.setattr(PIXEL_HANDLERS["pylibjpeg"], "HAVE_RLE", False)
+        monkeypatch.setattr(PIXEL_HANDLERS["pylibjpeg"], "HAVE_LIBJPEG",
+                            True)
+
+        assert "pylibjpeg" not in select_handlers(RLELossless)
+        assert select_handlers(JPEGLSLossless)[0] == "pylibjpeg"
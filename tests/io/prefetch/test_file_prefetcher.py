@@ -0,0 +1,115 @@
+"""
+Contains unit tests to ensure that upcoming file ranges are read ahead
+within a bounded window.
+"""
+import time
+
+import pytest
+
+from breakdb.io.prefetch import FilePrefetcher
+
+
+def wait_for(condition, timeout=5.0):
+    """
+    Waits until the specified condition holds or the specified number of
+    seconds elapses.
+
+    :param condition: The function to poll.
+    :param timeout: The maximum number of seconds to wait.
+    :return: Whether or not the condition holds.
+    """
+    deadline = time.monotonic() + timeout
+
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+
+        time.sleep(0.01)
+
+    return True
+
+
+@pytest.fixture
+def create_files(tmp_path):
+    def _create_files(count, size):
+        file_paths = []
+
+        for index in range(count):
+            file_path = tmp_path / f"{index}.dcm"
+            file_path.write_bytes(bytes(size))
+            file_paths.append(str(file_path))
+
+        return file_paths
+
+    return _create_files
+
+
+class TestFilePrefetcher:
+    """
+    Test suite for :class: 'FilePrefetcher'.
+    """
+
+    @pytest.mark.parametrize("mode", ["advise", "read"])
+    def test_file_prefetcher_bounds_window(self, create_files, mode):
+        file_paths = create_files(5, 100)
+
+        with FilePrefetcher(250, threads=2, mode=mode) as prefetcher:
+            handles = prefetcher.prefetch((file_path, 0, None)
+                                          for file_path in file_paths)
+
+            assert wait_for(lambda: prefetcher.counts[0] == 2)
+            time.sleep(0.1)
+            assert prefetcher.counts == [2, 200]
+
+            # Either thread may prefetch first, so the first two ranges
+            # prefetched need not be the first two given.
+            prefetcher.release([handle for handle in handles
+                                if handle[3]][:1])
+
+            assert wait_for(lambda: prefetcher.counts[0] == 3)
+            assert prefetcher.used <= 250
+
+            prefetcher.release(handles)
+
+            assert prefetcher.used == 0
+
+    def test_file_prefetcher_iterate_releases(self, create_files):
+        file_paths = create_files(4, 100)
+
+        with FilePrefetcher(150, threads=1, mode="read") as prefetcher:
+            handles = prefetcher.prefetch((file_path, 0, None)
+                                          for file_path in file_paths)
+            items = list(prefetcher.iterate(file_paths, handles))
+
+            assert items == file_paths
+            assert all(handle[4] for handle in handles)
+            assert prefetcher.used == 0
+
+    def test_file_prefetcher_reads_ranges(self, create_files):
+        file_paths = create_files(2, 100)
+
+        with FilePrefetcher(10, threads=1, mode="read") as prefetcher:
+            handles = prefetcher.prefetch([(None, 0, None),
+                                           (file_paths[0], 40, 20),
+                                           (file_paths[1], 0, None)])
+
+            assert wait_for(lambda: prefetcher.counts[0] == 1)
+
+            prefetcher.release(handles[:2])
+
+            assert wait_for(lambda: prefetcher.counts[0] == 2)
+            assert prefetcher.counts[1] == 120
+
+    def test_file_prefetcher_skips_missing(self, create_files, tmp_path):
+        file_paths = create_files(1, 100)
+
+        with FilePrefetcher(1000, mode="read") as prefetcher:
+            prefetcher.prefetch([(str(tmp_path / "missing.dcm"), 0, None),
+                                 (file_paths[0], 0, None)])
+
+            assert wait_for(lambda: prefetcher.counts[0] == 1)
+            assert prefetcher.counts[1] == 100
+
+    def test_file_prefetcher_rejects_mode(self):
+        with pytest.raises(ValueError):
+            FilePrefetcher(100, mode="mmap")
@@ -0,0 +1,87 @@
+"""
+Contains unit tests to ensure that all functions involved in parsing the
+physical layout of DICOM pixel data work as intended.
+"""
+import numpy as np
+import pytest
+from pydicom import dcmread
+from pydicom.uid import ExplicitVRBigEndian, ExplicitVRLittleEndian, \
+    ImplicitVRLittleEndian, RLELossless, DeflatedExplicitVRLittleEndian
+
+from breakdb.parse import ALL_TAGS, parse_layout
+from breakdb.tag import LayoutTag, get_tag
+
+
+def read_layout(file_path):
+    """
+    Reads the specified DICOM file as the parser would and returns its parsed
+    pixel layout.
+
+    :param file_path: The DICOM file to read.
+    :return: A dictionary of pixel layout information.
+    """
+    with dcmread(file_path, defer_size=64, specific_tags=ALL_TAGS) as ds:
+        return parse_layout(ds)
+
+
+class TestParseLayout:
+    """
+    Test suite for :function: 'parse_layout'.
+    """
+
+    @pytest.mark.parametrize("syntax", [
+        ExplicitVRBigEndian, ExplicitVRLittleEndian, ImplicitVRLittleEndian
+    ])
+    def test_parse_layout_locates_native_pixel_data(self, create_dicom_file,
+                                                    syntax):
+        file_path, arr = create_dicom_file(syntax=syntax)
+        layout = read_layout(file_path)
+
+        offset = get_tag(layout, LayoutTag.OFFSET)
+        length = get_tag(layout, LayoutTag.LENGTH)
+        dtype = np.dtype(get_tag(layout, LayoutTag.TYPE))
+
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            data = np.frombuffer(f.read(length), dtype=dtype)
+
+        assert length == arr.nbytes
+        assert get_tag(layout, LayoutTag.SHAPE) == list(arr.shape)
+        assert get_tag(layout, LayoutTag.TRANSFER_SYNTAX) == syntax
+        assert np.array_equal(data.reshape(arr.shape), arr)
+
+    def test_parse_layout_records_byte_order(self, create_dicom_file):
+        big_path, _ = create_dicom_file("big.dcm", syntax=ExplicitVRBigEndian)
+        little_path, _ = create_dicom_file("little.dcm", signed=True)
+
+        assert get_tag(read_layout(big_path), LayoutTag.TYPE) == ">u2"
+        assert get_tag(read_layout(little_path), LayoutTag.TYPE) == "<i2"
+
+    def test_parse_layout_records_samples_for_color_data(self,
+                                                         create_dicom_file):
+        file_path, arr = create_dicom_file(samples=3)
+        layout = read_layout(file_path)
+
+        assert get_tag(layout, LayoutTag.OFFSET) >= 0
+        assert get_tag(layout, LayoutTag.SHAPE) == list(arr.shape)
+
+    def test_parse_layout_rejects_compressed_pixel_data(self,
+                                                        create_dicom_file):
+        file_path, arr = create_dicom_file()
+
+        ds = dcmread(file_path)
+        ds.compress(RLELossless, arr)
+        ds.save_as(file_path)
+
+        layout = read_layout(file_path)
+
+        assert get_tag(layout, LayoutTag.OFFSET) == -1
+        assert get_tag(layout, LayoutTag.TRANSFER_SYNTAX) == RLELossless
+
+    def test_parse_layout_rejects_deflated_datasets(self, create_dicom_file):
+        file_path, _ = create_dicom_file(
+            syntax=DeflatedExplicitVRLittleEndian
+        )
+        layout = read_layout(file_path)
+
+        assert get_tag(layout, LayoutTag.OFFSET) == -1
@@ -0,0 +1,81 @@
+"""
+Contains unit tests to ensure that tasks are run against every storage
+device with at most its own number of concurrent tasks.
+"""
+import threading
+import time
+
+import pytest
+
+from breakdb.executor import create_executor
+from breakdb.schedule import DeviceScheduler
+
+
+class TestDeviceScheduler:
+    """
+    Test suite for :class: 'DeviceScheduler'.
+    """
+
+    def test_device_scheduler_bounds_devices(self):
+        lock = threading.Lock()
+        running = {1: 0, 2: 0}
+        peaks = {1: 0, 2: 0}
+
+        def run(task):
+            device, value = task
+
+            with lock:
+                running[device] += 1
+                peaks[device] = max(peaks[device], running[device])
+
+            time.sleep(0.01)
+
+            with lock:
+                running[device] -= 1
+
+            return value * 2
+
+        tasks = [(index % 2 + 1, (index % 2 + 1, index))
+                 for index in range(20)]
+        scheduler = DeviceScheduler({1: 1}, default_limit=3)
+
+        with create_executor("thread", 6) as pool:
+            results = dict(scheduler.imap_unordered(pool, run, tasks))
+
+        assert results == {index: index * 2 for index in range(20)}
+        assert peaks[1] == 1
+        assert 1 < peaks[2] <= 3
+
+    def test_device_scheduler_orders_devices(self):
+        order = []
+
+        def run(item):
+            order.append(item)
+
+            return item
+
+        tasks = [(1, index) for index in range(5)]
+
+        with create_executor("thread", 2) as pool:
+            results = list(DeviceScheduler().imap_unordered(pool, run,
+                                                            tasks))
+
+        assert order == list(range(5))
+        assert results == [(index, index) for index in range(5)]
+
+    def test_device_scheduler_raises(self):
+        def run(item):
+            if item == 3:
+                raise ValueError(item)
+
+            return item
+
+        tasks = [(1, index) for index in range(10)]
+
+        with create_executor("thread", 2) as pool:
+            with pytest.raises(ValueError):
+                list(DeviceScheduler().imap_unordered(pool, run, tasks))
+
+    def test_device_scheduler_rejects_order(self):
+        with pytest.raises(ValueError):
+            DeviceScheduler(order="size")
@@ -0,0 +1,77 @@
+"""
+Contains unit tests to ensure that file ranges are grouped by the storage
+device of their files and ordered by where they are stored.
+"""
+import os
+
+import pytest
+
+from breakdb.schedule import create_tasks, group_by_locality
+
+
+class TestGroupByLocality:
+    """
+    Test suite for :function: 'group_by_locality'.
+    """
+
+    @pytest.fixture
+    def file_paths(self, tmp_path):
+        file_paths = []
+
+        for name in ["c.dcm", "a.dcm", "b.dcm"]:
+            file_path = tmp_path / name
+            file_path.write_bytes(b"")
+            file_paths.append(str(file_path))
+
+        return file_paths
+
+    def test_group_by_locality_keeps_order(self, file_paths):
+        groups = group_by_locality((file_path, 0)
+                                   for file_path in file_paths)
+
+        assert list(groups.values()) == [[0, 1, 2]]
+
+    def test_group_by_locality_orders_directory(self, file_paths):
+        ranges = [(file_path, 0) for file_path in file_paths]
+        ranges.append((file_paths[1], 8))
+        ranges.append((file_paths[1], 4))
+
+        groups = group_by_locality(ranges, "directory")
+
+        assert list(groups.values()) == [[1, 4, 3, 2, 0]]
+
+    def test_group_by_locality_orders_inode(self, file_paths):
+        inodes = [os.stat(file_path).st_ino for file_path in file_paths]
+        groups = group_by_locality(((file_path, 0)
+                                    for file_path in file_paths), "inode")
+
+        assert list(groups.values()) == [sorted(range(3),
+                                                key=inodes.__getitem__)]
+
+    def test_group_by_locality_separates_devices(self, file_paths, tmp_path):
+        missing_path = str(tmp_path / "missing.dcm")
+        groups = group_by_locality([(missing_path, 0), (file_paths[0], 0),
+                                    (missing_path, 0)])
+
+        assert groups == {os.stat(file_paths[0]).st_dev: [1], -1: [0, 2]}
+
+    def test_group_by_locality_rejects_order(self, file_paths):
+        with pytest.raises(ValueError):
+            group_by_locality([(file_paths[0], 0)], "size")
+
+
+class TestCreateTasks:
+    """
+    Test suite for :function: 'create_tasks'.
+    """
+
+    def test_create_tasks_alternates_devices(self):
+        groups = {1: [0, 1, 2, 3, 4], 2: [5, 6]}
+
+        def split(positions):
+            return [positions[start:start + 2]
+                    for start in range(0, len(positions), 2)]
+
+        assert create_tasks(groups, split) == [
+            (1, [0, 1]), (2, [5, 6]), (1, [2, 3]), (1, [4])
+        ]
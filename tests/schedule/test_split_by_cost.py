@@ -0,0 +1,40 @@
+"""
+Contains unit tests to ensure that positions are handed out from the
+largest estimated cost to the smallest, in tasks that shrink as work runs
+out.
+"""
+from breakdb.schedule import split_by_cost
+
+
+class TestSplitByCost:
+    """
+    Test suite for :function: 'split_by_cost'.
+    """
+
+    def test_split_by_cost_covers_positions(self):
+        costs = [index % 7 for index in range(100)]
+        tasks = split_by_cost(costs, 4)
+
+        assert sorted(position for task in tasks
+                      for position in task) == list(range(100))
+
+    def test_split_by_cost_orders_largest_first(self):
+        costs = [1] * 20 + [100, 50]
+        tasks = split_by_cost(costs, 2)
+
+        assert tasks[:2] == [[20], [21]]
+        assert [costs[position] for task in tasks
+                for position in task] == sorted(costs, reverse=True)
+
+    def test_split_by_cost_shrinks_tasks(self):
+        tasks = split_by_cost([1] * 1000, 4)
+        sizes = [len(task) for task in tasks]
+
+        assert sizes == sorted(sizes, reverse=True)
+        assert sizes[0] == 64
+        assert sizes[-1] == 1
+
+    def test_split_by_cost_bounds_tasks(self):
+        tasks = split_by_cost([0] * 10, 1, max_size=3)
+
+        assert max(len(task) for task in tasks) <= 3